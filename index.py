@@ -1,8 +1,10 @@
+import os
+import time
 import pandas as pd
 import numpy as np
 from modules.indicators import CompositeIndicator
-from huggingface_hub import hf_hub_download
-from pathlib import Path
+from modules.data_fetch import get_fetcher
+from modules import metrics
 import sys
 
 
@@ -10,6 +12,9 @@ def load_klines(symbol: str, timeframe: str, cache_dir: str = './data_cache') ->
     """
     Load cryptocurrency OHLCV data from HuggingFace dataset
     
+    Cached files are reused without a network round-trip while their metadata
+    is fresh (see modules.data_fetch.get_fetcher for offline/mirror settings).
+    
     Args:
         symbol: Trading pair (e.g., 'BTCUSDT', 'ETHUSDT')
         timeframe: Timeframe ('15m', '1h', '1d')
@@ -18,21 +23,12 @@ def load_klines(symbol: str, timeframe: str, cache_dir: str = './data_cache') ->
     Returns:
         DataFrame with OHLCV data
     """
-    repo_id = "zongowo111/v2-crypto-ohlcv-data"
-    base = symbol.replace("USDT", "")
-    filename = f"{base}_{timeframe}.parquet"
-    path_in_repo = f"klines/{symbol}/{filename}"
-    
-    Path(cache_dir).mkdir(parents=True, exist_ok=True)
-    
-    local_path = hf_hub_download(
-        repo_id=repo_id,
-        filename=path_in_repo,
-        repo_type="dataset",
-        cache_dir=cache_dir
-    )
+    local_path = get_fetcher(cache_dir).resolve(symbol, timeframe)
     
+    start = time.perf_counter()
     df = pd.read_parquet(local_path)
+    metrics.DATA_LOAD_SECONDS.labels(timeframe).observe(time.perf_counter() - start)
+    metrics.DATA_LOAD_BYTES.labels(timeframe).inc(os.path.getsize(local_path))
     return df
 
 
@@ -66,7 +62,10 @@ def calculate_signals(symbol: str, timeframe: str = '1h', lookback: int = 500) -
         trend_strength=0.6
     )
     
-    result_df = indicator.calculate(df)
+    with metrics.INDICATOR_SECONDS.labels(symbol, timeframe).time():
+        result_df = indicator.calculate(df)
+    metrics.CANDLES_PROCESSED.labels(timeframe).inc(len(result_df))
+    metrics.record_signals(result_df['signal'].to_numpy())
     
     # Display results
     print("\n" + "="*80)
@@ -137,6 +136,10 @@ if __name__ == "__main__":
     if len(sys.argv) > 2:
         timeframe = sys.argv[2]
     
+    prefetched = get_fetcher().prefetch(symbols, [timeframe])
+    for (symbol, tf), error in prefetched['errors'].items():
+        print(f"Prefetch failed for {symbol} ({tf}): {error}")
+    
     for symbol in symbols:
         try:
             result_df = calculate_signals(symbol, timeframe)
@@ -1,11 +1,23 @@
 from .data_preparation import prepare_signal_data, label_signals
 from .feature_engineering import extract_features, get_feature_columns
 from .model_training import train_signal_classifier
+from .signal_events import SignalEventLog, extract_events, events_to_frame
+from .sequence_dataset import SequenceDataset, build_sequence_dataset
+from .model_registry import ModelRegistry
+from .drift_monitor import DriftMonitor, DriftReference
 
 __all__ = [
     'prepare_signal_data',
     'label_signals',
     'extract_features',
     'get_feature_columns',
-    'train_signal_classifier'
+    'train_signal_classifier',
+    'SignalEventLog',
+    'extract_events',
+    'events_to_frame',
+    'SequenceDataset',
+    'build_sequence_dataset',
+    'ModelRegistry',
+    'DriftMonitor',
+    'DriftReference',
 ]
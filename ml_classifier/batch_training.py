@@ -0,0 +1,202 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from .data_preparation import prepare_signal_data, label_signals
+from .feature_engineering import get_feature_columns
+from .drift_monitor import DriftReference
+from .model_registry import ModelRegistry, data_range
+from .model_training import train_signal_classifier
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def plan_workers(num_jobs: int, workers: Optional[int] = None, xgb_threads: Optional[int] = None,
+                 cores: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split the CPU budget between pool workers and XGBoost threads
+
+    workers * xgb_threads never exceeds cores; whichever of the two is not
+    given is derived from the other (by default one thread per worker).
+
+    Returns:
+        (workers, xgb_threads)
+    """
+    cores = cores or available_cores()
+    num_jobs = max(1, num_jobs)
+    if workers is None:
+        workers = cores // xgb_threads if xgb_threads else cores
+    workers = max(1, min(workers, num_jobs, cores))
+    xgb_threads = max(1, min(xgb_threads or cores // workers, cores // workers))
+    return workers, xgb_threads
+
+
+def data_fingerprint(path: str, settings: dict) -> str:
+    """Identity of a job's input: the kline file (path, size, mtime) plus training settings"""
+    stat = os.stat(path)
+    return json.dumps([os.path.abspath(path), stat.st_size, stat.st_mtime_ns, settings], sort_keys=True)
+
+
+def is_up_to_date(registry: ModelRegistry, symbol: str, timeframe: str, fingerprint: str) -> bool:
+    """True when the live model of a series was trained on the same input"""
+    try:
+        manifest = registry.manifest(symbol, timeframe)
+    except (OSError, ValueError):
+        return False
+    return manifest is not None and manifest['settings'].get('data_fingerprint') == fingerprint
+
+
+# Per-worker state, set once by _init_worker and reused by every job the worker runs
+_worker_threads: Optional[int] = None
+
+
+def _init_worker(xgb_threads: int):
+    global _worker_threads
+    _worker_threads = xgb_threads
+    # Pay the heavy imports once per worker instead of once per job
+    import xgboost  # noqa: F401
+    import modules.indicators  # noqa: F401
+
+
+def train_job(job: dict) -> dict:
+    """
+    Train and save one (symbol, timeframe) model
+
+    Args:
+        job: symbol, timeframe, path, settings, fingerprint and output_dir
+
+    Returns:
+        Summary row with status, metrics and durations
+    """
+    from modules.indicators import CompositeIndicator
+
+    settings = job['settings']
+    row = {'symbol': job['symbol'], 'timeframe': job['timeframe'], 'status': 'trained', 'error': None}
+    start = time.perf_counter()
+
+    try:
+        df = pd.read_parquet(job['path']).tail(settings['lookback']).reset_index(drop=True)
+        df = CompositeIndicator(lookback=20, volume_threshold=1.2, momentum_threshold=0.5,
+                                trend_strength=0.6).calculate(df)
+        if settings.get('rank_window'):
+            from modules.rolling_rank import add_rank_features
+            df = add_rank_features(df, window=settings['rank_window'])
+        labeled_df = label_signals(prepare_signal_data(df), hold_period=settings['hold_period'],
+                                   profit_threshold=settings['profit_threshold'])
+        row['prepare_s'] = time.perf_counter() - start
+
+        train_start = time.perf_counter()
+        result = train_signal_classifier(labeled_df, settings['feature_columns'], test_size=0.3,
+                                         n_jobs=_worker_threads)
+        row['train_s'] = time.perf_counter() - train_start
+
+        report = result['report']
+        metrics = {
+            'num_samples': len(labeled_df),
+            'true_signals': int((labeled_df['label'] == 1).sum()),
+            'false_signals': int((labeled_df['label'] == 0).sum()),
+            'accuracy': float(report.get('accuracy', 0)),
+            'weighted_f1': float(report.get('weighted avg', {}).get('f1-score', 0)),
+        }
+        registry_settings = {key: value for key, value in settings.items() if key != 'feature_columns'}
+        registry_settings['data_fingerprint'] = job['fingerprint']
+
+        row['version'] = ModelRegistry(job['output_dir']).register(
+            result['model'], result['scaler'], job['symbol'], job['timeframe'], settings['feature_columns'],
+            metrics=metrics, data_range=data_range(labeled_df), settings=registry_settings,
+            reference=DriftReference.from_data(labeled_df[settings['feature_columns']].values, settings['feature_columns'])
+        )
+        row.update({key: metrics[key] for key in ['num_samples', 'true_signals', 'accuracy', 'weighted_f1']})
+    except Exception as e:
+        row['status'] = 'failed'
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    row['total_s'] = time.perf_counter() - start
+    row['pid'] = os.getpid()
+    return row
+
+
+def run_batch(symbols: List[str], timeframes: List[str], output_dir: str = 'ml_models',
+              lookback: int = 5000, hold_period: int = 3, profit_threshold: float = 0.0005,
+              workers: Optional[int] = None, xgb_threads: Optional[int] = None,
+              force: bool = False, fetcher=None, rank_features: bool = False,
+              rank_window: int = 500) -> pd.DataFrame:
+    """
+    Train one model per symbol x timeframe across a process pool
+
+    Kline files are made local up front (concurrently), jobs whose input and
+    settings match the live registry version are skipped, and the rest run largest
+    file first on workers that keep their imports.
+
+    Args:
+        symbols: Trading pairs
+        timeframes: Timeframes per symbol
+        output_dir: ModelRegistry root, also gets batch_summary.csv
+        lookback, hold_period, profit_threshold: As in train_ml_classifier.py
+        workers: Pool size (default: derived from cores and xgb_threads)
+        xgb_threads: XGBoost threads per job (default: cores // workers)
+        force: Retrain even when the input has not changed
+        fetcher: KlineFetcher (default: modules.data_fetch.get_fetcher())
+        rank_features, rank_window: Add the rolling percentile-rank features
+                                    (as --rank-features / --rank-window)
+
+    Returns:
+        Summary DataFrame, one row per job (also written to batch_summary.csv)
+    """
+    if fetcher is None:
+        from modules.data_fetch import get_fetcher
+        fetcher = get_fetcher()
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    registry = ModelRegistry(output_dir)
+    settings = {
+        'lookback': lookback,
+        'hold_period': hold_period,
+        'profit_threshold': profit_threshold,
+        'feature_columns': get_feature_columns(include_rank_features=rank_features),
+    }
+    if rank_features:
+        settings['rank_window'] = rank_window
+
+    fetched = fetcher.prefetch(symbols, timeframes)
+    rows, jobs = [], []
+    for symbol in symbols:
+        for timeframe in timeframes:
+            key = (symbol, timeframe)
+            if key in fetched['errors']:
+                rows.append({'symbol': symbol, 'timeframe': timeframe, 'status': 'failed',
+                             'error': fetched['errors'][key]})
+                continue
+
+            path = fetched['paths'][key]
+            fingerprint = data_fingerprint(path, settings)
+            if not force and is_up_to_date(registry, symbol, timeframe, fingerprint):
+                rows.append({'symbol': symbol, 'timeframe': timeframe, 'status': 'skipped', 'error': None})
+                continue
+
+            jobs.append({'symbol': symbol, 'timeframe': timeframe, 'path': path, 'settings': settings,
+                         'fingerprint': fingerprint, 'output_dir': str(output_dir)})
+
+    if jobs:
+        jobs.sort(key=lambda job: os.path.getsize(job['path']), reverse=True)
+        workers, xgb_threads = plan_workers(len(jobs), workers, xgb_threads)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(xgb_threads,)) as pool:
+            futures = [pool.submit(train_job, job) for job in jobs]
+            for future in as_completed(futures):
+                row = future.result()
+                row['xgb_threads'] = xgb_threads
+                rows.append(row)
+
+    summary = pd.DataFrame(rows).sort_values(['symbol', 'timeframe']).reset_index(drop=True)
+    summary.to_csv(Path(output_dir) / 'batch_summary.csv', index=False)
+    return summary
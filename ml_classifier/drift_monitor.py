@@ -0,0 +1,243 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from modules import metrics
+
+
+DEFAULT_BINS = 10
+PSI_THRESHOLD = 0.2
+KS_THRESHOLD = 0.2
+MIN_OBSERVATIONS = 200
+# Floor for empty bins so PSI stays finite
+EPSILON = 1e-4
+# Decayed weights are renormalised before they overflow
+_MAX_WEIGHT = 1e200
+
+FEATURE_PSI = metrics.REGISTRY.gauge(
+    'model_feature_psi', 'Population stability index of a live feature vs training', ['symbol', 'timeframe', 'feature'])
+FEATURE_KS = metrics.REGISTRY.gauge(
+    'model_feature_ks', 'Binned Kolmogorov-Smirnov distance of a live feature vs training',
+    ['symbol', 'timeframe', 'feature'])
+DRIFT_FLAG = metrics.REGISTRY.gauge(
+    'model_feature_drift', '1 when any feature crossed its drift threshold', ['symbol', 'timeframe'])
+
+
+def _bin_counts(values: np.ndarray, edges: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Weighted counts per bin of one feature, NaNs dropped"""
+    valid = ~np.isnan(values)
+    k = np.searchsorted(edges, values[valid], side='right')
+    w = weights[valid] if weights is not None else None
+    return np.bincount(k, weights=w, minlength=len(edges) + 1).astype(np.float64)
+
+
+class DriftReference:
+    """
+    Training distribution of each feature as fixed bins
+
+    The inner bin edges are the training quantiles, so each bin holds about
+    1/bins of the training rows; expected has the exact training fractions
+    (ties in discrete features make some bins larger).
+    """
+
+    def __init__(self, feature_columns: List[str], edges: np.ndarray, expected: np.ndarray):
+        self.feature_columns = list(feature_columns)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.expected = np.asarray(expected, dtype=np.float64)
+
+    @classmethod
+    def from_data(cls, X: np.ndarray, feature_columns: List[str], bins: int = DEFAULT_BINS) -> 'DriftReference':
+        """
+        Build a reference from unscaled training features
+
+        Args:
+            X: (rows, features) training matrix in feature_columns order
+            feature_columns: Feature names
+            bins: Bins per feature
+        """
+        X = np.asarray(X, dtype=np.float64)
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        edges = np.empty((X.shape[1], bins - 1))
+        expected = np.empty((X.shape[1], bins))
+        for j in range(X.shape[1]):
+            column = X[:, j]
+            if np.isnan(column).all():
+                edges[j] = 0.0
+            else:
+                edges[j] = np.nanquantile(column, quantiles)
+            counts = _bin_counts(column, edges[j])
+            expected[j] = counts / max(counts.sum(), 1.0)
+        return cls(feature_columns, edges, expected)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            np.savez(f, feature_columns=np.array(self.feature_columns), edges=self.edges, expected=self.expected)
+
+    @classmethod
+    def load(cls, path: str) -> 'DriftReference':
+        with np.load(path) as data:
+            return cls(data['feature_columns'].tolist(), data['edges'], data['expected'])
+
+
+class DriftMonitor:
+    """
+    Constant-memory comparison of live feature values with training
+
+    Keeps one (features, bins) array of counts, so memory does not grow with
+    the number of scored signals, and update() is a bin lookup per feature.
+    With half_life set, older observations are down-weighted exponentially
+    (by growing the weight of new ones, renormalised only when it gets
+    large) so the histograms track the recent regime rather than the whole
+    process lifetime.
+    """
+
+    def __init__(self, reference: DriftReference, symbol: str = '', timeframe: str = '',
+                 psi_threshold: float = PSI_THRESHOLD, ks_threshold: float = KS_THRESHOLD,
+                 min_observations: int = MIN_OBSERVATIONS, half_life: Optional[float] = None,
+                 on_drift: Optional[Callable[[dict], None]] = None):
+        """
+        Args:
+            reference: Training reference (LoadedModel.reference)
+            symbol, timeframe: Labels for the exported metrics
+            psi_threshold: PSI at or above which a feature counts as drifted
+            ks_threshold: Binned KS distance at or above which a feature counts as drifted
+            min_observations: Observations needed before the flag can be raised
+            half_life: Observations after which a value weighs half (None: no decay)
+            on_drift: Called with the check() result when the flag turns on
+        """
+        self.reference = reference
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_observations = min_observations
+        self.growth = 2.0 ** (1.0 / half_life) if half_life else 1.0
+        self.on_drift = on_drift
+        self.flag = False
+        self.reset()
+
+    def reset(self):
+        self.counts = np.zeros_like(self.reference.expected)
+        self.missing = np.zeros(len(self.reference.feature_columns), dtype=np.int64)
+        self.observations = 0
+        self.weight = 1.0
+
+    def _renormalise(self):
+        if self.weight > _MAX_WEIGHT:
+            self.counts /= self.weight
+            self.weight = 1.0
+
+    def update(self, values: np.ndarray):
+        """
+        Add one scored signal
+
+        Args:
+            values: Unscaled feature vector in feature_columns order
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        rows = np.flatnonzero(valid)
+        k = (values[rows, None] >= self.reference.edges[rows]).sum(axis=1)
+        self.counts[rows, k] += self.weight
+        self.missing += ~valid
+        self.observations += 1
+        self.weight *= self.growth
+        self._renormalise()
+
+    def update_batch(self, X: np.ndarray):
+        """Add a (rows, features) batch of scored signals, oldest first"""
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) == 0:
+            return
+        n = len(X)
+        weights = None
+        if self.growth != 1.0:
+            # Rescale so the last row weighs 1: absolute weights would overflow
+            # within a long enough batch, relative ones only underflow to 0
+            self.counts *= np.exp(-(np.log(self.weight) + (n - 1) * np.log(self.growth)))
+            weights = self.growth ** (np.arange(n) - (n - 1.0))
+            self.weight = self.growth
+        for j in range(X.shape[1]):
+            self.counts[j] += _bin_counts(X[:, j], self.reference.edges[j], weights)
+        self.missing += np.isnan(X).sum(axis=0)
+        self.observations += n
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """PSI and binned KS distance per feature (NaN for features with no values yet)"""
+        expected = self.reference.expected
+        totals = self.counts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            actual = self.counts / totals
+        e = np.maximum(expected, EPSILON)
+        a = np.maximum(actual, EPSILON)
+        psi = ((a - e) * np.log(a / e)).sum(axis=1)
+        ks = np.abs(np.cumsum(actual, axis=1) - np.cumsum(expected, axis=1)).max(axis=1)
+        psi[totals[:, 0] == 0] = np.nan
+        ks[totals[:, 0] == 0] = np.nan
+        return {'psi': psi, 'ks': ks}
+
+    def check(self) -> dict:
+        """
+        Compare the live histograms with the reference and update the flag
+
+        Returns:
+            Dictionary with per-feature psi and ks, the drifted features, the
+            flag and the number of observations
+        """
+        stats = self.statistics()
+        drifted_mask = (stats['psi'] >= self.psi_threshold) | (stats['ks'] >= self.ks_threshold)
+        drifted = [name for name, hit in zip(self.reference.feature_columns, drifted_mask) if hit]
+        was_flagged = self.flag
+        self.flag = bool(drifted) and self.observations >= self.min_observations
+
+        for name, psi, ks in zip(self.reference.feature_columns, stats['psi'], stats['ks']):
+            FEATURE_PSI.labels(self.symbol, self.timeframe, name).set(psi)
+            FEATURE_KS.labels(self.symbol, self.timeframe, name).set(ks)
+        DRIFT_FLAG.labels(self.symbol, self.timeframe).set(int(self.flag))
+
+        result = {
+            'observations': self.observations,
+            'psi': dict(zip(self.reference.feature_columns, stats['psi'].tolist())),
+            'ks': dict(zip(self.reference.feature_columns, stats['ks'].tolist())),
+            'missing': dict(zip(self.reference.feature_columns, self.missing.tolist())),
+            'drifted': drifted,
+            'flag': self.flag,
+        }
+        if self.flag and not was_flagged and self.on_drift is not None:
+            self.on_drift(result)
+        return result
+
+
+def benchmark(n_features: int = 16, n: int = 50_000) -> dict:
+    """Per-signal update cost and check() time in microseconds"""
+    rng = np.random.default_rng(0)
+    columns = [f'f{i}' for i in range(n_features)]
+    reference = DriftReference.from_data(rng.normal(size=(20_000, n_features)), columns)
+    monitor = DriftMonitor(reference, half_life=5_000)
+    X = rng.normal(0.3, 1.2, size=(n, n_features))
+
+    start = time.perf_counter()
+    for row in X:
+        monitor.update(row)
+    update = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    monitor.update_batch(X)
+    batch = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    result = monitor.check()
+    check = time.perf_counter() - start
+
+    return {
+        'update_us': update * 1e6,
+        'update_batch_us_per_row': batch * 1e6,
+        'check_us': check * 1e6,
+        'state_bytes': monitor.counts.nbytes + monitor.missing.nbytes,
+        'drifted': len(result['drifted']),
+    }
+
+
+if __name__ == "__main__":
+    print(benchmark())
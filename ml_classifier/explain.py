@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+
+def explain_signals(model, scaler, df: pd.DataFrame, feature_columns: List[str],
+                    batch_size: int = 65536, approximate: bool = False) -> np.ndarray:
+    """
+    Per-signal feature contributions from XGBoost's native TreeSHAP (pred_contribs)
+
+    Rows are scaled and explained in batches, so memory stays at one batch of
+    DMatrix plus the float32 result.
+
+    Args:
+        model: Fitted XGBClassifier from train_signal_classifier
+        scaler: Its fitted StandardScaler
+        df: Signals with the feature columns
+        feature_columns: Features in training order
+        batch_size: Rows per prediction call
+        approximate: Saabas path attributions (approx_contribs) instead of exact
+                     TreeSHAP; O(depth) instead of O(depth^2) per tree, about
+                     40x faster, for explaining very large signal sets
+
+    Returns:
+        (rows, features + 1) float32 array; the last column is the bias, and
+        each row sums to the model's log-odds for that signal
+    """
+    booster = model.get_booster()
+    values = df[feature_columns].to_numpy(dtype=np.float64)
+    contribs = np.empty((len(values), len(feature_columns) + 1), dtype=np.float32)
+
+    for start in range(0, len(values), batch_size):
+        batch = scaler.transform(values[start:start + batch_size])
+        contribs[start:start + batch_size] = booster.predict(
+            xgb.DMatrix(batch), pred_contribs=True, approx_contribs=approximate
+        )
+
+    return contribs
+
+
+def attach_contributions(df: pd.DataFrame, contribs: np.ndarray, feature_columns: List[str],
+                         prefix: str = 'contrib_') -> pd.DataFrame:
+    """
+    Scored signals with contrib_<feature>, contrib_bias and model_score columns
+
+    model_score is the probability implied by the contributions (sigmoid of their sum).
+    """
+    names = [f"{prefix}{name}" for name in feature_columns] + [f"{prefix}bias"]
+    result = df.copy()
+    for k, name in enumerate(names):
+        result[name] = contribs[:, k]
+    result['model_score'] = (1 / (1 + np.exp(-contribs.sum(axis=1, dtype=np.float64)))).astype(np.float32)
+    return result
+
+
+def summarize_contributions(contribs: np.ndarray, feature_columns: List[str],
+                            scores: Optional[np.ndarray] = None, threshold: float = 0.5) -> pd.DataFrame:
+    """
+    Per-feature aggregation of a run's contributions
+
+    Args:
+        contribs: Output of explain_signals
+        feature_columns: Features in training order
+        scores: Model probabilities (default: implied by contribs)
+        threshold: Probability above which a signal counts as accepted
+
+    Returns:
+        DataFrame indexed by feature, sorted by mean_abs: mean_abs, share (of
+        total mean_abs), mean, and mean contribution over accepted and
+        rejected signals
+    """
+    features = contribs[:, :-1].astype(np.float64)
+    if scores is None:
+        scores = 1 / (1 + np.exp(-contribs.sum(axis=1, dtype=np.float64)))
+    accepted = np.asarray(scores) >= threshold
+
+    mean_abs = np.abs(features).mean(axis=0)
+    summary = pd.DataFrame({
+        'mean_abs': mean_abs,
+        'share': mean_abs / mean_abs.sum() if mean_abs.sum() > 0 else mean_abs,
+        'mean': features.mean(axis=0),
+        'mean_accepted': features[accepted].mean(axis=0) if accepted.any() else np.nan,
+        'mean_rejected': features[~accepted].mean(axis=0) if (~accepted).any() else np.nan,
+    }, index=pd.Index(feature_columns, name='feature'))
+    return summary.sort_values('mean_abs', ascending=False)
@@ -15,11 +15,22 @@ FEATURE_COLUMNS = [
     'roc',
 ]
 
+# Regime-relative features from modules.rolling_rank.add_rank_features (opt-in)
+RANK_FEATURE_COLUMNS = [
+    'volume_rank',
+    'atr_ratio_rank',
+    'bb_width_rank',
+    'volume_to_q90',
+    'bb_width_to_median',
+]
+
 
 def extract_features(df: pd.DataFrame) -> pd.DataFrame:
     """Extract ML feature columns from a DataFrame with signals."""
     return df[FEATURE_COLUMNS].copy()
 
 
-def get_feature_columns():
+def get_feature_columns(include_rank_features: bool = False):
+    if include_rank_features:
+        return FEATURE_COLUMNS + RANK_FEATURE_COLUMNS
     return FEATURE_COLUMNS
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from .drift_monitor import DriftReference
+
+
+MODEL_FILE = 'model.ubj'
+SCALER_FILE = 'scaler.npy'
+MANIFEST_FILE = 'manifest.json'
+LIVE_FILE = 'LIVE'
+DRIFT_FILE = 'drift_reference.npz'
+_VERSION = re.compile(r'^v(\d+)$')
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def data_range(df: pd.DataFrame, column: str = 'open_time') -> Optional[Dict[str, str]]:
+    """First and last open_time of a training frame, for the manifest"""
+    if column not in df or len(df) == 0:
+        return None
+    times = pd.to_datetime(df[column])
+    return {'start': times.min().isoformat(), 'end': times.max().isoformat(), 'rows': int(len(df))}
+
+
+class LoadedModel:
+    """
+    A registry version ready to score: native Booster plus scaler arrays
+
+    Quacks like both the XGBClassifier (get_booster, predict_proba) and the
+    StandardScaler (transform) it was trained as, so score_signals,
+    explain_signals and other helpers take it in place of either; score()
+    goes straight from unscaled features to probabilities.
+    """
+
+    def __init__(self, booster: xgb.Booster, mean: np.ndarray, scale: np.ndarray, manifest: dict,
+                 reference: Optional[DriftReference] = None):
+        self.booster = booster
+        self.mean = mean
+        self.scale = scale
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.feature_columns = manifest['feature_columns']
+        self.reference = reference
+
+    def get_booster(self) -> xgb.Booster:
+        return self.booster
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities of scaled features, as XGBClassifier.predict_proba
+
+        Args:
+            X: (rows, features) array already passed through transform()
+
+        Returns:
+            (rows, 2) array: [P(false signal), P(true signal)]
+        """
+        p = self.booster.inplace_predict(np.asarray(X, dtype=np.float64))
+        return np.column_stack([1 - p, p])
+
+    def score(self, data) -> np.ndarray:
+        """
+        Probability of a true signal for each row of unscaled features
+
+        Args:
+            data: DataFrame with the feature columns, or an unscaled
+                  (rows, features) array in feature_columns order
+        """
+        if isinstance(data, pd.DataFrame):
+            data = data[self.feature_columns].to_numpy(dtype=np.float64)
+        return self.booster.inplace_predict(self.transform(data))
+
+
+class ModelRegistry:
+    """
+    Versioned classifier store with an atomically switched live version
+
+    Layout, one directory per series:
+        <root>/<symbol>_<timeframe>/v0001/model.ubj      XGBoost native UBJSON
+                                        /scaler.npy     (2, features): mean, scale
+                                        /manifest.json  features, data range, metrics, hashes
+                                        /drift_reference.npz  training feature bins (optional)
+                                  /LIVE                  name of the live version
+
+    Versions are written to a hidden directory and renamed into place, and
+    LIVE is replaced with os.replace, so readers only ever see complete
+    versions and a whole pointer. Loaded versions are cached in-process;
+    live() re-reads LIVE only when its inode or mtime changed (one stat per
+    call), so a serving process picks up a new live version without a restart.
+    """
+
+    def __init__(self, root: str = 'ml_models'):
+        self.root = Path(root)
+        self.cache: Dict[Tuple[str, str, str], LoadedModel] = {}
+        self.live_pointers: Dict[Tuple[str, str], Tuple[Tuple[int, int], str]] = {}
+        self.lock = threading.Lock()
+
+    def series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"{symbol}_{timeframe}"
+
+    def versions(self, symbol: str, timeframe: str) -> List[str]:
+        """Registered versions, oldest first"""
+        directory = self.series_dir(symbol, timeframe)
+        if not directory.exists():
+            return []
+        names = [p.name for p in directory.iterdir() if p.is_dir() and _VERSION.match(p.name)]
+        return sorted(names, key=lambda name: int(name[1:]))
+
+    def register(self, model, scaler, symbol: str, timeframe: str, feature_columns: List[str],
+                 metrics: Optional[dict] = None, data_range: Optional[dict] = None,
+                 settings: Optional[dict] = None, reference: Optional[DriftReference] = None,
+                 set_live: bool = True) -> str:
+        """
+        Store a trained model as a new version
+
+        Args:
+            model: XGBClassifier or Booster
+            scaler: Fitted StandardScaler (mean_ / scale_)
+            symbol, timeframe: Series the model was trained for
+            feature_columns: Features in training order
+            metrics: Evaluation results to keep in the manifest
+            data_range: Training data range (see data_range())
+            settings: Training settings (lookback, hold_period, data fingerprint, ...)
+            reference: Training feature distribution for drift monitoring
+            set_live: Make the new version live
+
+        Returns:
+            Version name ('v0001', ...)
+        """
+        directory = self.series_dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+
+        mean = np.asarray(scaler.mean_, dtype=np.float64)
+        scale = np.asarray(scaler.scale_ if scaler.scale_ is not None else np.ones_like(mean), dtype=np.float64)
+        if len(mean) != len(feature_columns):
+            raise ValueError(f"Scaler has {len(mean)} features, feature_columns {len(feature_columns)}")
+
+        staging = directory / f".staging-{os.getpid()}-{threading.get_ident()}"
+        staging.mkdir()
+        booster.save_model(str(staging / MODEL_FILE))
+        np.save(staging / SCALER_FILE, np.vstack([mean, scale]))
+        files = [MODEL_FILE, SCALER_FILE]
+        if reference is not None:
+            reference.save(str(staging / DRIFT_FILE))
+            files.append(DRIFT_FILE)
+
+        while True:
+            existing = self.versions(symbol, timeframe)
+            version = f"v{int(existing[-1][1:]) + 1 if existing else 1:04d}"
+            manifest = {
+                'version': version,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'feature_columns': list(feature_columns),
+                'data_range': data_range,
+                'metrics': metrics or {},
+                'settings': settings or {},
+                'xgboost_version': xgb.__version__,
+                'files': {name: _sha256(staging / name) for name in files},
+            }
+            with open(staging / MANIFEST_FILE, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            try:
+                # Fails if another process took this version number first
+                os.rename(staging, directory / version)
+                break
+            except OSError:
+                if not (directory / version).exists():
+                    raise
+
+        if set_live:
+            self.set_live(symbol, timeframe, version)
+        return version
+
+    def manifest(self, symbol: str, timeframe: str, version: Optional[str] = None) -> Optional[dict]:
+        """Manifest of a version (default: the live one); None when there is none"""
+        version = version or self.live_version(symbol, timeframe)
+        if version is None:
+            return None
+        with open(self.series_dir(symbol, timeframe) / version / MANIFEST_FILE) as f:
+            return json.load(f)
+
+    def live_version(self, symbol: str, timeframe: str) -> Optional[str]:
+        try:
+            return (self.series_dir(symbol, timeframe) / LIVE_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_live(self, symbol: str, timeframe: str, version: str):
+        """Atomically point LIVE at a registered version (also used to roll back)"""
+        if not (self.series_dir(symbol, timeframe) / version / MANIFEST_FILE).exists():
+            raise KeyError(f"{symbol} {timeframe} has no version {version}")
+        _write_atomic(self.series_dir(symbol, timeframe) / LIVE_FILE, version.encode())
+
+    def load(self, symbol: str, timeframe: str, version: Optional[str] = None, verify: bool = False) -> LoadedModel:
+        """
+        Load a version (default: live), cached after the first load
+
+        Args:
+            verify: Check file hashes against the manifest first
+        """
+        version = version or self.live_version(symbol, timeframe)
+        if version is None:
+            raise KeyError(f"No live model for {symbol} {timeframe}")
+        key = (symbol, timeframe, version)
+        loaded = self.cache.get(key)
+        if loaded is not None:
+            return loaded
+
+        directory = self.series_dir(symbol, timeframe) / version
+        with open(directory / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+        if verify:
+            for name, digest in manifest['files'].items():
+                if _sha256(directory / name) != digest:
+                    raise ValueError(f"{directory / name} does not match its manifest hash")
+
+        booster = xgb.Booster()
+        booster.load_model(str(directory / MODEL_FILE))
+        mean, scale = np.load(directory / SCALER_FILE)
+        reference = DriftReference.load(str(directory / DRIFT_FILE)) if DRIFT_FILE in manifest['files'] else None
+        loaded = LoadedModel(booster, mean, scale, manifest, reference)
+        with self.lock:
+            self.cache.setdefault(key, loaded)
+        return self.cache[key]
+
+    def live(self, symbol: str, timeframe: str) -> LoadedModel:
+        """
+        Current live model, hot-swapped when LIVE changes
+
+        Call per batch of predictions: the pointer is re-read only after
+        set_live() (here or in another process) replaced it.
+        """
+        key = (symbol, timeframe)
+        stat = os.stat(self.series_dir(symbol, timeframe) / LIVE_FILE)
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        pointer = self.live_pointers.get(key)
+        if pointer is None or pointer[0] != identity:
+            pointer = (identity, self.live_version(symbol, timeframe))
+            self.live_pointers[key] = pointer
+        return self.load(symbol, timeframe, pointer[1])
+
+    def evict(self, keep_live: bool = True):
+        """Drop cached versions (all but the live ones when keep_live)"""
+        with self.lock:
+            live = {(s, t, v) for (s, t), (_, v) in self.live_pointers.items()} if keep_live else set()
+            self.cache = {key: value for key, value in self.cache.items() if key in live}
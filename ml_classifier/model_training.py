@@ -3,10 +3,14 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 import pandas as pd
+import numpy as np
 
+from modules import metrics
 
-def train_signal_classifier(df: pd.DataFrame, feature_columns: list, test_size: float = 0.3, random_state: int = 42):
-    """Train an XGBoost classifier to distinguish true vs false signals."""
+
+def train_signal_classifier(df: pd.DataFrame, feature_columns: list, test_size: float = 0.3, random_state: int = 42,
+                            n_jobs: int = None):
+    """Train an XGBoost classifier to distinguish true vs false signals (n_jobs: XGBoost threads)."""
     X = df[feature_columns].values
     y = df['label'].values
     
@@ -25,7 +29,8 @@ def train_signal_classifier(df: pd.DataFrame, feature_columns: list, test_size:
         colsample_bytree=0.8,
         random_state=random_state,
         objective='binary:logistic',
-        eval_metric='logloss'
+        eval_metric='logloss',
+        n_jobs=n_jobs
     )
     
     model.fit(X_train, y_train)
@@ -38,3 +43,15 @@ def train_signal_classifier(df: pd.DataFrame, feature_columns: list, test_size:
         'scaler': scaler,
         'report': report
     }
+
+
+def score_signals(model, scaler, df: pd.DataFrame, feature_columns: list, monitor=None) -> np.ndarray:
+    """Probability that each signal is a true one, recording scoring latency metrics (and drift when monitor is given)."""
+    with metrics.SCORING_SECONDS.time():
+        values = df[feature_columns].values
+        X = scaler.transform(values)
+        scores = model.predict_proba(X)[:, 1]
+    metrics.SCORED_SIGNALS.inc(len(scores))
+    if monitor is not None:
+        monitor.update_batch(values)
+    return scores
@@ -0,0 +1,160 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .feature_engineering import get_feature_columns
+
+
+def write_feature_array(df: pd.DataFrame, path: str, feature_columns: Optional[List[str]] = None,
+                        fill_value: float = 0.0) -> str:
+    """
+    Write indicator features as a (rows, features) float32 .npy file for memory mapping
+
+    Args:
+        df: Output of calculate() (the full series, not only the signal rows)
+        path: Destination .npy file
+        feature_columns: Columns to store (default: get_feature_columns())
+        fill_value: Replacement for NaN/inf (indicator warm-up rows)
+
+    Returns:
+        path
+    """
+    feature_columns = feature_columns or get_feature_columns()
+    array = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(len(df), len(feature_columns)))
+    for k, name in enumerate(feature_columns):
+        array[:, k] = np.nan_to_num(df[name].to_numpy(dtype=np.float64), nan=fill_value,
+                                    posinf=fill_value, neginf=fill_value)
+    array.flush()
+    del array
+    return path
+
+
+class SequenceDataset:
+    """
+    (window, features) samples ending at each signal candle, as views of a memory-mapped array
+
+    The feature file is opened lazily and not pickled, so each DataLoader
+    worker maps it itself. Samples are sliding_window_view slices of the
+    mapping; nothing is copied until a batch is assembled.
+
+    Works directly as a map-style torch Dataset (torch only needs __len__ and
+    __getitem__); use make_dataloader for batched loading.
+    """
+
+    def __init__(self, feature_path: str, indices: Sequence[int], labels: Optional[Sequence] = None,
+                 window: int = 64):
+        """
+        Initialize dataset
+
+        Args:
+            feature_path: .npy file from write_feature_array
+            indices: Row of each signal in the feature array (e.g. event 'index')
+            labels: Per-signal targets aligned with indices (optional)
+            window: Candles per sample, ending at (and including) the signal candle
+        """
+        self.feature_path = feature_path
+        self.window = window
+        self._windows = None
+
+        indices = np.asarray(indices, dtype=np.int64)
+        valid = indices >= window - 1
+        self.indices = indices[valid]
+        self.labels = None if labels is None else np.asarray(labels)[valid]
+        self.dropped = int((~valid).sum())
+
+    @property
+    def windows(self) -> np.ndarray:
+        """(rows - window + 1, window, features) view over the memory-mapped features"""
+        if self._windows is None:
+            features = np.load(self.feature_path, mmap_mode='r')
+            if len(features) and self.indices.size and self.indices.max() >= len(features):
+                raise IndexError(f"Signal index {self.indices.max()} is past the end of {self.feature_path}")
+            self._windows = sliding_window_view(features, self.window, axis=0).transpose(0, 2, 1)
+        return self._windows
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_windows'] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def sample(self, position: int) -> np.ndarray:
+        """Read-only (window, features) view for one signal"""
+        return self.windows[self.indices[position] - self.window + 1]
+
+    def __getitem__(self, position: int):
+        x = np.array(self.sample(position))
+        return x if self.labels is None else (x, self.labels[position])
+
+    def __getitems__(self, positions: List[int]):
+        # One gather per batch instead of one copy per sample (torch's batched fetch hook)
+        x = self.windows[self.indices[positions] - self.window + 1]
+        return x if self.labels is None else (x, self.labels[positions])
+
+    @property
+    def shape(self):
+        return (len(self), self.window, self.windows.shape[2])
+
+
+def build_sequence_dataset(df: pd.DataFrame, feature_path: str, window: int = 64,
+                           labels: Optional[Sequence] = None,
+                           feature_columns: Optional[List[str]] = None) -> SequenceDataset:
+    """
+    Write the feature array of a calculate() frame and index it by its signals
+
+    Args:
+        df: Output of calculate()
+        feature_path: Destination .npy file
+        window: Candles per sample
+        labels: Targets for the signal rows. A Series is aligned on df's index:
+                label_signals(prepare_signal_data(df))['label'] keeps df's index
+                but drops the last hold_period signals, and signals without a
+                label are left out. Any other sequence must have one target
+                per signal row, in order.
+        feature_columns: Feature columns (default: get_feature_columns())
+
+    Raises:
+        ValueError: labels is not a Series and its length differs from the signal count
+    """
+    rows = np.flatnonzero(df['signal'].to_numpy())
+    if isinstance(labels, pd.Series):
+        rows = rows[df.index[rows].isin(labels.index)]
+        labels = labels.reindex(df.index[rows]).to_numpy()
+    elif labels is not None and len(labels) != len(rows):
+        raise ValueError(f"{len(labels)} labels for {len(rows)} signal rows; pass a Series indexed like df to align")
+    write_feature_array(df, feature_path, feature_columns)
+    return SequenceDataset(feature_path, rows, labels, window)
+
+
+def _to_tensors(batch):
+    import torch
+
+    if isinstance(batch, tuple):
+        x, y = batch
+        return torch.from_numpy(np.ascontiguousarray(x)), torch.as_tensor(y)
+    return torch.from_numpy(np.ascontiguousarray(batch))
+
+
+def make_dataloader(dataset: SequenceDataset, batch_size: int = 256, shuffle: bool = True,
+                    num_workers: int = 0, **kwargs):
+    """
+    torch DataLoader yielding (batch, window, features) float32 tensors (and labels)
+
+    Batches are gathered with one fancy-index read per batch through
+    SequenceDataset.__getitems__.
+    """
+    from torch.utils.data import DataLoader
+
+    return DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        num_workers=num_workers,
+        collate_fn=_to_tensors,
+        persistent_workers=num_workers > 0,
+        **kwargs
+    )
@@ -0,0 +1,189 @@
+import json
+import os
+import struct
+from typing import List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import get_feature_columns
+
+
+EVENT_LOG_MAGIC = b'SIGEVT01'
+HEADER_ALIGN = 64
+
+
+def event_dtype(feature_columns: Optional[List[str]] = None) -> np.dtype:
+    """Record layout of one signal event"""
+    feature_columns = feature_columns or get_feature_columns()
+    return np.dtype([
+        ('index', '<i8'),
+        ('open_time', '<i8'),
+        ('close', '<f8'),
+        ('direction', 'i1'),
+        ('strength', '<f4'),
+        ('features', '<f4', (len(feature_columns),)),
+    ])
+
+
+def _epoch_ms(values) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ms]').astype(np.int64)
+    return values.astype(np.int64)
+
+
+def extract_events(data: Mapping, feature_columns: Optional[List[str]] = None,
+                   index_offset: int = 0) -> np.ndarray:
+    """
+    Gather the candles with a non-zero signal into event records
+
+    Only the signal rows of each feature column are read, so nothing the size
+    of the dense frame is copied.
+
+    Args:
+        data: Output of calculate() (DataFrame or dict of columns)
+        feature_columns: Features to keep per event (default: get_feature_columns())
+        index_offset: Added to row positions (position of data's first row in the full series)
+
+    Returns:
+        Structured array with event_dtype(feature_columns)
+    """
+    feature_columns = feature_columns or get_feature_columns()
+    signal = np.asarray(data['signal'])
+    rows = np.flatnonzero(signal)
+
+    events = np.empty(len(rows), dtype=event_dtype(feature_columns))
+    events['index'] = rows + index_offset
+    events['open_time'] = _epoch_ms(np.asarray(data['open_time'])[rows]) if 'open_time' in data else -1
+    events['close'] = np.asarray(data['close'], dtype=np.float64)[rows]
+    events['direction'] = signal[rows]
+    events['strength'] = np.asarray(data['signal_strength'], dtype=np.float64)[rows]
+    for k, name in enumerate(feature_columns):
+        events['features'][:, k] = np.asarray(data[name], dtype=np.float64)[rows]
+    return events
+
+
+def events_to_frame(events: np.ndarray, feature_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Events as a DataFrame shaped like prepare_signal_data output
+
+    Has close, signal, signal_strength and the feature columns, so label_signals
+    and train_signal_classifier work on it unchanged.
+    """
+    feature_columns = feature_columns or get_feature_columns()
+    df = pd.DataFrame({
+        'open_time': pd.to_datetime(events['open_time'], unit='ms'),
+        'close': events['close'],
+        'signal': events['direction'].astype(np.int64),
+        'signal_strength': events['strength'],
+    }, index=pd.Index(events['index'], name='index'))
+    features = pd.DataFrame(np.asarray(events['features']), columns=feature_columns, index=df.index)
+    return pd.concat([df, features], axis=1)
+
+
+class SignalEventLog:
+    """
+    Append-only binary log of signal events
+
+    Layout: 8-byte magic, 4-byte header length, a JSON header (feature columns,
+    symbol, timeframe) padded to 64 bytes, then fixed-size event_dtype
+    records. Appends only write records at the end, and a record cut short by
+    a crash is ignored by readers, so the log never needs rewriting.
+    """
+
+    def __init__(self, path: str, feature_columns: Optional[List[str]] = None,
+                 symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """
+        Open or create a log
+
+        Args:
+            path: Log file
+            feature_columns: Feature layout of a new log (an existing log keeps its own)
+            symbol: Stored in the header of a new log
+            timeframe: Stored in the header of a new log
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.header, self.offset = self._read_header()
+        else:
+            self.header = {
+                'feature_columns': list(feature_columns or get_feature_columns()),
+                'symbol': symbol,
+                'timeframe': timeframe,
+            }
+            self.offset = self._write_header()
+
+        self.feature_columns = self.header['feature_columns']
+        if feature_columns is not None and list(feature_columns) != self.feature_columns:
+            raise ValueError(f"{path} stores features {self.feature_columns}, not {list(feature_columns)}")
+        self.dtype = event_dtype(self.feature_columns)
+
+    def _read_header(self):
+        with open(self.path, 'rb') as f:
+            if f.read(len(EVENT_LOG_MAGIC)) != EVENT_LOG_MAGIC:
+                raise ValueError(f"{self.path} is not a signal event log")
+            (length,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(length).rstrip(b' '))
+        return header, len(EVENT_LOG_MAGIC) + 4 + length
+
+    def _write_header(self) -> int:
+        payload = json.dumps(self.header).encode()
+        prefix = len(EVENT_LOG_MAGIC) + 4
+        length = -(-(prefix + len(payload)) // HEADER_ALIGN) * HEADER_ALIGN - prefix
+        with open(self.path, 'wb') as f:
+            f.write(EVENT_LOG_MAGIC + struct.pack('<I', length) + payload.ljust(length, b' '))
+        return prefix + length
+
+    def __len__(self) -> int:
+        return (os.path.getsize(self.path) - self.offset) // self.dtype.itemsize
+
+    def last_open_time(self) -> Optional[int]:
+        """open_time (epoch ms) of the newest logged event"""
+        events = self.read()
+        return int(events['open_time'][-1]) if len(events) else None
+
+    def append(self, events: np.ndarray, skip_existing: bool = True) -> int:
+        """
+        Append event records
+
+        Args:
+            events: Output of extract_events with this log's feature columns
+            skip_existing: Drop events not newer than the last logged one, so
+                           re-running a pipeline over overlapping data is safe
+
+        Returns:
+            Number of events written
+        """
+        events = np.asarray(events).astype(self.dtype, copy=False)
+        if skip_existing and len(events):
+            last = self.last_open_time()
+            if last is not None and last >= 0:
+                events = events[events['open_time'] > last]
+        if not len(events):
+            return 0
+
+        size = self.offset + len(self) * self.dtype.itemsize
+        with open(self.path, 'r+b') as f:
+            # Drop a partial record left by an interrupted append
+            f.truncate(size)
+            f.seek(size)
+            f.write(events.tobytes())
+        return len(events)
+
+    def read(self) -> np.ndarray:
+        """All events as a read-only memory-mapped structured array"""
+        count = len(self)
+        if count == 0:
+            return np.empty(0, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode='r', offset=self.offset, shape=(count,))
+
+    def to_frame(self) -> pd.DataFrame:
+        return events_to_frame(self.read(), self.feature_columns)
+
+
+def write_signal_events(df: pd.DataFrame, path: str, symbol: Optional[str] = None,
+                        timeframe: Optional[str] = None) -> int:
+    """Extract events from a calculate() frame and append the new ones to a log"""
+    log = SignalEventLog(path, symbol=symbol, timeframe=timeframe)
+    return log.append(extract_events(df, log.feature_columns))
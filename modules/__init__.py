@@ -1,3 +1,17 @@
 from .indicators import CompositeIndicator
+from .data_fetch import KlineFetcher, get_fetcher
+from .replay import ReplayEngine
+from .ingestion import IngestionDaemon, KlineStore
+from .shared_data import SharedKlineStore
+from .portfolio import PortfolioSimulator
 
-__all__ = ['CompositeIndicator']
+__all__ = [
+    'CompositeIndicator',
+    'KlineFetcher',
+    'get_fetcher',
+    'ReplayEngine',
+    'IngestionDaemon',
+    'KlineStore',
+    'SharedKlineStore',
+    'PortfolioSimulator'
+]
@@ -0,0 +1,138 @@
+import time
+import tracemalloc
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .indicators import CompositeIndicator
+
+
+INPUT_COLUMNS = ('high', 'low', 'close', 'volume')
+
+
+def read_klines_table(path: str) -> pa.Table:
+    """Read a kline Parquet file as a pyarrow.Table (memory-mapped, no pandas conversion)"""
+    return pq.read_table(path, memory_map=True)
+
+
+def column_view(table: pa.Table, name: str) -> np.ndarray:
+    """
+    NumPy view of a numeric column
+
+    Zero-copy for a single-chunk column without nulls (the usual case for a
+    Parquet file with one row group); multi-chunk columns are combined once.
+    """
+    column = table.column(name)
+    if column.num_chunks == 1 and column.null_count == 0:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    return column.combine_chunks().to_numpy(zero_copy_only=False)
+
+
+def calculate_table(table: pa.Table, indicator: Optional[CompositeIndicator] = None) -> pa.Table:
+    """
+    Append CompositeIndicator output columns to a kline table
+
+    The indicator runs on Series wrapped around zero-copy views of the Arrow
+    buffers, and its outputs are handed back to Arrow without copying, so the
+    input is never converted to a DataFrame and never duplicated.
+
+    Args:
+        table: Kline table with [high, low, close, volume] columns
+        indicator: Configured indicator (default settings if None)
+
+    Returns:
+        Input table with the calculate() output columns appended
+    """
+    indicator = indicator or CompositeIndicator()
+    inputs = {name: pd.Series(column_view(table, name), copy=False) for name in INPUT_COLUMNS}
+
+    for name, values in indicator.calculate_columns(inputs).items():
+        array = pa.array(values.to_numpy(), from_pandas=False)
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, array)
+        else:
+            table = table.append_column(name, array)
+
+    return table
+
+
+def write_table(table: pa.Table, path: str, format: str = 'parquet'):
+    """
+    Write an indicator table for the feature store or dashboard
+
+    Args:
+        table: Output of calculate_table
+        path: Destination file
+        format: 'parquet' or 'ipc' (Arrow IPC file, memory-mappable by readers)
+    """
+    if format == 'parquet':
+        pq.write_table(table, path)
+    elif format == 'ipc':
+        with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown format: {format}")
+
+
+def compare_with_pandas(path: str, indicator: Optional[CompositeIndicator] = None, repeat: int = 3) -> pd.DataFrame:
+    """
+    Time and peak memory of the pandas path vs the Arrow path on one file
+
+    Both paths end with the output columns as NumPy arrays, which is what the
+    ML code consumes. Peak memory counts NumPy allocations (tracemalloc) plus
+    the Arrow memory pool high-water mark.
+
+    Returns:
+        DataFrame with one row per path: seconds (best of repeat) and peak_mb
+    """
+    indicator = indicator or CompositeIndicator()
+
+    def pandas_path():
+        df = indicator.calculate(pd.read_parquet(path))
+        return df.values
+
+    def arrow_path():
+        table = calculate_table(read_klines_table(path), indicator)
+        return [column_view(table, name) for name in table.column_names if name != 'open_time']
+
+    rows = []
+    for name, run in [('pandas', pandas_path), ('arrow', arrow_path)]:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+
+        # A proxy pool tracks its own high-water mark for just this run
+        default_pool = pa.default_memory_pool()
+        proxy_pool = pa.proxy_memory_pool(default_pool)
+        pa.set_memory_pool(proxy_pool)
+        tracemalloc.start()
+        try:
+            output = run()
+            numpy_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            pa.set_memory_pool(default_pool)
+        arrow_peak = proxy_pool.max_memory() or 0
+        del output
+
+        rows.append({'path': name, 'seconds': best, 'peak_mb': (numpy_peak + arrow_peak) / 1e6})
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    from modules.data_fetch import get_fetcher
+
+    symbol = sys.argv[1] if len(sys.argv) > 1 else 'BTCUSDT'
+    timeframe = sys.argv[2] if len(sys.argv) > 2 else '15m'
+
+    path = get_fetcher().resolve(symbol, timeframe)
+    print(f"Comparing pandas and Arrow indicator paths on {symbol} ({timeframe})")
+    print(compare_with_pandas(path).to_string(index=False))
@@ -0,0 +1,112 @@
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .fused_kernel import compute_arrays, new_state
+from .indicators import OUTPUT_COLUMNS
+
+
+INPUT_COLUMNS = ('high', 'low', 'close', 'volume')
+
+
+def _batch_column(batch: pa.RecordBatch, name: str) -> np.ndarray:
+    return batch.column(batch.schema.get_field_index(name)).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+
+
+def calculate_parquet(source: str, destination: str, lookback: int = 20, batch_size: int = 1_000_000,
+                      columns: Optional[List[str]] = None, compression: str = 'zstd') -> dict:
+    """
+    Compute CompositeIndicator columns for a Parquet kline file one batch at a time
+
+    The fused kernel's state (every rolling window, EWM and shift) is carried
+    from batch to batch, so the written file is identical to a full in-memory
+    run while memory stays bounded by batch_size rows of input and output.
+    A warm-up overlap would not be exact here: the EWMs never forget.
+
+    Args:
+        source: Kline Parquet file sorted by open_time
+        destination: Output Parquet file (input columns + OUTPUT_COLUMNS)
+        lookback: Lookback period for SMA
+        batch_size: Rows per batch
+        columns: Input columns to carry through (default: all)
+        compression: Parquet compression codec
+
+    Returns:
+        Dict with rows, batches and seconds
+    """
+    start = time.perf_counter()
+    parquet = pq.ParquetFile(source)
+    carried = [name for name in (columns or parquet.schema_arrow.names) if name not in OUTPUT_COLUMNS]
+    read_columns = list(dict.fromkeys(carried + list(INPUT_COLUMNS)))
+
+    schema = pa.schema(
+        [parquet.schema_arrow.field(name) for name in carried] +
+        [pa.field(name, pa.int64() if name == 'signal' else pa.float64()) for name in OUTPUT_COLUMNS]
+    )
+
+    state = new_state(lookback)
+    rows = 0
+    batches = 0
+
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    with pq.ParquetWriter(destination, schema, compression=compression) as writer:
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=read_columns):
+            if batch.num_rows == 0:
+                continue
+            out, state = compute_arrays(*[_batch_column(batch, name) for name in INPUT_COLUMNS],
+                                        lookback=lookback, state=state)
+
+            arrays = [batch.column(batch.schema.get_field_index(name)) for name in carried]
+            for k, name in enumerate(OUTPUT_COLUMNS):
+                arrays.append(pa.array(out[k].astype(np.int64) if name == 'signal' else out[k]))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+            rows += batch.num_rows
+            batches += 1
+            del out, arrays, batch
+
+    return {'rows': rows, 'batches': batches, 'seconds': time.perf_counter() - start}
+
+
+def calculate_symbols(symbols: List[str], timeframe: str, output_dir: str, lookback: int = 20,
+                      batch_size: int = 1_000_000) -> Dict[str, dict]:
+    """
+    Chunked indicator computation for many symbols' full histories
+
+    Files are resolved through the shared kline fetcher and processed one at a
+    time, so peak memory is one batch regardless of the number of symbols.
+
+    Returns:
+        Dict of symbol -> calculate_parquet stats (or {'error': message})
+    """
+    from .data_fetch import get_fetcher
+
+    fetcher = get_fetcher()
+    results = {}
+    for symbol in symbols:
+        try:
+            source = fetcher.resolve(symbol, timeframe)
+            destination = str(Path(output_dir) / f"{symbol}_{timeframe}_indicators.parquet")
+            results[symbol] = calculate_parquet(source, destination, lookback, batch_size)
+        except Exception as e:
+            results[symbol] = {'error': str(e)}
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chunked indicator computation over full kline histories")
+    parser.add_argument("symbols", type=str, help="Comma separated symbols")
+    parser.add_argument("timeframe", type=str, nargs="?", default="15m")
+    parser.add_argument("--output-dir", type=str, default="./indicator_output")
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for symbol, stats in calculate_symbols(args.symbols.split(','), args.timeframe,
+                                           args.output_dir, batch_size=args.batch_size).items():
+        print(f"{symbol}: {stats}")
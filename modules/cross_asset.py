@@ -0,0 +1,287 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .jit import njit
+
+
+DEFAULT_BENCHMARKS = ('BTCUSDT', 'ETHUSDT')
+
+
+def benchmark_suffix(symbol: str) -> str:
+    """Column suffix for a benchmark symbol ('BTCUSDT' -> 'btc')"""
+    return symbol.replace('USDT', '').lower()
+
+
+def log_returns(close: np.ndarray) -> np.ndarray:
+    """Bar log returns along axis 0; NaN where this or the previous close is missing"""
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.full(close.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[1:] = np.log(close[1:] / close[:-1])
+    return returns
+
+
+@njit(cache=True, inline='always')
+def _corr_beta(n, sx, sy, sxx, syy, sxy):
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    corr = cov / np.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else np.nan
+    beta = cov / var_y if var_y > 0 else np.nan
+    return corr, beta
+
+
+@njit(cache=True, error_model='numpy')
+def _comoment_kernel(x, y, window, min_periods):
+    n_bars, n_symbols = x.shape
+    n_benchmarks = y.shape[1]
+    sx = np.zeros((n_symbols, n_benchmarks))
+    sy = np.zeros((n_symbols, n_benchmarks))
+    sxx = np.zeros((n_symbols, n_benchmarks))
+    syy = np.zeros((n_symbols, n_benchmarks))
+    sxy = np.zeros((n_symbols, n_benchmarks))
+    count = np.zeros((n_symbols, n_benchmarks), dtype=np.int64)
+    corr = np.full((n_bars, n_symbols, n_benchmarks), np.nan)
+    beta = np.full((n_bars, n_symbols, n_benchmarks), np.nan)
+
+    for t in range(n_bars):
+        for i in range(n_symbols):
+            for b in range(n_benchmarks):
+                xv = x[t, i]
+                yv = y[t, b]
+                if xv == xv and yv == yv:
+                    sx[i, b] += xv
+                    sy[i, b] += yv
+                    sxx[i, b] += xv * xv
+                    syy[i, b] += yv * yv
+                    sxy[i, b] += xv * yv
+                    count[i, b] += 1
+                if t >= window:
+                    xo = x[t - window, i]
+                    yo = y[t - window, b]
+                    if xo == xo and yo == yo:
+                        sx[i, b] -= xo
+                        sy[i, b] -= yo
+                        sxx[i, b] -= xo * xo
+                        syy[i, b] -= yo * yo
+                        sxy[i, b] -= xo * yo
+                        count[i, b] -= 1
+                n = count[i, b]
+                if n >= min_periods and n > 1:
+                    corr[t, i, b], beta[t, i, b] = _corr_beta(n, sx[i, b], sy[i, b], sxx[i, b], syy[i, b], sxy[i, b])
+
+    return corr, beta
+
+
+def rolling_corr_beta(returns: np.ndarray, benchmark_returns: np.ndarray, window: int = 96,
+                      min_periods: Optional[int] = None):
+    """
+    Rolling correlation and beta of every symbol against every benchmark
+
+    Co-moment sums (x, y, x^2, y^2, xy, count) per pair are updated by adding
+    the new bar and removing the one leaving the window, O(1) per bar per pair.
+    A bar counts only where both returns exist.
+
+    Args:
+        returns: (bars, symbols) returns
+        benchmark_returns: (bars, benchmarks) returns on the same grid
+        window: Bars per window
+        min_periods: Minimum paired observations (default: window)
+
+    Returns:
+        (corr, beta), both (bars, symbols, benchmarks)
+    """
+    min_periods = window if min_periods is None else min_periods
+    return _comoment_kernel(np.ascontiguousarray(returns, dtype=np.float64),
+                            np.ascontiguousarray(benchmark_returns, dtype=np.float64), window, min_periods)
+
+
+def universe_breadth(signal: np.ndarray, trend_score: np.ndarray, valid: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Share of listed symbols with a buy signal and with a positive trend_score, per bar
+
+    Args:
+        signal, trend_score: (bars, symbols)
+        valid: (bars, symbols) True where the symbol has a candle
+    """
+    listed = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'breadth_buy': np.where(listed > 0, ((signal == 1) & valid).sum(axis=1) / listed, np.nan),
+            'breadth_trend': np.where(listed > 0, ((trend_score > 0) & valid).sum(axis=1) / listed, np.nan),
+        }
+
+
+def align_columns(frames: Dict[str, pd.DataFrame], columns: Sequence[str],
+                  time_column: str = 'open_time') -> dict:
+    """
+    (bars, symbols) arrays of the given columns on the union time grid (NaN where missing)
+
+    Returns:
+        Dict with index, symbols, rows (per-symbol grid rows) and one array per column
+    """
+    symbols = list(frames)
+    index = pd.DatetimeIndex(sorted(set().union(*[frames[s][time_column] for s in symbols])))
+    grid = {'index': index, 'symbols': symbols, 'rows': {}}
+    for column in columns:
+        grid[column] = np.full((len(index), len(symbols)), np.nan)
+
+    for j, symbol in enumerate(symbols):
+        df = frames[symbol]
+        rows = index.get_indexer(df[time_column])
+        grid['rows'][symbol] = rows
+        for column in columns:
+            grid[column][rows, j] = df[column].to_numpy(dtype=np.float64)
+    return grid
+
+
+def cross_asset_features(frames: Dict[str, pd.DataFrame], benchmarks: Sequence[str] = DEFAULT_BENCHMARKS,
+                         window: int = 96) -> Dict[str, pd.DataFrame]:
+    """
+    Correlation, beta and breadth features for every symbol of a universe
+
+    Args:
+        frames: symbol -> calculate() output with open_time (benchmarks included)
+        benchmarks: Benchmark symbols (must be in frames)
+        window: Bars per correlation window (96 = one day of 15m bars)
+
+    Returns:
+        symbol -> DataFrame aligned with frames[symbol]: corr_<bench>,
+        beta_<bench>, breadth_buy, breadth_trend
+    """
+    missing = [b for b in benchmarks if b not in frames]
+    if missing:
+        raise KeyError(f"Benchmarks not in frames: {missing}")
+
+    grid = align_columns(frames, ['close', 'signal', 'trend_score'])
+    returns = log_returns(grid['close'])
+    columns = [grid['symbols'].index(b) for b in benchmarks]
+    corr, beta = rolling_corr_beta(returns, returns[:, columns], window)
+    breadth = universe_breadth(grid['signal'], grid['trend_score'], ~np.isnan(grid['close']))
+
+    features = {}
+    for j, symbol in enumerate(grid['symbols']):
+        rows = grid['rows'][symbol]
+        data = {}
+        for b, bench in enumerate(benchmarks):
+            data[f'corr_{benchmark_suffix(bench)}'] = corr[rows, j, b]
+            data[f'beta_{benchmark_suffix(bench)}'] = beta[rows, j, b]
+        data['breadth_buy'] = breadth['breadth_buy'][rows]
+        data['breadth_trend'] = breadth['breadth_trend'][rows]
+        features[symbol] = pd.DataFrame(data, index=frames[symbol].index)
+    return features
+
+
+class CrossAssetMonitor:
+    """
+    Live cross-asset features updated once per closed bar
+
+    Keeps the last window of returns in ring buffers and the co-moment sums
+    per (symbol, benchmark) pair, so each update costs O(symbols x benchmarks)
+    whatever the window, and gives the same values as rolling_corr_beta.
+    """
+
+    def __init__(self, symbols: List[str], benchmarks: Sequence[str] = DEFAULT_BENCHMARKS,
+                 window: int = 96, min_periods: Optional[int] = None):
+        self.symbols = list(symbols)
+        self.benchmarks = list(benchmarks)
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.benchmark_columns = [self.symbols.index(b) for b in self.benchmarks]
+
+        shape = (len(self.symbols), len(self.benchmarks))
+        self.sums = {name: np.zeros(shape) for name in ('x', 'y', 'xx', 'yy', 'xy')}
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.ring = np.full((window, len(self.symbols)), np.nan)
+        self.prev_close = np.full(len(self.symbols), np.nan)
+        self.bars = 0
+
+    def _apply(self, x: np.ndarray, sign: float):
+        y = x[self.benchmark_columns]
+        pair = ~np.isnan(x)[:, None] & ~np.isnan(y)[None, :]
+        xs = np.where(pair, x[:, None], 0.0)
+        ys = np.where(pair, y[None, :], 0.0)
+        self.sums['x'] += sign * xs
+        self.sums['y'] += sign * ys
+        self.sums['xx'] += sign * xs * xs
+        self.sums['yy'] += sign * ys * ys
+        self.sums['xy'] += sign * xs * ys
+        self.count += (1 if sign > 0 else -1) * pair
+
+    def update(self, close: np.ndarray, signal: Optional[np.ndarray] = None,
+               trend_score: Optional[np.ndarray] = None) -> dict:
+        """
+        Add one closed bar for every symbol
+
+        Args:
+            close: (symbols,) closes, NaN for symbols without a candle
+            signal, trend_score: (symbols,) latest values for breadth (optional)
+
+        Returns:
+            Dict with corr and beta (symbols, benchmarks) and breadth_buy /
+            breadth_trend when signal / trend_score are given
+        """
+        close = np.asarray(close, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = np.log(close / self.prev_close)
+        self.prev_close = close
+
+        slot = self.bars % self.window
+        self._apply(x, 1.0)
+        if self.bars >= self.window:
+            self._apply(self.ring[slot], -1.0)
+        self.ring[slot] = x
+        self.bars += 1
+
+        n = self.count
+        s = self.sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = n * s['xy'] - s['x'] * s['y']
+            var_x = n * s['xx'] - s['x'] * s['x']
+            var_y = n * s['yy'] - s['y'] * s['y']
+            ready = (n >= self.min_periods) & (n > 1)
+            corr = np.where(ready & (var_x > 0) & (var_y > 0), cov / np.sqrt(var_x * var_y), np.nan)
+            beta = np.where(ready & (var_y > 0), cov / var_y, np.nan)
+
+        result = {'corr': corr, 'beta': beta}
+        if signal is not None or trend_score is not None:
+            valid = ~np.isnan(close)[None, :]
+            breadth = universe_breadth(
+                np.asarray(signal if signal is not None else np.zeros(len(close)))[None, :],
+                np.asarray(trend_score if trend_score is not None else np.zeros(len(close)))[None, :],
+                valid
+            )
+            if signal is not None:
+                result['breadth_buy'] = float(breadth['breadth_buy'][0])
+            if trend_score is not None:
+                result['breadth_trend'] = float(breadth['breadth_trend'][0])
+        return result
+
+
+def benchmark(n_symbols: int = 200, n_bars: int = 2000, window: int = 96, seed: int = 0) -> dict:
+    """Per-bar cost of the live monitor and total cost of the batch kernel"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, (n_bars, n_symbols)), axis=0))
+    symbols = [f"SYM{i}USDT" for i in range(n_symbols - 2)] + list(DEFAULT_BENCHMARKS)
+
+    returns = log_returns(close)
+    rolling_corr_beta(returns[:10], returns[:10, -2:], window)
+    start = time.perf_counter()
+    rolling_corr_beta(returns, returns[:, -2:], window)
+    batch = time.perf_counter() - start
+
+    monitor = CrossAssetMonitor(symbols, window=window)
+    signal = rng.choice([-1, 0, 1], size=n_symbols)
+    start = time.perf_counter()
+    for t in range(n_bars):
+        monitor.update(close[t], signal, signal.astype(np.float64))
+    per_bar = (time.perf_counter() - start) / n_bars
+
+    return {'symbols': n_symbols, 'bars': n_bars, 'batch_seconds': batch, 'monitor_ms_per_bar': per_bar * 1e3}
+
+
+if __name__ == "__main__":
+    print(benchmark())
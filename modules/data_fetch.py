@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+KLINES_REPO_ID = "zongowo111/v2-crypto-ohlcv-data"
+
+
+def kline_path_in_repo(symbol: str, timeframe: str) -> str:
+    """Path of a symbol/timeframe Parquet file inside the HuggingFace dataset"""
+    base = symbol.replace("USDT", "")
+    return f"klines/{symbol}/{base}_{timeframe}.parquet"
+
+
+class HubBackend:
+    """Files from the HuggingFace dataset, cached by huggingface_hub"""
+
+    revalidates = True
+
+    def __init__(self, repo_id: str = KLINES_REPO_ID, cache_dir: str = './data_cache'):
+        self.repo_id = repo_id
+        self.cache_dir = cache_dir
+
+    def cached_path(self, path_in_repo: str) -> Optional[str]:
+        """Local snapshot path if the file was downloaded before (no network)"""
+        from huggingface_hub import try_to_load_from_cache
+
+        path = try_to_load_from_cache(
+            repo_id=self.repo_id,
+            filename=path_in_repo,
+            cache_dir=self.cache_dir,
+            repo_type="dataset"
+        )
+        return path if isinstance(path, str) else None
+
+    def download(self, path_in_repo: str) -> str:
+        from huggingface_hub import hf_hub_download
+
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        return hf_hub_download(
+            repo_id=self.repo_id,
+            filename=path_in_repo,
+            repo_type="dataset",
+            cache_dir=self.cache_dir
+        )
+
+
+class MirrorBackend:
+    """Files from a local directory laid out like the dataset (klines/<SYMBOL>/<BASE>_<tf>.parquet)"""
+
+    revalidates = False
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def cached_path(self, path_in_repo: str) -> Optional[str]:
+        path = self.root / path_in_repo
+        return str(path) if path.exists() else None
+
+    def download(self, path_in_repo: str) -> str:
+        raise FileNotFoundError(f"{path_in_repo} is not in mirror {self.root}")
+
+
+class KlineFetcher:
+    """
+    Offline-first resolution of kline files to local paths
+
+    A cached file is used without any network round-trip while its last
+    revalidation is younger than metadata_ttl, or always in offline mode.
+    Revalidation times persist in a small JSON file next to the cache so warm
+    runs in new processes stay offline too.
+    """
+
+    def __init__(self, backend=None, offline: bool = False, metadata_ttl: float = 3600.0,
+                 meta_path: Optional[str] = None):
+        """
+        Initialize fetcher
+
+        Args:
+            backend: HubBackend (default) or MirrorBackend
+            offline: Never touch the network; missing files raise FileNotFoundError
+            metadata_ttl: Seconds a cached file is trusted before revalidating it
+            meta_path: Revalidation metadata file (default: <cache_dir>/.kline_fetch_meta.json)
+        """
+        self.backend = backend or HubBackend()
+        self.offline = offline
+        self.metadata_ttl = metadata_ttl
+        self.meta_path = Path(meta_path or Path(getattr(self.backend, 'cache_dir', '.')) / '.kline_fetch_meta.json')
+        self.lock = threading.Lock()
+        self.validated = self._read_meta()
+
+    def _read_meta(self) -> Dict[str, float]:
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self):
+        """
+        Merge with the file on disk and replace it
+
+        Each process and thread writes its own temp file, so concurrent
+        fetchers never rename each other's; entries another process added
+        since we read the file are kept (newest revalidation wins).
+        """
+        self.meta_path.parent.mkdir(parents=True, exist_ok=True)
+        for key, validated_at in self._read_meta().items():
+            if validated_at > self.validated.get(key, 0.0):
+                self.validated[key] = validated_at
+        tmp = self.meta_path.with_name(f".{self.meta_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.validated, f)
+        os.replace(tmp, self.meta_path)
+
+    def resolve(self, symbol: str, timeframe: str) -> str:
+        """
+        Local path of a symbol/timeframe file, downloading only when needed
+
+        Raises:
+            FileNotFoundError: Offline (or mirror) and the file is not available locally
+        """
+        path_in_repo = kline_path_in_repo(symbol, timeframe)
+        cached = self.backend.cached_path(path_in_repo)
+
+        if cached is not None:
+            if self.offline or not self.backend.revalidates:
+                return cached
+            with self.lock:
+                validated_at = self.validated.get(path_in_repo, 0.0)
+            if time.time() - validated_at < self.metadata_ttl:
+                return cached
+
+        if self.offline:
+            raise FileNotFoundError(f"{path_in_repo} is not cached and fetcher is offline")
+
+        path = self.backend.download(path_in_repo)
+        with self.lock:
+            self.validated[path_in_repo] = time.time()
+            self._write_meta()
+        return path
+
+    def prefetch(self, symbols: List[str], timeframes: List[str], max_workers: int = 8) -> dict:
+        """
+        Make every symbol/timeframe file local, downloading missing ones concurrently
+
+        Args:
+            symbols: Trading pairs
+            timeframes: Timeframes per symbol
+            max_workers: Maximum parallel downloads
+
+        Returns:
+            Dict with 'paths' and 'errors', both keyed by (symbol, timeframe)
+        """
+        keys = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        paths: Dict[Tuple[str, str], str] = {}
+        errors: Dict[Tuple[str, str], str] = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keys) or 1))) as executor:
+            futures = {executor.submit(self.resolve, *key): key for key in keys}
+            for future, key in futures.items():
+                try:
+                    paths[key] = future.result()
+                except Exception as e:
+                    errors[key] = str(e)
+
+        return {'paths': paths, 'errors': errors}
+
+
+_fetchers: Dict[str, KlineFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_fetcher(cache_dir: str = './data_cache') -> KlineFetcher:
+    """
+    Process-wide fetcher for a cache directory, configured from the environment
+
+    KLINES_MIRROR_DIR: use a local mirror directory instead of the Hub
+    KLINES_OFFLINE=1: never touch the network
+    KLINES_METADATA_TTL: seconds before a cached file is revalidated (default 3600)
+    """
+    with _fetchers_lock:
+        if cache_dir not in _fetchers:
+            mirror = os.environ.get('KLINES_MIRROR_DIR')
+            backend = MirrorBackend(mirror) if mirror else HubBackend(cache_dir=cache_dir)
+            _fetchers[cache_dir] = KlineFetcher(
+                backend,
+                offline=os.environ.get('KLINES_OFFLINE', '0').lower() in ('1', 'true', 'yes'),
+                metadata_ttl=float(os.environ.get('KLINES_METADATA_TTL', 3600)),
+                meta_path=str(Path(cache_dir) / '.kline_fetch_meta.json')
+            )
+        return _fetchers[cache_dir]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Download kline files into the local cache ahead of a run")
+    parser.add_argument("symbols", type=str, help="Comma separated symbols")
+    parser.add_argument("--timeframes", type=str, default="15m,1h,1d")
+    parser.add_argument("--cache-dir", type=str, default="./data_cache")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    result = get_fetcher(args.cache_dir).prefetch(args.symbols.split(','), args.timeframes.split(','),
+                                                  max_workers=args.workers)
+    for (symbol, timeframe), path in sorted(result['paths'].items()):
+        print(f"{symbol} {timeframe}: {path}")
+    for (symbol, timeframe), error in sorted(result['errors'].items()):
+        print(f"{symbol} {timeframe}: FAILED {error}")
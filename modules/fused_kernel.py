@@ -0,0 +1,451 @@
+import math
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import CompositeIndicator, OUTPUT_COLUMNS
+from .jit import njit, NUMBA_AVAILABLE
+
+
+# Output row of each column in the (columns, rows) array the kernel fills
+(RSI, MACD, SIGNAL_LINE, HISTOGRAM, MOMENTUM, ROC, SMA_20, SMA_50, TREND,
+ ATR, BB_UPPER, BB_MID, BB_LOWER, VOLATILITY, VOLUME_SMA, VOLUME_RATIO, OBV, OBV_SMA,
+ MOMENTUM_SCORE, TREND_SCORE, VOLUME_SCORE, VOLATILITY_SCORE, SIGNAL, SIGNAL_STRENGTH) = range(len(OUTPUT_COLUMNS))
+
+# Scalar state slots
+(S_N, S_PREV_CLOSE, S_EMA_FAST, S_EMA_SLOW, S_EMA_SIGNAL, S_OBV,
+ S_MOMENTUM_PREV, S_TREND_PREV, S_VOLUME_PREV, S_VOLATILITY_PREV,
+ S_RSI_PREV, S_MACD_PREV, S_HISTOGRAM_PREV, S_HISTOGRAM_PREV2) = range(14)
+N_SCALARS = 14
+
+# Rolling mean accumulator: sum, add/remove compensation, nobs, negative count,
+# consecutive-same-value count, previous value, then the window ring buffer
+MEAN_HEADER = 7
+# Rolling variance accumulator: mean, ssqdm, nobs, add/remove compensation, unstable flag, ring
+VAR_HEADER = 6
+SHIFT_RING = 13
+
+INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+LOG_3 = float(np.log(3))
+
+
+def _ewm_alpha(span: int) -> float:
+    # Same arithmetic as pandas: span -> center of mass -> alpha
+    return 1.0 / (1.0 + (span - 1) / 2.0)
+
+
+ALPHA_FAST = _ewm_alpha(12)
+ALPHA_SLOW = _ewm_alpha(26)
+ALPHA_SIGNAL = _ewm_alpha(9)
+
+
+@njit(cache=True)
+def _layout(lookback):
+    """Offsets of every accumulator in the flat state vector, and its total size"""
+    o_gain = N_SCALARS
+    o_loss = o_gain + MEAN_HEADER + 14
+    o_tr = o_loss + MEAN_HEADER + 14
+    o_sma = o_tr + MEAN_HEADER + 14
+    o_sma50 = o_sma + MEAN_HEADER + lookback
+    o_bb_mean = o_sma50 + MEAN_HEADER + 50
+    o_bb_var = o_bb_mean + MEAN_HEADER + 20
+    o_vol = o_bb_var + VAR_HEADER + 20
+    o_obv = o_vol + MEAN_HEADER + lookback
+    o_hist_max = o_obv + MEAN_HEADER + lookback
+    o_close = o_hist_max + 20
+    size = o_close + SHIFT_RING
+    return o_gain, o_loss, o_tr, o_sma, o_sma50, o_bb_mean, o_bb_var, o_vol, o_obv, o_hist_max, o_close, size
+
+
+@njit(cache=True, inline='always')
+def _sign(x):
+    if x > 0:
+        return 1.0
+    if x < 0:
+        return -1.0
+    if x == 0:
+        return 0.0
+    return np.nan
+
+
+@njit(cache=True, inline='always')
+def _clip(x, lower, upper):
+    # NaN passes through, as in pandas clip
+    if x < lower:
+        return lower
+    if x > upper:
+        return upper
+    return x
+
+
+@njit(cache=True, inline='always')
+def _fill(x):
+    return 0.0 if x != x else x
+
+
+@njit(cache=True, inline='always')
+def _ewm(prev, value, n, alpha):
+    # pandas ewm(adjust=False).mean() update, including its constant-series shortcut
+    if n == 0:
+        return value
+    if prev != value:
+        old_wt = 1.0 - alpha
+        return (old_wt * prev + alpha * value) / (old_wt + alpha)
+    return prev
+
+
+@njit(cache=True, error_model='numpy')
+def _mean_push(state, o, w, n, value):
+    """Push one value into a rolling mean and return rolling(w).mean() (pandas roll_mean)"""
+    slot = o + MEAN_HEADER + n % w
+
+    if n == 0:
+        for k in range(MEAN_HEADER):
+            state[o + k] = 0.0
+        state[o + 6] = value
+    elif n >= w:
+        old = state[slot]
+        if old == old:
+            state[o + 3] -= 1
+            y = -old - state[o + 2]
+            t = state[o] + y
+            state[o + 2] = t - state[o] - y
+            state[o] = t
+            if math.copysign(1.0, old) < 0:
+                state[o + 4] -= 1
+    state[slot] = value
+
+    if value == value:
+        state[o + 3] += 1
+        y = value - state[o + 1]
+        t = state[o] + y
+        state[o + 1] = t - state[o] - y
+        state[o] = t
+        if math.copysign(1.0, value) < 0:
+            state[o + 4] += 1
+        if value == state[o + 6]:
+            state[o + 5] += 1
+        else:
+            state[o + 5] = 1
+        state[o + 6] = value
+
+    nobs = state[o + 3]
+    if nobs >= w and nobs > 0:
+        result = state[o] / nobs
+        if state[o + 5] >= nobs:
+            result = state[o + 6]
+        elif state[o + 4] == 0 and result < 0:
+            result = 0.0
+        elif state[o + 4] == nobs and result > 0:
+            result = 0.0
+        return result
+    return np.nan
+
+
+@njit(cache=True, error_model='numpy')
+def _var_add(state, o, value):
+    if value != value:
+        return
+    prev_m2 = state[o + 1]
+    state[o + 2] += 1
+    prev_mean = state[o] - state[o + 3]
+    y = value - state[o + 3]
+    t = y - state[o]
+    state[o + 3] = t + state[o] - y
+    state[o] = state[o] + t / state[o + 2]
+    state[o + 1] = state[o + 1] + (value - prev_mean) * (value - state[o])
+    if prev_m2 * INV_COND_TOL > state[o + 1]:
+        state[o + 5] = 1.0
+
+
+@njit(cache=True, error_model='numpy')
+def _var_remove(state, o, value):
+    if value != value:
+        return
+    prev_m2 = state[o + 1]
+    state[o + 2] -= 1
+    if state[o + 2] != 0:
+        prev_mean = state[o] - state[o + 4]
+        y = value - state[o + 4]
+        t = y - state[o]
+        state[o + 4] = t + state[o] - y
+        state[o] = state[o] - t / state[o + 2]
+        state[o + 1] = state[o + 1] - (value - prev_mean) * (value - state[o])
+        if prev_m2 * INV_COND_TOL > state[o + 1]:
+            state[o + 5] = 1.0
+    else:
+        state[o] = 0.0
+        state[o + 1] = 0.0
+        state[o + 5] = 0.0
+
+
+@njit(cache=True, error_model='numpy')
+def _var_push(state, o, w, n, value):
+    """Push one value into a rolling variance and return rolling(w).var() (pandas roll_var)"""
+    ring = o + VAR_HEADER
+    slot = ring + n % w
+
+    if n > 0:
+        if n >= w:
+            _var_remove(state, o, state[slot])
+        state[slot] = value
+        _var_add(state, o, value)
+
+    if n == 0 or state[o + 5] != 0:
+        # First window, or possible catastrophic cancellation: recompute from the ring
+        state[slot] = value
+        for k in range(VAR_HEADER):
+            state[o + k] = 0.0
+        for j in range(max(0, n - w + 1), n + 1):
+            _var_add(state, o, state[ring + j % w])
+        state[o + 5] = 0.0
+
+    nobs = state[o + 2]
+    if nobs >= w and nobs > 1:
+        return state[o + 1] / (nobs - 1)
+    return np.nan
+
+
+@njit(cache=True, error_model='numpy', nogil=True)
+def _composite_kernel(high, low, close, volume, lookback, state, out):
+    """
+    Every CompositeIndicator.calculate output column in one sequential pass
+
+    All rolling/ewm/shift history lives in state, so calling the kernel on
+    consecutive chunks with the same state gives exactly the full-run result.
+    """
+    (o_gain, o_loss, o_tr, o_sma, o_sma50, o_bb_mean, o_bb_var,
+     o_vol, o_obv, o_hist_max, o_close, size) = _layout(lookback)
+
+    for i in range(close.shape[0]):
+        n = int(state[S_N])
+        c = close[i]
+        v = volume[i]
+        prev_close = state[S_PREV_CLOSE] if n > 0 else np.nan
+
+        # 1. Momentum
+        delta = c - prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        avg_gain = _mean_push(state, o_gain, 14, n, gain)
+        avg_loss = _mean_push(state, o_loss, 14, n, loss)
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        state[S_EMA_FAST] = _ewm(state[S_EMA_FAST], c, n, ALPHA_FAST)
+        state[S_EMA_SLOW] = _ewm(state[S_EMA_SLOW], c, n, ALPHA_SLOW)
+        macd = state[S_EMA_FAST] - state[S_EMA_SLOW]
+        state[S_EMA_SIGNAL] = _ewm(state[S_EMA_SIGNAL], macd, n, ALPHA_SIGNAL)
+        histogram = macd - state[S_EMA_SIGNAL]
+
+        state[o_close + n % SHIFT_RING] = c
+        close_10 = state[o_close + (n - 10) % SHIFT_RING] if n >= 10 else np.nan
+        close_12 = state[o_close + (n - 12) % SHIFT_RING] if n >= 12 else np.nan
+        momentum = c - close_10
+        roc = ((c - close_12) / close_12) * 100
+
+        # 2. Trend
+        sma_20 = _mean_push(state, o_sma, lookback, n, c)
+        sma_50 = _mean_push(state, o_sma50, 50, n, c)
+        trend = (sma_20 - sma_50) / sma_50
+
+        # 3. Volatility
+        tr = high[i] - low[i]
+        if n > 0:
+            tr = max(tr, abs(high[i] - prev_close), abs(low[i] - prev_close))
+        atr = _mean_push(state, o_tr, 14, n, tr)
+        bb_mid = _mean_push(state, o_bb_mean, 20, n, c)
+        variance = _var_push(state, o_bb_var, 20, n, c)
+        std = math.sqrt(variance) if variance >= 0 else (np.nan if variance != variance else 0.0)
+        bb_upper = bb_mid + std * 2
+        bb_lower = bb_mid - std * 2
+        volatility = (bb_upper - bb_lower) / bb_mid
+
+        # 4. Volume
+        volume_sma = _mean_push(state, o_vol, lookback, n, v)
+        volume_ratio = v / volume_sma
+        if n == 0:
+            obv = v
+        elif c > prev_close:
+            obv = state[S_OBV] + v
+        elif c < prev_close:
+            obv = state[S_OBV] - v
+        else:
+            obv = state[S_OBV]
+        state[S_OBV] = obv
+        obv_sma = _mean_push(state, o_obv, lookback, n, obv)
+
+        # 5. Component scores
+        state[o_hist_max + n % 20] = abs(histogram)
+        hist_max = np.nan
+        if n >= 19:
+            hist_max = state[o_hist_max]
+            for k in range(1, 20):
+                hist_max = max(hist_max, state[o_hist_max + k])
+        macd_signal = _sign(histogram) * (abs(histogram) / (hist_max + 1e-6))
+        momentum_score = (0.35 * ((rsi - 50) / 50) + 0.35 * macd_signal
+                          + 0.20 * _sign(momentum) + 0.10 * _sign(roc))
+        momentum_score = _clip(_fill(momentum_score), -1.0, 1.0)
+
+        close_to_mid = (c - sma_20) / (sma_20 + 1e-6)
+        close_to_lower = (c - bb_lower) / (bb_mid + 1e-6)
+        trend_score = (0.40 * _clip(close_to_mid, -1.0, 1.0) + 0.30 * _clip(close_to_lower, -1.0, 1.0)
+                       + 0.30 * _sign(sma_20 - sma_50))
+        trend_score = _clip(_fill(trend_score), -1.0, 1.0)
+
+        volume_surge = np.log(volume_ratio + 1) / LOG_3
+        volume_score = 0.60 * _clip(volume_surge, -1.0, 1.0) + 0.40 * _sign(obv - obv_sma)
+        volume_score = _clip(_fill(volume_score), -1.0, 1.0)
+
+        atr_ratio = _clip(atr / c, 0.0, 0.1)
+        volatility_score = _clip(_fill((atr_ratio + volatility / 0.1) / 2), -1.0, 1.0)
+
+        # 6. Signal from the previous candle
+        if n > 0:
+            momentum_prev = state[S_MOMENTUM_PREV]
+            trend_prev = state[S_TREND_PREV]
+            volume_prev = state[S_VOLUME_PREV]
+            volatility_prev = state[S_VOLATILITY_PREV]
+            rsi_prev = state[S_RSI_PREV]
+            macd_prev = state[S_MACD_PREV]
+            histogram_prev = state[S_HISTOGRAM_PREV]
+        else:
+            momentum_prev = trend_prev = volume_prev = volatility_prev = np.nan
+            rsi_prev = macd_prev = histogram_prev = np.nan
+        histogram_prev2 = state[S_HISTOGRAM_PREV2] if n > 1 else np.nan
+
+        composite = (0.35 * momentum_prev + 0.35 * trend_prev
+                     + 0.20 * volume_prev + 0.10 * volatility_prev)
+        buy = (((composite > 0.2) and (momentum_prev > 0.1) and (trend_prev > -0.5)) or
+               ((rsi_prev < 35) and (rsi_prev > 20)) or
+               ((macd_prev > 0) and (histogram_prev > 0) and (histogram_prev2 <= 0)))
+        sell = (((composite < -0.2) and (momentum_prev < -0.1) and (trend_prev < 0.5)) or
+                ((rsi_prev > 65) and (rsi_prev < 80)) or
+                ((macd_prev < 0) and (histogram_prev < 0) and (histogram_prev2 >= 0)))
+        signal = -1.0 if sell else (1.0 if buy else 0.0)
+
+        agreement = (abs(momentum_prev) + abs(trend_prev)) / 2
+        rsi_extreme = 0.8 if ((rsi_prev < 35) or (rsi_prev > 65)) else 0.5
+        volume_boost = (volume_prev + 1) / 2
+        strength = _clip(_fill(agreement * volume_boost * (rsi_extreme / 0.65)), 0.0, 1.0)
+
+        out[RSI, i] = rsi
+        out[MACD, i] = macd
+        out[SIGNAL_LINE, i] = state[S_EMA_SIGNAL]
+        out[HISTOGRAM, i] = histogram
+        out[MOMENTUM, i] = momentum
+        out[ROC, i] = roc
+        out[SMA_20, i] = sma_20
+        out[SMA_50, i] = sma_50
+        out[TREND, i] = trend
+        out[ATR, i] = atr
+        out[BB_UPPER, i] = bb_upper
+        out[BB_MID, i] = bb_mid
+        out[BB_LOWER, i] = bb_lower
+        out[VOLATILITY, i] = volatility
+        out[VOLUME_SMA, i] = volume_sma
+        out[VOLUME_RATIO, i] = volume_ratio
+        out[OBV, i] = obv
+        out[OBV_SMA, i] = obv_sma
+        out[MOMENTUM_SCORE, i] = momentum_score
+        out[TREND_SCORE, i] = trend_score
+        out[VOLUME_SCORE, i] = volume_score
+        out[VOLATILITY_SCORE, i] = volatility_score
+        out[SIGNAL, i] = signal
+        out[SIGNAL_STRENGTH, i] = strength
+
+        state[S_HISTOGRAM_PREV2] = state[S_HISTOGRAM_PREV]
+        state[S_MOMENTUM_PREV] = momentum_score
+        state[S_TREND_PREV] = trend_score
+        state[S_VOLUME_PREV] = volume_score
+        state[S_VOLATILITY_PREV] = volatility_score
+        state[S_RSI_PREV] = rsi
+        state[S_MACD_PREV] = macd
+        state[S_HISTOGRAM_PREV] = histogram
+        state[S_PREV_CLOSE] = c
+        state[S_N] = n + 1
+
+
+def new_state(lookback: int = 20) -> np.ndarray:
+    """Empty kernel state for one series (a flat float64 vector)"""
+    return np.zeros(_layout(lookback)[-1], dtype=np.float64)
+
+
+def compute_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                   lookback: int = 20, state: Optional[np.ndarray] = None,
+                   out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run the fused kernel over a block of candles
+
+    Args:
+        high, low, close, volume: float64 arrays (NaN-free)
+        lookback: Lookback period for SMA
+        state: State from a previous call to continue a series (updated in place)
+        out: Preallocated (len(OUTPUT_COLUMNS), rows) float64 output
+
+    Returns:
+        (out, state): out rows follow OUTPUT_COLUMNS
+    """
+    state = new_state(lookback) if state is None else state
+    if out is None:
+        out = np.empty((len(OUTPUT_COLUMNS), len(close)), dtype=np.float64)
+    _composite_kernel(
+        np.ascontiguousarray(high, dtype=np.float64), np.ascontiguousarray(low, dtype=np.float64),
+        np.ascontiguousarray(close, dtype=np.float64), np.ascontiguousarray(volume, dtype=np.float64),
+        lookback, state, out
+    )
+    return out, state
+
+
+def calculate_fused(df: pd.DataFrame, lookback: int = 20) -> pd.DataFrame:
+    """
+    CompositeIndicator.calculate computed by the fused kernel
+
+    Falls back to the pandas implementation when Numba is not installed.
+    """
+    if not NUMBA_AVAILABLE:
+        return CompositeIndicator(lookback=lookback).calculate(df)
+
+    out, _ = compute_arrays(df['high'].to_numpy(), df['low'].to_numpy(),
+                            df['close'].to_numpy(), df['volume'].to_numpy(), lookback)
+    result = df.copy()
+    for k, name in enumerate(OUTPUT_COLUMNS):
+        result[name] = out[k].astype(np.int64) if name == 'signal' else out[k]
+    return result
+
+
+def benchmark(sizes=(100_000, 1_000_000, 10_000_000), pandas_limit: int = 1_000_000, seed: int = 0) -> pd.DataFrame:
+    """
+    Time the fused kernel against CompositeIndicator.calculate on synthetic klines
+
+    The pandas path is skipped above pandas_limit rows (its OBV loop is pure Python).
+    """
+    rng = np.random.default_rng(seed)
+    compute_arrays(*np.ones((4, 64)))  # compile outside the timings
+
+    rows = []
+    for n in sizes:
+        n = int(n)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+        df = pd.DataFrame({'high': close * 1.001, 'low': close * 0.999, 'close': close,
+                           'volume': rng.lognormal(3, 1, n)})
+
+        start = time.perf_counter()
+        compute_arrays(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy())
+        fused = time.perf_counter() - start
+
+        pandas_time = np.nan
+        if n <= pandas_limit:
+            start = time.perf_counter()
+            CompositeIndicator().calculate(df)
+            pandas_time = time.perf_counter() - start
+
+        rows.append({'rows': n, 'fused_s': fused, 'pandas_s': pandas_time, 'speedup': pandas_time / fused})
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(f"Numba available: {NUMBA_AVAILABLE}")
+    print(benchmark().to_string(index=False))
@@ -1,6 +1,17 @@
+import importlib.util
 import pandas as pd
 import numpy as np
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional
+
+
+OUTPUT_COLUMNS = [
+    'rsi', 'macd', 'signal_line', 'histogram', 'momentum', 'roc',
+    'sma_20', 'sma_50', 'trend',
+    'atr', 'bollinger_upper', 'bollinger_mid', 'bollinger_lower', 'volatility',
+    'volume_sma', 'volume_ratio', 'obv', 'obv_sma',
+    'momentum_score', 'trend_score', 'volume_score', 'volatility_score',
+    'signal', 'signal_strength',
+]
 
 
 class TechnicalIndicators:
@@ -80,10 +91,14 @@ class TechnicalIndicators:
 class CompositeIndicator:
     """Advanced composite indicator combining volume, momentum, trend and volatility"""
     
+    BACKENDS = ('pandas', 'polars', 'numba')
+    
     def __init__(self, lookback: int = 20, 
                  volume_threshold: float = 1.2,
                  momentum_threshold: float = 0.5,
-                 trend_strength: float = 0.6):
+                 trend_strength: float = 0.6,
+                 backend: str = 'pandas',
+                 rules: Optional[dict] = None):
         """
         Initialize composite indicator
         
@@ -92,12 +107,32 @@ class CompositeIndicator:
             volume_threshold: Volume ratio threshold (current/average)
             momentum_threshold: Momentum threshold percentage
             trend_strength: Trend strength requirement (0-1)
+            backend: 'pandas', 'polars' (lazy, multi-core, per-symbol windows) or
+                     'numba' (fused single-pass kernel; pandas when Numba is missing)
+            rules: One declarative buy/sell rule set replacing the built-in signal
+                   logic (see modules.signal_rules; DEFAULT_RULES is the built-in
+                   logic). Several named sets go to screen_rules instead.
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}, expected one of {self.BACKENDS}")
+        if backend == 'polars' and importlib.util.find_spec('polars') is None:
+            raise ImportError("backend='polars' requires the polars package")
+        if backend == 'polars' and rules is not None:
+            raise ValueError("rules are evaluated per series; use the pandas or numba backend")
+        
+        self.backend = backend
         self.lookback = lookback
         self.volume_threshold = volume_threshold
         self.momentum_threshold = momentum_threshold
         self.trend_strength = trend_strength
         self.indicators = TechnicalIndicators()
+        self.compiled_rules = None
+        if rules is not None:
+            from .signal_rules import compile_rules
+            self.compiled_rules = compile_rules(rules)
+            if len(self.compiled_rules.outputs) != 1:
+                raise ValueError(f"rules must be one rule set, got {len(self.compiled_rules.outputs)} "
+                                 f"({', '.join(self.compiled_rules.outputs)}); use screen_rules to compare several")
     
     def calculate(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -109,28 +144,56 @@ class CompositeIndicator:
         Returns:
             DataFrame with signal columns
         """
+        if self.backend == 'polars':
+            from .polars_backend import calculate_polars
+            return calculate_polars(df, lookback=self.lookback)
+        if self.backend == 'numba':
+            from .fused_kernel import calculate_fused
+            result = calculate_fused(df, lookback=self.lookback)
+            if self.compiled_rules is not None:
+                result['signal'] = self._generate_signal(result)
+            return result
+        
         result = df.copy()
         
+        for name, values in self.calculate_columns(df).items():
+            result[name] = values
+        
+        return result
+    
+    def calculate_columns(self, data) -> Dict[str, pd.Series]:
+        """
+        Calculate indicator, score and signal columns without copying the input
+        
+        Args:
+            data: DataFrame or mapping of Series with [high, low, close, volume]
+        
+        Returns:
+            Dict of output column name -> Series, in calculate() column order
+        """
+        inputs = ('high', 'low', 'close', 'volume')
+        result = {name: data[name] for name in inputs}
+        
         # 1. Momentum Analysis
-        result['rsi'] = self.indicators.rsi(df['close'], period=14)
-        result['macd'], result['signal_line'], result['histogram'] = self.indicators.macd(df['close'])
-        result['momentum'] = self.indicators.momentum(df['close'], period=10)
-        result['roc'] = self.indicators.roc(df['close'], period=12)
+        result['rsi'] = self.indicators.rsi(result['close'], period=14)
+        result['macd'], result['signal_line'], result['histogram'] = self.indicators.macd(result['close'])
+        result['momentum'] = self.indicators.momentum(result['close'], period=10)
+        result['roc'] = self.indicators.roc(result['close'], period=12)
         
         # 2. Trend Analysis
-        result['sma_20'] = df['close'].rolling(window=self.lookback).mean()
-        result['sma_50'] = df['close'].rolling(window=50).mean()
+        result['sma_20'] = result['close'].rolling(window=self.lookback).mean()
+        result['sma_50'] = result['close'].rolling(window=50).mean()
         result['trend'] = (result['sma_20'] - result['sma_50']) / result['sma_50']
         
         # 3. Volatility Analysis
-        result['atr'] = self.indicators.atr(df['high'], df['low'], df['close'], period=14)
-        result['bollinger_upper'], result['bollinger_mid'], result['bollinger_lower'] = self.indicators.bollinger_bands(df['close'])
+        result['atr'] = self.indicators.atr(result['high'], result['low'], result['close'], period=14)
+        result['bollinger_upper'], result['bollinger_mid'], result['bollinger_lower'] = self.indicators.bollinger_bands(result['close'])
         result['volatility'] = (result['bollinger_upper'] - result['bollinger_lower']) / result['bollinger_mid']
         
         # 4. Volume Analysis
-        result['volume_sma'] = self.indicators.volume_sma(df['volume'], period=self.lookback)
-        result['volume_ratio'] = df['volume'] / result['volume_sma']
-        result['obv'] = self.indicators.obv(df['close'], df['volume'])
+        result['volume_sma'] = self.indicators.volume_sma(result['volume'], period=self.lookback)
+        result['volume_ratio'] = result['volume'] / result['volume_sma']
+        result['obv'] = self.indicators.obv(result['close'], result['volume'])
         result['obv_sma'] = result['obv'].rolling(window=self.lookback).mean()
         
         # 5. Composite Signal Components
@@ -140,9 +203,9 @@ class CompositeIndicator:
         result['signal'] = self._generate_signal(result)
         result['signal_strength'] = self._calculate_signal_strength(result)
         
-        return result
+        return {name: values for name, values in result.items() if name not in inputs}
     
-    def _compute_signal_components(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _compute_signal_components(self, df: Dict[str, pd.Series]) -> Dict[str, pd.Series]:
         """Compute individual signal components"""
         
         # Momentum Component (RSI + MACD)
@@ -202,7 +265,9 @@ class CompositeIndicator:
         Generate trading signal: 1 (BUY), -1 (SELL), 0 (HOLD)
         Improved logic with better entry/exit conditions
         """
-        signal = pd.Series(0, index=df.index)
+        if self.compiled_rules is not None:
+            (values,) = self.compiled_rules.evaluate(df).values()
+            return pd.Series(values, index=df['close'].index)
         
         momentum_prev = df['momentum_score'].shift(1)
         trend_prev = df['trend_score'].shift(1)
@@ -217,6 +282,8 @@ class CompositeIndicator:
                     0.20 * volume_prev + 
                     0.10 * volatility_prev)
         
+        signal = pd.Series(0, index=composite.index)
+        
         buy_condition = (
             ((composite > 0.2) & (momentum_prev > 0.1) & (trend_prev > -0.5)) |
             ((rsi_prev < 35) & (rsi_prev > 20)) |
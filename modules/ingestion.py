@@ -0,0 +1,465 @@
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+}
+
+KLINE_FIELDS = ['open_time', 'open', 'high', 'low', 'close', 'volume']
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Candle interval of a timeframe string ('15m', '1h', '1d') in milliseconds"""
+    try:
+        return TIMEFRAME_MS[timeframe]
+    except KeyError:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def empty_klines() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=np.int64 if name == 'open_time' else np.float64) for name in KLINE_FIELDS}
+
+
+def find_gaps(open_time: np.ndarray, interval_ms: int) -> np.ndarray:
+    """
+    Find missing candles in a sorted open_time series
+
+    Args:
+        open_time: Sorted int64 epoch milliseconds
+        interval_ms: Candle interval
+
+    Returns:
+        (k, 2) int64 array of [first_missing, last_missing] open_time ranges
+    """
+    open_time = np.asarray(open_time, dtype=np.int64)
+    if len(open_time) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    step = np.diff(open_time)
+    idx = np.flatnonzero(step > interval_ms)
+    return np.column_stack([open_time[idx] + interval_ms, open_time[idx + 1] - interval_ms])
+
+
+class HttpConnectionPool:
+    """Thread-safe pool of keep-alive HTTP connections to one host"""
+
+    def __init__(self, base_url: str, maxsize: int = 16, timeout: float = 10.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.pool = queue.LifoQueue(maxsize=maxsize)
+        self.semaphore = threading.BoundedSemaphore(maxsize)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def get_json(self, path: str, params: Optional[dict] = None):
+        """GET a JSON document, reusing an idle connection when one is available"""
+        url = self.prefix + path
+        if params:
+            url += '?' + urlencode(params)
+
+        with self.semaphore:
+            try:
+                conn = self.pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+
+            # A pooled connection may have been closed by the server; retry once on a fresh one
+            for attempt in range(2):
+                try:
+                    conn.request('GET', url, headers={'Connection': 'keep-alive'})
+                    response = conn.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError, OSError):
+                    conn.close()
+                    if attempt:
+                        raise
+                    conn = self._connect()
+
+            if response.status != 200:
+                conn.close()
+                raise RuntimeError(f"GET {url} failed with HTTP {response.status}: {body[:200]!r}")
+
+            self.pool.put_nowait(conn)
+
+        return json.loads(body)
+
+    def close(self):
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class HttpKlineSource:
+    """
+    Candle source speaking the Binance /api/v3/klines protocol
+
+    Rows are [open_time, open, high, low, close, volume, ...] with prices as
+    strings; at most page_limit rows come back per request.
+    """
+
+    def __init__(self, base_url: str = 'https://api.binance.com', path: str = '/api/v3/klines',
+                 page_limit: int = 1000, pool_size: int = 16):
+        self.client = HttpConnectionPool(base_url, maxsize=pool_size)
+        self.path = path
+        self.page_limit = page_limit
+
+    def fetch_page(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> Dict[str, np.ndarray]:
+        """Fetch up to page_limit candles with start_ms <= open_time <= end_ms"""
+        rows = self.client.get_json(self.path, {
+            'symbol': symbol,
+            'interval': timeframe,
+            'startTime': int(start_ms),
+            'endTime': int(end_ms),
+            'limit': self.page_limit,
+        })
+        if not rows:
+            return empty_klines()
+
+        values = np.array([row[:6] for row in rows], dtype=object).astype(np.float64)
+        arrays = {name: values[:, i] for i, name in enumerate(KLINE_FIELDS)}
+        arrays['open_time'] = values[:, 0].astype(np.int64)
+        return arrays
+
+    def fetch_range(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> Dict[str, np.ndarray]:
+        """Fetch every candle in [start_ms, end_ms] in bulk pages"""
+        interval = timeframe_to_ms(timeframe)
+        pages = []
+        while start_ms <= end_ms:
+            page = self.fetch_page(symbol, timeframe, start_ms, end_ms)
+            if len(page['open_time']) == 0:
+                break
+            pages.append(page)
+            start_ms = int(page['open_time'][-1]) + interval
+            if len(page['open_time']) < self.page_limit:
+                break
+
+        if not pages:
+            return empty_klines()
+        return {name: np.concatenate([page[name] for page in pages]) for name in KLINE_FIELDS}
+
+
+class KlineStore:
+    """
+    Append-only local kline cache, one directory of Parquet parts per series
+
+    Appends are buffered in memory and written as one part file per series on
+    flush(), so a poll cycle costs one write per series instead of one per row.
+    Parts are compacted into a single file once a series has max_parts of them.
+    A series whose part cannot be written keeps its buffer for the next
+    flush(); the error is listed in flush_errors.
+    """
+
+    def __init__(self, root: str = './data_cache/live', max_parts: int = 64):
+        self.root = Path(root)
+        self.max_parts = max_parts
+        self.buffers: Dict[Tuple[str, str], List[Dict[str, np.ndarray]]] = {}
+        # Newest open_time on disk, and newest still only in a buffer
+        self.last_times: Dict[Tuple[str, str], Optional[int]] = {}
+        self.buffered_last: Dict[Tuple[str, str], int] = {}
+        self.flush_errors: Dict[Tuple[str, str], str] = {}
+        self.lock = threading.Lock()
+
+    def series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol / timeframe
+
+    def _parts(self, symbol: str, timeframe: str) -> List[Path]:
+        return sorted(self.series_dir(symbol, timeframe).glob('part-*.parquet'))
+
+    def read_open_times(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Sorted, de-duplicated open_time (ms) of everything written so far"""
+        parts = self._parts(symbol, timeframe)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        times = [pq.read_table(part, columns=['open_time']).column(0).cast(pa.int64()).to_numpy() for part in parts]
+        return np.unique(np.concatenate(times))
+
+    def _cached_last(self, key: Tuple[str, str]) -> Optional[int]:
+        if key not in self.last_times:
+            times = self.read_open_times(*key)
+            self.last_times[key] = int(times[-1]) if len(times) else None
+        return self.last_times[key]
+
+    def last_open_time(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Newest open_time written or buffered, without rereading the parts"""
+        key = (symbol, timeframe)
+        with self.lock:
+            written = self._cached_last(key)
+            buffered = self.buffered_last.get(key)
+        if written is None or buffered is None:
+            return buffered if written is None else written
+        return max(written, buffered)
+
+    def append(self, symbol: str, timeframe: str, arrays: Dict[str, np.ndarray]):
+        """Buffer candles for a series; nothing touches disk until flush()"""
+        if len(arrays['open_time']) == 0:
+            return
+        key = (symbol, timeframe)
+        last = int(arrays['open_time'].max())
+        with self.lock:
+            self.buffers.setdefault(key, []).append(arrays)
+            if last > self.buffered_last.get(key, last - 1):
+                self.buffered_last[key] = last
+
+    def _write_part(self, symbol: str, timeframe: str, chunks: List[Dict[str, np.ndarray]]) -> int:
+        arrays = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in KLINE_FIELDS}
+        order = np.argsort(arrays['open_time'], kind='stable')
+        table = pa.table({
+            name: pa.array(arrays[name][order], type=pa.timestamp('ms') if name == 'open_time' else pa.float64())
+            for name in KLINE_FIELDS
+        })
+
+        directory = self.series_dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        parts = self._parts(symbol, timeframe)
+        seq = int(parts[-1].stem.split('-')[1]) + 1 if parts else 1
+        tmp = directory / f".part-{seq:06d}.tmp"
+        try:
+            pq.write_table(table, tmp)
+            tmp.rename(directory / f"part-{seq:06d}.parquet")
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return table.num_rows
+
+    def flush(self) -> int:
+        """
+        Write all buffered candles, one part file per series
+
+        A series that fails to write gets its candles back in the buffer (and
+        its on-disk cursor stays put) so the next flush retries them; the
+        reason is in flush_errors until then.
+
+        Returns:
+            Rows written
+        """
+        with self.lock:
+            buffers, self.buffers = self.buffers, {}
+            self.flush_errors = {}
+
+        written = 0
+        for key, chunks in buffers.items():
+            try:
+                written += self._write_part(*key, chunks)
+            except Exception as e:
+                with self.lock:
+                    self.buffers[key] = chunks + self.buffers.get(key, [])
+                    self.flush_errors[key] = f"{type(e).__name__}: {e}"
+                continue
+
+            last = max(int(chunk['open_time'].max()) for chunk in chunks)
+            with self.lock:
+                current = self._cached_last(key)
+                if current is None or last > current:
+                    self.last_times[key] = last
+                if key not in self.buffers:
+                    self.buffered_last.pop(key, None)
+
+            if len(self._parts(*key)) >= self.max_parts:
+                try:
+                    self.compact(*key)
+                except Exception as e:
+                    # The new part is on disk; compaction is retried on the next flush
+                    with self.lock:
+                        self.flush_errors[key] = f"compaction: {type(e).__name__}: {e}"
+
+        return written
+
+    def read(self, symbol: str, timeframe: str, after: Optional[int] = None) -> pd.DataFrame:
+        """
+        Load a series in the same layout load_klines returns
+
+        Args:
+            after: Only candles with open_time (epoch ms) after this; row groups
+                   entirely older are skipped from their statistics
+        """
+        parts = self._parts(symbol, timeframe)
+        if not parts:
+            return pd.DataFrame(columns=KLINE_FIELDS)
+        filters = None if after is None else [('open_time', '>', pd.Timestamp(after, unit='ms'))]
+        df = pa.concat_tables([pq.read_table(part, filters=filters) for part in parts]).to_pandas()
+        df = df.drop_duplicates(subset='open_time', keep='last')
+        return df.sort_values('open_time').reset_index(drop=True)
+
+    def compact(self, symbol: str, timeframe: str):
+        """Merge all parts of a series into one sorted, de-duplicated part"""
+        parts = self._parts(symbol, timeframe)
+        if len(parts) < 2:
+            return
+        df = self.read(symbol, timeframe)
+        directory = self.series_dir(symbol, timeframe)
+        seq = int(parts[-1].stem.split('-')[1]) + 1
+        tmp = directory / f".part-{seq:06d}.tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp)
+        tmp.rename(directory / f"part-{seq:06d}.parquet")
+        for part in parts:
+            part.unlink()
+
+
+class IngestionDaemon:
+    """Keep many symbol/timeframe series current from one process"""
+
+    def __init__(self, source: HttpKlineSource, store: KlineStore,
+                 symbols: List[str], timeframes: List[str],
+                 initial_candles: int = 1000, max_workers: int = 16):
+        """
+        Initialize ingestion daemon
+
+        Args:
+            source: Candle source (HttpKlineSource or anything with fetch_range)
+            store: Local KlineStore to append to
+            symbols: Trading pairs to keep current
+            timeframes: Timeframes per symbol
+            initial_candles: History to pull for a series that has no local data
+            max_workers: Concurrent series syncs (also bounded by the source's pool)
+        """
+        self.source = source
+        self.store = store
+        self.series = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        self.initial_candles = initial_candles
+        self.max_workers = max_workers
+        self.scanned = set()
+        # Gaps the source had no data for (exchange outages); not requested again
+        self.known_holes = set()
+
+    def _backfill(self, symbol: str, timeframe: str, gaps: np.ndarray) -> int:
+        filled = 0
+        for first, last in gaps.tolist():
+            if (symbol, timeframe, first, last) in self.known_holes:
+                continue
+            arrays = self.source.fetch_range(symbol, timeframe, first, last)
+            if len(arrays['open_time']) == 0:
+                self.known_holes.add((symbol, timeframe, first, last))
+                continue
+            self.store.append(symbol, timeframe, arrays)
+            filled += len(arrays['open_time'])
+        return filled
+
+    def sync_series(self, symbol: str, timeframe: str, now_ms: int) -> Tuple[int, int]:
+        """
+        Bring one series up to the last closed candle
+
+        Returns:
+            (new candles, backfilled candles)
+        """
+        interval = timeframe_to_ms(timeframe)
+        last_closed = (now_ms // interval - 1) * interval
+        backfilled = 0
+
+        if (symbol, timeframe) not in self.scanned:
+            # Full-history scan once per process, later cycles only check the seam
+            gaps = find_gaps(self.store.read_open_times(symbol, timeframe), interval)
+            backfilled += self._backfill(symbol, timeframe, gaps)
+            self.scanned.add((symbol, timeframe))
+
+        last = self.store.last_open_time(symbol, timeframe)
+        start = last + interval if last is not None else last_closed - (self.initial_candles - 1) * interval
+        if start > last_closed:
+            return 0, backfilled
+
+        arrays = self.source.fetch_range(symbol, timeframe, start, last_closed)
+        times = arrays['open_time']
+        if len(times):
+            seam = times if last is None else np.concatenate([[last], times])
+            gaps = find_gaps(seam, interval)
+            self.store.append(symbol, timeframe, arrays)
+            backfilled += self._backfill(symbol, timeframe, gaps)
+
+        return len(times), backfilled
+
+    def sync_once(self, now_ms: Optional[int] = None) -> dict:
+        """Sync every series concurrently, then write all buffered candles in bulk"""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        start = time.perf_counter()
+        errors = {}
+        new = backfilled = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.sync_series, symbol, timeframe, now_ms): (symbol, timeframe)
+                for symbol, timeframe in self.series
+            }
+            for future, key in futures.items():
+                try:
+                    n_new, n_back = future.result()
+                    new += n_new
+                    backfilled += n_back
+                except Exception as e:
+                    errors[key] = str(e)
+
+        written = self.store.flush()
+        errors.update(self.store.flush_errors)
+        return {
+            'series': len(self.series),
+            'new_candles': new,
+            'backfilled': backfilled,
+            'written': written,
+            'errors': errors,
+            'elapsed': time.perf_counter() - start,
+        }
+
+    def run(self, poll_interval: float = 10.0, stop_event: Optional[threading.Event] = None):
+        """Poll until stop_event is set, printing a line per cycle"""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            stats = self.sync_once()
+            print(f"[ingest] {stats['series']} series, {stats['new_candles']} new, "
+                  f"{stats['backfilled']} backfilled, {len(stats['errors'])} errors "
+                  f"in {stats['elapsed']:.2f}s")
+            stop_event.wait(poll_interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Keep a local kline cache current")
+    parser.add_argument("--symbols", type=str, default="BTCUSDT,ETHUSDT")
+    parser.add_argument("--timeframes", type=str, default="15m,1h,1d")
+    parser.add_argument("--base-url", type=str, default="https://api.binance.com")
+    parser.add_argument("--store", type=str, default="./data_cache/live")
+    parser.add_argument("--poll-interval", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    daemon = IngestionDaemon(
+        HttpKlineSource(args.base_url, pool_size=args.workers),
+        KlineStore(args.store),
+        args.symbols.split(','),
+        args.timeframes.split(','),
+        max_workers=args.workers
+    )
+    try:
+        daemon.run(args.poll_interval)
+    except KeyboardInterrupt:
+        daemon.store.flush()
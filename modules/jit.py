@@ -0,0 +1,20 @@
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """
+    numba.njit when Numba is installed, otherwise return the function unchanged
+
+    Kernels decorated with this still run (slowly) as plain Python, so callers
+    that need exact semantics rather than speed keep working without Numba.
+    """
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -0,0 +1,356 @@
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Sequence, Tuple
+
+
+# Latency buckets in seconds, 50us to 10s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _CounterChild:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self.lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum', 'lock')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # per bucket, last is +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        k = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[k] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time of a with-block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: Dict[Tuple[str, ...], object] = {}
+        self.lock = threading.Lock()
+        if not self.labelnames:
+            self.children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """
+        Child series for one set of label values
+
+        Look the child up once and keep it on hot paths; recording on a child
+        is one uncontended lock and an addition.
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels()")
+        return self.children[()]
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class Counter(_Metric):
+    """Monotonically increasing total (events, rows, bytes)"""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def value(self, *labels) -> float:
+        return self.labels(*labels).value
+
+    def _samples(self):
+        for key, child in list(self.children.items()):
+            yield self.name, _format_labels(self.labelnames, key), child.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (queue depth, symbols tracked, last run time)"""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+    def value(self, *labels) -> float:
+        return self.labels(*labels).value
+
+    def _samples(self):
+        for key, child in list(self.children.items()):
+            yield self.name, _format_labels(self.labelnames, key), child.value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution of observations (latencies in seconds)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        if 'le' in labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def time(self):
+        return self._unlabelled().time()
+
+    def _samples(self):
+        for key, child in list(self.children.items()):
+            with child.lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, le), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    In-process collection of metrics, rendered in the Prometheus text format
+
+    counter() / gauge() / histogram() return the existing metric of that name,
+    so modules can declare what they record at import time.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.kind} {metric.labelnames}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return ''.join(metric.render() for metric in metrics)
+
+    def write_textfile(self, path: str):
+        """
+        Write render() for node_exporter's textfile collector
+
+        The file is written next to path and renamed over it, so the collector
+        never reads a partial file.
+        """
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int = 9108, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serve /metrics from a daemon thread
+
+        Returns:
+            The running server (server_address has the bound port; call
+            shutdown() to stop it)
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+# Signal pipeline metrics
+CANDLES_PROCESSED = REGISTRY.counter(
+    'pipeline_candles_processed_total', 'Candles run through the composite indicator', ['timeframe'])
+INDICATOR_SECONDS = REGISTRY.histogram(
+    'pipeline_indicator_compute_seconds', 'Indicator computation time per symbol call', ['symbol', 'timeframe'])
+SIGNALS_EMITTED = REGISTRY.counter(
+    'pipeline_signals_emitted_total', 'Non-zero signals produced, by direction', ['direction'])
+SCORING_SECONDS = REGISTRY.histogram(
+    'pipeline_model_scoring_seconds', 'Classifier scoring latency per call')
+SCORED_SIGNALS = REGISTRY.counter(
+    'pipeline_model_scored_signals_total', 'Signals scored by the classifier')
+DATA_LOAD_BYTES = REGISTRY.counter(
+    'pipeline_data_load_bytes_total', 'Bytes of kline files read', ['timeframe'])
+DATA_LOAD_SECONDS = REGISTRY.histogram(
+    'pipeline_data_load_seconds', 'Kline load time per file', ['timeframe'])
+
+
+def record_signals(signal):
+    """Count the buy and sell signals of a calculate() signal column (array)"""
+    buy = int((signal == 1).sum())
+    sell = int((signal == -1).sum())
+    if buy:
+        SIGNALS_EMITTED.labels('buy').inc(buy)
+    if sell:
+        SIGNALS_EMITTED.labels('sell').inc(sell)
+
+
+def benchmark(n: int = 200_000) -> dict:
+    """Recording overhead per call in microseconds"""
+    registry = MetricsRegistry()
+    counter = registry.counter('bench_total', 'bench', ['symbol']).labels('BTCUSDT')
+    histogram = registry.histogram('bench_seconds', 'bench', ['symbol']).labels('BTCUSDT')
+
+    start = time.perf_counter()
+    for _ in range(n):
+        counter.inc()
+    inc = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    for _ in range(n):
+        histogram.observe(0.0012)
+    observe = (time.perf_counter() - start) / n
+
+    start = time.perf_counter()
+    for _ in range(n):
+        with histogram.time():
+            pass
+    timed = (time.perf_counter() - start) / n
+
+    return {'inc_us': inc * 1e6, 'observe_us': observe * 1e6, 'time_block_us': timed * 1e6}
+
+
+if __name__ == "__main__":
+    print(benchmark())
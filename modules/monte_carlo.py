@@ -0,0 +1,183 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+METRICS = ('sharpe', 'max_drawdown', 'profit_factor')
+METHODS = ('bootstrap', 'shuffle')
+
+
+def trade_returns(df: pd.DataFrame, hold_period: int = 3, fee_rate: float = 0.0) -> np.ndarray:
+    """
+    Per-trade returns of calculate() signals held for a fixed number of candles
+
+    Each signal enters at its candle's close and exits at the close
+    hold_period candles later (candles of df, not later signals); sells earn
+    the price drop. Signals without hold_period candles after them are
+    dropped.
+
+    Args:
+        df: Output of CompositeIndicator.calculate
+        hold_period: Candles per trade
+        fee_rate: Fee per side, subtracted twice from each return
+
+    Returns:
+        float64 array of returns in signal order
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    signal = df['signal'].to_numpy()
+    rows = np.flatnonzero(signal)
+    rows = rows[rows + hold_period < len(close)]
+    moves = close[rows + hold_period] / close[rows] - 1
+    return signal[rows] * moves - 2 * fee_rate
+
+
+def portfolio_trade_returns(trades: pd.DataFrame) -> np.ndarray:
+    """Net return on entry notional of each PortfolioSimulator trade"""
+    return (trades['pnl'] / (trades['quantity'] * trades['entry_price'])).to_numpy(dtype=np.float64)
+
+
+def resample_metrics(samples: np.ndarray, periods_per_year: Optional[float] = None) -> np.ndarray:
+    """
+    Sharpe, max drawdown and profit factor of each row of a (resamples, trades) matrix
+
+    Equity compounds trade returns; Sharpe is per trade unless periods_per_year
+    (trades per year) is given.
+
+    Returns:
+        (resamples, 3) array in METRICS order
+    """
+    out = np.empty((samples.shape[0], len(METRICS)))
+
+    std = samples.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, 0] = np.where(std > 0, samples.mean(axis=1) / std, 0.0)
+    if periods_per_year:
+        out[:, 0] *= np.sqrt(periods_per_year)
+
+    equity = np.cumprod(1 + samples, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)  # the curve starts at 1 before the first trade
+    out[:, 1] = np.max(1 - equity / peak, axis=1)
+    del equity, peak
+
+    gains = np.where(samples > 0, samples, 0).sum(axis=1)
+    losses = -np.where(samples < 0, samples, 0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[:, 2] = np.where(losses > 0, gains / losses, np.inf)
+    return out
+
+
+def _draw(returns: np.ndarray, count: int, method: str, block_length: int, rng: np.random.Generator) -> np.ndarray:
+    n = len(returns)
+    if method == 'shuffle':
+        return rng.permuted(np.broadcast_to(returns, (count, n)), axis=1)
+
+    # Circular block bootstrap: concatenated random blocks, cut to n trades
+    blocks = -(-n // block_length)
+    starts = rng.integers(0, n, size=(count, blocks, 1))
+    positions = (starts + np.arange(block_length)).reshape(count, -1)[:, :n] % n
+    return returns[positions]
+
+
+def _run_chunk(args) -> np.ndarray:
+    returns, count, method, block_length, seed, periods_per_year = args
+    rng = np.random.default_rng(seed)
+    return resample_metrics(_draw(returns, count, method, block_length, rng), periods_per_year)
+
+
+def monte_carlo(returns: np.ndarray, n_resamples: int = 10000, method: str = 'bootstrap',
+                block_length: int = 20, confidence: float = 0.95, chunk_size: int = 500,
+                processes: Optional[int] = None, seed: int = 0,
+                periods_per_year: Optional[float] = None) -> dict:
+    """
+    Confidence intervals for Sharpe, max drawdown and profit factor by resampling trades
+
+    Resamples are drawn and scored in chunks of chunk_size rows, so memory is a
+    few (chunk_size, trades) arrays whatever n_resamples is; chunks run in a
+    process pool with independent SeedSequence streams, so results do not
+    depend on the number of processes.
+
+    'bootstrap' keeps serial correlation inside blocks of block_length trades;
+    'shuffle' permutes the trade order, which leaves Sharpe and profit factor
+    unchanged and measures path risk (drawdown) only.
+
+    Args:
+        returns: Per-trade returns (trade_returns or portfolio_trade_returns)
+        n_resamples: Number of resampled trade sequences
+        method: 'bootstrap' or 'shuffle'
+        block_length: Trades per bootstrap block
+        confidence: Central interval mass (0.95 -> 2.5% / 97.5% quantiles)
+        chunk_size: Resamples per task
+        processes: Pool size (1 runs in-process; None uses all cores)
+        seed: Root seed
+        periods_per_year: Trades per year for an annualized Sharpe
+
+    Returns:
+        Dict with observed (metrics of the original sequence), intervals
+        (DataFrame: lower, median, upper per metric), samples (per-resample
+        metrics DataFrame) and seconds
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}, expected one of {METHODS}")
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    if len(returns) < 2:
+        raise ValueError("Need at least two trades to resample")
+
+    start = time.perf_counter()
+    counts = [min(chunk_size, n_resamples - i) for i in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = [(returns, count, method, block_length, s, periods_per_year) for count, s in zip(counts, seeds)]
+
+    if processes == 1 or len(tasks) == 1:
+        results = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_run_chunk, tasks))
+
+    samples = pd.DataFrame(np.concatenate(results), columns=list(METRICS))
+    tail = (1 - confidence) / 2
+    intervals = pd.DataFrame({
+        'lower': samples.quantile(tail),
+        'median': samples.median(),
+        'upper': samples.quantile(1 - tail),
+    })
+    observed = dict(zip(METRICS, resample_metrics(returns[None, :], periods_per_year)[0].tolist()))
+
+    return {
+        'observed': observed,
+        'intervals': intervals,
+        'samples': samples,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def print_monte_carlo(result: dict):
+    """Print observed metrics next to their resampled confidence intervals"""
+    print(f"Monte Carlo: {len(result['samples'])} resamples in {result['seconds']:.2f}s")
+    for metric, row in result['intervals'].iterrows():
+        print(f"  {metric:>14}: observed {result['observed'][metric]:.4f}  "
+              f"[{row['lower']:.4f}, {row['median']:.4f}, {row['upper']:.4f}]")
+
+
+if __name__ == "__main__":
+    import argparse
+    from index import calculate_signals
+
+    parser = argparse.ArgumentParser(description="Bootstrap confidence intervals for signal trades")
+    parser.add_argument("symbol", type=str, nargs="?", default="BTCUSDT")
+    parser.add_argument("timeframe", type=str, nargs="?", default="15m")
+    parser.add_argument("--lookback", type=int, default=50000)
+    parser.add_argument("--hold-period", type=int, default=3)
+    parser.add_argument("--resamples", type=int, default=10000)
+    parser.add_argument("--method", type=str, default="bootstrap", choices=METHODS)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    df = calculate_signals(args.symbol, args.timeframe, lookback=args.lookback)
+    returns = trade_returns(df, hold_period=args.hold_period)
+    print(f"{len(returns)} trades")
+    print_monte_carlo(monte_carlo(returns, args.resamples, args.method, processes=args.processes))
@@ -0,0 +1,167 @@
+from typing import Optional, Union
+
+import pandas as pd
+import polars as pl
+
+from .indicators import OUTPUT_COLUMNS
+
+
+def _fill(expr: pl.Expr) -> pl.Expr:
+    """pandas fillna(0) equivalent: Polars keeps NaN and null apart"""
+    return expr.fill_nan(0).fill_null(0)
+
+
+def build_lazy(lf: pl.LazyFrame, lookback: int = 20, by: Optional[str] = None) -> pl.LazyFrame:
+    """
+    Add the CompositeIndicator output columns to a lazy kline frame
+
+    Args:
+        lf: LazyFrame with [high, low, close, volume], sorted by time (within symbol)
+        lookback: Lookback period for SMA / volume SMA / OBV SMA
+        by: Partition column (e.g. 'symbol') for multi-symbol frames
+
+    Returns:
+        LazyFrame with OUTPUT_COLUMNS appended
+    """
+    def w(expr: pl.Expr) -> pl.Expr:
+        return expr.over(by) if by else expr
+
+    close = pl.col('close')
+    volume = pl.col('volume')
+    delta = w(close.diff())
+    prev_close = w(close.shift(1))
+
+    # 1. Raw series
+    lf = lf.with_columns(
+        w(pl.when(delta > 0).then(delta).otherwise(0).rolling_mean(14)).alias('_gain'),
+        w(pl.when(delta < 0).then(-delta).otherwise(0).rolling_mean(14)).alias('_loss'),
+        (w(close.ewm_mean(span=12, adjust=False)) - w(close.ewm_mean(span=26, adjust=False))).alias('macd'),
+        (close - w(close.shift(10))).alias('momentum'),
+        ((close - w(close.shift(12))) / w(close.shift(12)) * 100).alias('roc'),
+        w(close.rolling_mean(lookback)).alias('sma_20'),
+        w(close.rolling_mean(50)).alias('sma_50'),
+        w(close.rolling_mean(20)).alias('bollinger_mid'),
+        w(close.rolling_std(20)).alias('_bb_std'),
+        pl.max_horizontal(
+            pl.col('high') - pl.col('low'),
+            (pl.col('high') - prev_close).abs(),
+            (pl.col('low') - prev_close).abs(),
+        ).alias('_tr'),
+        w(volume.rolling_mean(lookback)).alias('volume_sma'),
+        w(pl.when(delta.is_null()).then(volume).otherwise(delta.sign() * volume).cum_sum()).alias('obv'),
+    )
+
+    # 2. Derived indicators
+    lf = lf.with_columns(
+        (100 - 100 / (1 + pl.col('_gain') / pl.col('_loss'))).alias('rsi'),
+        w(pl.col('macd').ewm_mean(span=9, adjust=False)).alias('signal_line'),
+        ((pl.col('sma_20') - pl.col('sma_50')) / pl.col('sma_50')).alias('trend'),
+        w(pl.col('_tr').rolling_mean(14)).alias('atr'),
+        (pl.col('bollinger_mid') + pl.col('_bb_std') * 2).alias('bollinger_upper'),
+        (pl.col('bollinger_mid') - pl.col('_bb_std') * 2).alias('bollinger_lower'),
+        (volume / pl.col('volume_sma')).alias('volume_ratio'),
+        w(pl.col('obv').rolling_mean(lookback)).alias('obv_sma'),
+    ).with_columns(
+        (pl.col('macd') - pl.col('signal_line')).alias('histogram'),
+        ((pl.col('bollinger_upper') - pl.col('bollinger_lower')) / pl.col('bollinger_mid')).alias('volatility'),
+    )
+
+    # 3. Component scores (-1 to 1)
+    histogram = pl.col('histogram')
+    macd_signal = histogram.sign() * (histogram.abs() / (w(histogram.abs().rolling_max(20)) + 1e-6))
+    momentum_score = (0.35 * (pl.col('rsi') - 50) / 50 + 0.35 * macd_signal
+                      + 0.20 * pl.col('momentum').sign() + 0.10 * pl.col('roc').sign())
+
+    close_to_mid = (close - pl.col('sma_20')) / (pl.col('sma_20') + 1e-6)
+    close_to_lower = (close - pl.col('bollinger_lower')) / (pl.col('bollinger_mid') + 1e-6)
+    trend_score = (0.40 * close_to_mid.clip(-1, 1) + 0.30 * close_to_lower.clip(-1, 1)
+                   + 0.30 * (pl.col('sma_20') - pl.col('sma_50')).sign())
+
+    volume_surge = (pl.col('volume_ratio') + 1).log() / pl.lit(3.0).log()
+    volume_score = 0.60 * volume_surge.clip(-1, 1) + 0.40 * (pl.col('obv') - pl.col('obv_sma')).sign()
+
+    volatility_score = ((pl.col('atr') / close).clip(0, 0.1) + pl.col('volatility') / 0.1) / 2
+
+    lf = lf.with_columns(
+        _fill(momentum_score).clip(-1, 1).alias('momentum_score'),
+        _fill(trend_score).clip(-1, 1).alias('trend_score'),
+        _fill(volume_score).clip(-1, 1).alias('volume_score'),
+        _fill(volatility_score).clip(-1, 1).alias('volatility_score'),
+    )
+
+    # 4. Signal and strength from the previous candle. NaN (RSI on flat
+    # prices) becomes null: Polars orders NaN above every number, pandas
+    # compares it as false, and a null comparison falls through to otherwise()
+    lf = lf.with_columns(
+        w(pl.col(name).fill_nan(None).shift(1)).alias(f'_{name}_prev')
+        for name in ['momentum_score', 'trend_score', 'volume_score', 'volatility_score', 'rsi', 'macd', 'histogram']
+    ).with_columns(
+        w(pl.col('histogram').fill_nan(None).shift(2)).alias('_histogram_prev2'),
+        (0.35 * pl.col('_momentum_score_prev') + 0.35 * pl.col('_trend_score_prev')
+         + 0.20 * pl.col('_volume_score_prev') + 0.10 * pl.col('_volatility_score_prev')).alias('_composite'),
+    )
+
+    momentum_prev = pl.col('_momentum_score_prev')
+    trend_prev = pl.col('_trend_score_prev')
+    rsi_prev = pl.col('_rsi_prev')
+    macd_prev = pl.col('_macd_prev')
+    histogram_prev = pl.col('_histogram_prev')
+    composite = pl.col('_composite')
+
+    buy_condition = (
+        ((composite > 0.2) & (momentum_prev > 0.1) & (trend_prev > -0.5)) |
+        ((rsi_prev < 35) & (rsi_prev > 20)) |
+        ((macd_prev > 0) & (histogram_prev > 0) & (pl.col('_histogram_prev2') <= 0))
+    )
+    sell_condition = (
+        ((composite < -0.2) & (momentum_prev < -0.1) & (trend_prev < 0.5)) |
+        ((rsi_prev > 65) & (rsi_prev < 80)) |
+        ((macd_prev < 0) & (histogram_prev < 0) & (pl.col('_histogram_prev2') >= 0))
+    )
+
+    agreement = (momentum_prev.abs() + trend_prev.abs()) / 2
+    rsi_extreme = pl.when((rsi_prev < 35) | (rsi_prev > 65)).then(0.8).otherwise(0.5)
+    volume_boost = (pl.col('_volume_score_prev') + 1) / 2
+
+    lf = lf.with_columns(
+        pl.when(sell_condition).then(-1).when(buy_condition).then(1).otherwise(0).cast(pl.Int64).alias('signal'),
+        _fill(agreement * volume_boost * (rsi_extreme / 0.65)).clip(0, 1).alias('signal_strength'),
+    )
+
+    return lf.drop(pl.selectors.starts_with('_'))
+
+
+def calculate_polars(data: Union[pd.DataFrame, pl.DataFrame, pl.LazyFrame], lookback: int = 20,
+                     symbol_column: str = 'symbol'):
+    """
+    Polars equivalent of CompositeIndicator.calculate
+
+    The logic runs as a chain of LazyFrame stages; with a symbol column every
+    order-dependent expression is evaluated per symbol with over(), so a
+    multi-symbol history is one query Polars can fuse and run across cores.
+
+    Args:
+        data: pandas DataFrame, Polars DataFrame or LazyFrame of klines; a
+              symbol_column, if present, partitions the rolling windows
+        lookback: Lookback period for SMA
+        symbol_column: Partition column name
+
+    Returns:
+        Same kind of object as the input with the output columns added
+        (a LazyFrame stays lazy so the caller decides when to collect)
+    """
+    if isinstance(data, pd.DataFrame):
+        by = symbol_column if symbol_column in data.columns else None
+        columns = ['high', 'low', 'close', 'volume'] + ([by] if by else [])
+        computed = calculate_polars(pl.from_pandas(data[columns]), lookback, symbol_column)
+
+        result = data.copy()
+        for name in OUTPUT_COLUMNS:
+            result[name] = computed[name].to_numpy()
+        return result
+
+    lf = data.lazy() if isinstance(data, pl.DataFrame) else data
+    by = symbol_column if symbol_column in lf.collect_schema().names() else None
+    lf = build_lazy(lf.with_columns(pl.col('high', 'low', 'close', 'volume').cast(pl.Float64)), lookback, by)
+
+    return lf.collect() if isinstance(data, pl.DataFrame) else lf
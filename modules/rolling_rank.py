@@ -0,0 +1,228 @@
+import bisect
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .jit import njit
+
+
+# Output names of add_rank_features (ml_classifier.feature_engineering.RANK_FEATURE_COLUMNS)
+RANK_FEATURES = ('volume_rank', 'atr_ratio_rank', 'bb_width_rank', 'volume_to_q90', 'bb_width_to_median')
+
+
+def _compress(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorted unique values, the code of each value in them, and the non-NaN mask
+
+    Codes span the whole series rather than one window, so the sort is
+    O(n log n) and the kernels' Fenwick trees have one slot per distinct value.
+    """
+    valid = ~np.isnan(values)
+    uniques = np.unique(values[valid])
+    codes = np.searchsorted(uniques, np.where(valid, values, 0.0)).astype(np.int64)
+    return uniques, codes, valid
+
+
+@njit(cache=True, inline='always')
+def _fenwick_add(tree, code, delta):
+    i = code + 1
+    while i < tree.shape[0]:
+        tree[i] += delta
+        i += i & -i
+
+
+@njit(cache=True, inline='always')
+def _fenwick_prefix(tree, code):
+    # Number of observations with code < code
+    total = 0
+    i = code
+    while i > 0:
+        total += tree[i]
+        i -= i & -i
+    return total
+
+
+@njit(cache=True, inline='always')
+def _fenwick_kth(tree, top_bit, k):
+    # Code of the k-th smallest observation (0-based)
+    pos = 0
+    remaining = k + 1
+    step = top_bit
+    while step > 0:
+        if pos + step < tree.shape[0] and tree[pos + step] < remaining:
+            pos += step
+            remaining -= tree[pos]
+        step >>= 1
+    return pos
+
+
+@njit(cache=True)
+def _rolling_rank_kernel(codes, valid, n_codes, window, min_periods, pct):
+    n = codes.shape[0]
+    tree = np.zeros(n_codes + 1, dtype=np.int64)
+    counts = np.zeros(max(n_codes, 1), dtype=np.int64)
+    out = np.empty(n)
+    nobs = 0
+
+    for i in range(n):
+        if valid[i]:
+            _fenwick_add(tree, codes[i], 1)
+            counts[codes[i]] += 1
+            nobs += 1
+        if i >= window and valid[i - window]:
+            _fenwick_add(tree, codes[i - window], -1)
+            counts[codes[i - window]] -= 1
+            nobs -= 1
+
+        if not valid[i] or nobs < min_periods:
+            out[i] = np.nan
+            continue
+        # Average rank of ties, as in pandas rank(method='average')
+        rank = _fenwick_prefix(tree, codes[i]) + (counts[codes[i]] + 1) / 2.0
+        out[i] = rank / nobs if pct else rank
+    return out
+
+
+@njit(cache=True)
+def _rolling_quantile_kernel(codes, valid, uniques, window, min_periods, q):
+    n = codes.shape[0]
+    n_codes = uniques.shape[0]
+    tree = np.zeros(n_codes + 1, dtype=np.int64)
+    top_bit = 1
+    while top_bit * 2 <= n_codes:
+        top_bit *= 2
+    out = np.empty(n)
+    nobs = 0
+
+    for i in range(n):
+        if valid[i]:
+            _fenwick_add(tree, codes[i], 1)
+            nobs += 1
+        if i >= window and valid[i - window]:
+            _fenwick_add(tree, codes[i - window], -1)
+            nobs -= 1
+
+        if nobs < min_periods or nobs == 0:
+            out[i] = np.nan
+            continue
+        # Linear interpolation, as in pandas rolling().quantile()
+        position = q * (nobs - 1)
+        lower = int(position)
+        low_value = uniques[_fenwick_kth(tree, top_bit, lower)]
+        if position == lower:
+            out[i] = low_value
+        else:
+            high_value = uniques[_fenwick_kth(tree, top_bit, lower + 1)]
+            out[i] = low_value + (high_value - low_value) * (position - lower)
+    return out
+
+
+def rolling_rank(values, window: int, min_periods: Optional[int] = None, pct: bool = True) -> np.ndarray:
+    """
+    Rank of each value within its trailing window, O(n log n)
+
+    Same result as pd.Series(values).rolling(window, min_periods).rank(pct=pct):
+    ties get their average rank, NaNs are skipped and rank as NaN.
+
+    Args:
+        values: 1-D array-like
+        window: Window length in rows
+        min_periods: Minimum non-NaN observations (default: window)
+        pct: Divide the rank by the number of observations (0-1 scale)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    uniques, codes, valid = _compress(values)
+    min_periods = window if min_periods is None else min_periods
+    return _rolling_rank_kernel(codes, valid, len(uniques), window, min_periods, pct)
+
+
+def rolling_quantile(values, window: int, q: float, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Trailing-window quantile, O(n log n)
+
+    Same result as pd.Series(values).rolling(window, min_periods).quantile(q)
+    (linear interpolation).
+    """
+    if not 0 <= q <= 1:
+        raise ValueError("q must be between 0 and 1")
+    values = np.asarray(values, dtype=np.float64)
+    uniques, codes, valid = _compress(values)
+    min_periods = window if min_periods is None else min_periods
+    return _rolling_quantile_kernel(codes, valid, uniques, window, min_periods, q)
+
+
+class StreamingRank:
+    """
+    Incremental rolling rank / quantile for live candles
+
+    Keeps the window in arrival order and in a sorted list (bisect insert and
+    remove, O(w) memmove but tiny for windows of hundreds), giving the same
+    values as rolling_rank / rolling_quantile over the same stream.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.recent = deque()
+        self.sorted = []
+
+    def update(self, value: float, pct: bool = True) -> float:
+        """Add the newest value and return its rank in the window"""
+        self.recent.append(value)
+        if value == value:
+            bisect.insort(self.sorted, value)
+        if len(self.recent) > self.window:
+            old = self.recent.popleft()
+            if old == old:
+                del self.sorted[bisect.bisect_left(self.sorted, old)]
+
+        nobs = len(self.sorted)
+        if value != value or nobs < self.min_periods:
+            return np.nan
+        less = bisect.bisect_left(self.sorted, value)
+        equal = bisect.bisect_right(self.sorted, value) - less
+        rank = less + (equal + 1) / 2.0
+        return rank / nobs if pct else rank
+
+    def quantile(self, q: float) -> float:
+        """Quantile of the current window"""
+        nobs = len(self.sorted)
+        if nobs < self.min_periods or nobs == 0:
+            return np.nan
+        position = q * (nobs - 1)
+        lower = int(position)
+        if position == lower:
+            return self.sorted[lower]
+        return self.sorted[lower] + (self.sorted[lower + 1] - self.sorted[lower]) * (position - lower)
+
+
+def add_rank_features(df: pd.DataFrame, window: int = 500) -> pd.DataFrame:
+    """
+    Regime-relative volume and volatility features for a calculate() output
+
+    volume_rank, atr_ratio_rank, bb_width_rank: percentile (0-1) of volume,
+    ATR/close and Bollinger width within the trailing window;
+    volume_to_q90, bb_width_to_median: the value over its rolling 90th
+    percentile / median.
+
+    Args:
+        df: Output of CompositeIndicator.calculate
+        window: Trailing window in candles
+
+    Returns:
+        Copy of df with RANK_FEATURES columns
+    """
+    result = df.copy()
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    atr_ratio = (df['atr'] / df['close']).to_numpy(dtype=np.float64)
+    bb_width = df['volatility'].to_numpy(dtype=np.float64)
+
+    result['volume_rank'] = rolling_rank(volume, window)
+    result['atr_ratio_rank'] = rolling_rank(atr_ratio, window)
+    result['bb_width_rank'] = rolling_rank(bb_width, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['volume_to_q90'] = volume / rolling_quantile(volume, window, 0.9)
+        result['bb_width_to_median'] = bb_width / rolling_quantile(bb_width, window, 0.5)
+    return result
@@ -0,0 +1,226 @@
+import atexit
+import sys
+import weakref
+from multiprocessing import Pool, shared_memory
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import CompositeIndicator
+
+SHARED_COLUMNS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+
+class SharedArrayHandle(NamedTuple):
+    """Picklable reference to one symbol's OHLCV block in shared memory"""
+    symbol: str
+    name: str
+    shape: Tuple[int, int]
+    dtype: str
+    columns: Tuple[str, ...]
+
+
+# Whether this process started its own resource tracker by attaching
+_own_tracker = False
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing its lifetime to this process"""
+    global _own_tracker
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    from multiprocessing import parent_process, resource_tracker
+
+    # Pool workers (fork, spawn and forkserver alike) inherit the owner's
+    # tracker connection. Registering there again is a no-op, but unregistering
+    # would drop the owner's registration and a killed owner would leak the
+    # segment. Only a tracker of this process' own must forget the segment,
+    # or it would unlink it when this process exits.
+    connected = resource_tracker._resource_tracker._fd is not None
+    inherited = connected and not _own_tracker and parent_process() is not None
+    shm = shared_memory.SharedMemory(name=name)
+    if not inherited:
+        _own_tracker = _own_tracker or not connected
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def _release(segments: Dict[str, shared_memory.SharedMemory]):
+    for shm in segments.values():
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    segments.clear()
+
+
+class SharedKlineStore:
+    """
+    Owner of per-symbol OHLCV blocks in multiprocessing.shared_memory
+
+    Each symbol is stored once as a (columns, rows) float64 block, so every
+    column is a contiguous row of the block and workers get zero-copy views.
+    open_time is kept as epoch milliseconds (exact in float64).
+
+    Segments are unlinked on close(), on interpreter exit and when the store
+    is garbage collected; if the owner is killed outright, the multiprocessing
+    resource tracker unlinks what it left behind.
+    """
+
+    def __init__(self):
+        self.segments: Dict[str, shared_memory.SharedMemory] = {}
+        self.handles: Dict[str, SharedArrayHandle] = {}
+        self._finalizer = weakref.finalize(self, _release, self.segments)
+        atexit.register(self._finalizer)
+
+    def add(self, symbol: str, df: pd.DataFrame) -> SharedArrayHandle:
+        """Copy a kline frame into a new shared segment and return its handle"""
+        if symbol in self.handles:
+            raise ValueError(f"{symbol} is already in the shared store")
+
+        shape = (len(SHARED_COLUMNS), len(df))
+        shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+        self.segments[symbol] = shm
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+        for i, column in enumerate(SHARED_COLUMNS):
+            values = df[column].to_numpy()
+            if column == 'open_time' and np.issubdtype(values.dtype, np.datetime64):
+                values = values.astype('datetime64[ms]').astype(np.int64)
+            block[i] = values
+
+        handle = SharedArrayHandle(symbol, shm.name, shape, 'float64', SHARED_COLUMNS)
+        self.handles[symbol] = handle
+        return handle
+
+    def load(self, symbols: List[str], timeframe: str, lookback: Optional[int] = None) -> List[SharedArrayHandle]:
+        """Load symbols with load_klines, keeping only the shared copy alive"""
+        from index import load_klines
+
+        handles = []
+        for symbol in symbols:
+            df = load_klines(symbol, timeframe)
+            if lookback is not None:
+                df = df.tail(lookback)
+            handles.append(self.add(symbol, df))
+            del df
+        return handles
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shm.size for shm in self.segments.values())
+
+    def close(self):
+        """Unlink every segment; handles held by workers become invalid"""
+        self._finalizer()
+        self.handles.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Per-process cache so a worker maps each segment once, however many tasks use it
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _attach_block(handle: SharedArrayHandle) -> np.ndarray:
+    if handle.name not in _attached:
+        shm = _open_segment(handle.name)
+        block = np.ndarray(handle.shape, dtype=handle.dtype, buffer=shm.buf)
+        _attached[handle.name] = (shm, block)
+    return _attached[handle.name][1]
+
+
+def attach(handle: SharedArrayHandle) -> Dict[str, np.ndarray]:
+    """
+    Zero-copy column views of a shared block
+
+    Returns:
+        Dict of column name -> 1-D float64 view into shared memory
+    """
+    block = _attach_block(handle)
+    return {column: block[i] for i, column in enumerate(handle.columns)}
+
+
+def frame_from_handle(handle: SharedArrayHandle) -> pd.DataFrame:
+    """
+    DataFrame over a shared block in the layout load_klines returns
+
+    The OHLCV columns share memory with the segment (the block transposed is a
+    Fortran-ordered (rows, columns) array pandas adopts without copying); only
+    open_time is materialized as datetime64.
+    """
+    block = _attach_block(handle)
+    price_columns = list(handle.columns[1:])
+    df = pd.DataFrame(block[1:].T, columns=price_columns, copy=False)
+    df.insert(0, 'open_time', pd.to_datetime(block[0].astype(np.int64), unit='ms'))
+    return df
+
+
+def detach_all():
+    """Drop this process' mappings (the owner still holds the segments)"""
+    for shm, _ in _attached.values():
+        shm.close()
+    _attached.clear()
+
+
+def _call_with_handle(args):
+    func, handle = args
+    return func(handle)
+
+
+def map_shared(func: Callable[[SharedArrayHandle], object], handles: List[SharedArrayHandle],
+               processes: Optional[int] = None) -> List[object]:
+    """
+    Run func(handle) for every handle in a process pool
+
+    Only the small handles are pickled to workers; func must be a module-level
+    function that calls attach() or frame_from_handle() itself.
+    """
+    with Pool(processes=processes) as pool:
+        return pool.map(_call_with_handle, [(func, handle) for handle in handles], chunksize=1)
+
+
+def signal_summary(handle: SharedArrayHandle, lookback: int = 20) -> dict:
+    """
+    Worker task: run CompositeIndicator on a shared block and summarize its signals
+
+    calculate_columns reads the shared column views directly; calculate()
+    would first copy the whole frame into the worker.
+    """
+    columns = attach(handle)
+    inputs = {name: pd.Series(columns[name], copy=False) for name in ('high', 'low', 'close', 'volume')}
+    result = CompositeIndicator(lookback=lookback).calculate_columns(inputs)
+    signals = result['signal']
+    candles = len(signals)
+    return {
+        'symbol': handle.symbol,
+        'candles': candles,
+        'buy_signals': int((signals == 1).sum()),
+        'sell_signals': int((signals == -1).sum()),
+        'last_signal': int(signals.iloc[-1]) if candles else 0,
+        'last_strength': float(result['signal_strength'].iloc[-1]) if candles else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute signals for many symbols over shared memory")
+    parser.add_argument("symbols", type=str, help="Comma separated symbols")
+    parser.add_argument("timeframe", type=str, nargs="?", default="15m")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--lookback", type=int, default=None, help="Keep only the last N candles")
+    args = parser.parse_args()
+
+    with SharedKlineStore() as store:
+        handles = store.load(args.symbols.split(','), args.timeframe, lookback=args.lookback)
+        print(f"Shared {len(handles)} symbols, {store.nbytes / 1e6:.1f} MB")
+        summary = pd.DataFrame(map_shared(signal_summary, handles, processes=args.workers))
+        print(summary.to_string(index=False))
@@ -0,0 +1,365 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .indicators import OUTPUT_COLUMNS
+from .replay import to_epoch_ms
+from .streaming import StreamingIndicator
+
+
+# Columns served per bar, in order, when present in the published data
+API_COLUMNS = ['open', 'high', 'low', 'close', 'volume'] + list(OUTPUT_COLUMNS)
+FORMATS = {'json': 'application/json', 'arrow': 'application/vnd.apache.arrow.stream'}
+MAX_CACHED_DELTAS = 64
+
+
+def _json_column(values: np.ndarray, name: str) -> list:
+    if name == 'signal':
+        return values.astype(np.int64).tolist()
+    return [None if v != v else v for v in values.tolist()]
+
+
+class SeriesSnapshot:
+    """
+    Immutable state of one symbol/timeframe at one version
+
+    A new object replaces the old one on every publish, so readers use it
+    without locks. The full snapshot is encoded once at construction; deltas
+    are encoded on first request per cursor and kept for later polls.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, version: int, columns: List[str],
+                 open_time: np.ndarray, values: np.ndarray, row_version: np.ndarray):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.version = version
+        self.columns = columns
+        self.open_time = open_time
+        self.values = values
+        self.row_version = row_version
+        # Per format: a JSON validator must not answer an Arrow request with 304
+        self.etags = {fmt: f'"{symbol}-{timeframe}-{version}-{fmt}"' for fmt in FORMATS}
+        self.deltas: Dict[Tuple[int, str], bytes] = {}
+        self.full = {fmt: self._encode(np.arange(len(open_time)), 0, fmt) for fmt in FORMATS}
+
+    def summary(self) -> dict:
+        last = len(self.open_time) - 1
+        row = {'symbol': self.symbol, 'timeframe': self.timeframe, 'version': self.version,
+               'bars': len(self.open_time), 'last_open_time': int(self.open_time[last]) if last >= 0 else None}
+        for name in ('close', 'signal', 'signal_strength'):
+            if name in self.columns and last >= 0:
+                value = self.values[last, self.columns.index(name)]
+                row[name] = None if value != value else (int(value) if name == 'signal' else value)
+        return row
+
+    def _encode(self, rows: np.ndarray, since: int, fmt: str) -> bytes:
+        if fmt == 'arrow':
+            arrays = {'open_time': pa.array(self.open_time[rows], type=pa.timestamp('ms')),
+                      'version': pa.array(self.row_version[rows])}
+            for k, name in enumerate(self.columns):
+                values = self.values[rows, k]
+                arrays[name] = pa.array(values.astype(np.int64) if name == 'signal' else values)
+            table = pa.table(arrays).replace_schema_metadata({
+                'symbol': self.symbol, 'timeframe': self.timeframe,
+                'version': str(self.version), 'since': str(since),
+            })
+            sink = pa.BufferOutputStream()
+            with ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes()
+
+        data = {'open_time': self.open_time[rows].tolist(), 'version': self.row_version[rows].tolist()}
+        for k, name in enumerate(self.columns):
+            data[name] = _json_column(self.values[rows, k], name)
+        return json.dumps({
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'version': self.version,
+            'since': since,
+            # Bars older than this fell out of the window; clients drop them
+            'first_open_time': int(self.open_time[0]) if len(self.open_time) else None,
+            'bars': data,
+        }, separators=(',', ':')).encode()
+
+    def body(self, since: int = 0, fmt: str = 'json') -> bytes:
+        """Encoded bars changed after version since (0: the full snapshot)"""
+        if since <= 0:
+            return self.full[fmt]
+        key = (since, fmt)
+        body = self.deltas.get(key)
+        if body is None:
+            body = self._encode(np.flatnonzero(self.row_version > since), since, fmt)
+            if len(self.deltas) < MAX_CACHED_DELTAS:
+                self.deltas[key] = body
+        return body
+
+
+class SignalCache:
+    """
+    Latest indicator output per symbol/timeframe, ready to serve
+
+    publish() merges new or revised bars into a window of the last max_bars
+    bars. Every bar carries the series version at which it last changed, so
+    a client that remembers the version it last saw can ask for only the bars
+    changed since (appended candles, a revised last candle). Publishing data
+    identical to what is cached does not bump the version.
+    """
+
+    def __init__(self, max_bars: int = 500):
+        self.max_bars = max_bars
+        self.series: Dict[Tuple[str, str], SeriesSnapshot] = {}
+        self.lock = threading.Lock()
+        self.index_body = b'[]'
+
+    def get(self, symbol: str, timeframe: str) -> Optional[SeriesSnapshot]:
+        return self.series.get((symbol, timeframe))
+
+    def publish(self, symbol: str, timeframe: str, data: Mapping) -> int:
+        """
+        Merge bars into a series
+
+        Args:
+            symbol, timeframe: Series key
+            data: calculate() frame, StreamingIndicator.update_arrays() output or
+                  any mapping with open_time and API_COLUMNS columns
+
+        Returns:
+            The series version after the merge
+        """
+        open_time = to_epoch_ms(np.asarray(data['open_time']))
+        with self.lock:
+            current = self.series.get((symbol, timeframe))
+            columns = current.columns if current is not None else [c for c in API_COLUMNS if c in data]
+            values = np.empty((len(open_time), len(columns)), dtype=np.float64)
+            for k, name in enumerate(columns):
+                values[:, k] = np.asarray(data[name], dtype=np.float64)
+
+            if current is None:
+                version = 1
+                merged_time, merged, row_version = open_time, values, np.ones(len(open_time), dtype=np.int64)
+            else:
+                version = current.version + 1
+                merged_time, merged, row_version, changed = self._merge(current, open_time, values, version)
+                if not changed:
+                    return current.version
+
+            order = np.argsort(merged_time, kind='stable')[-self.max_bars:]
+            snapshot = SeriesSnapshot(symbol, timeframe, version, columns,
+                                      merged_time[order], merged[order], row_version[order])
+            self.series[(symbol, timeframe)] = snapshot
+            self.index_body = json.dumps([s.summary() for s in self.series.values()],
+                                         separators=(',', ':')).encode()
+        return version
+
+    @staticmethod
+    def _merge(current: SeriesSnapshot, open_time: np.ndarray, values: np.ndarray, version: int):
+        positions = np.searchsorted(current.open_time, open_time)
+        found = positions < len(current.open_time)
+        found[found] = current.open_time[positions[found]] == open_time[found]
+
+        old = current.values[positions[found]]
+        new = values[found]
+        same = ((old == new) | (np.isnan(old) & np.isnan(new))).all(axis=1)
+        revised = np.flatnonzero(found)[~same]
+        added = np.flatnonzero(~found)
+        if len(revised) == 0 and len(added) == 0:
+            return None, None, None, False
+
+        merged = current.values.copy()
+        row_version = current.row_version.copy()
+        merged[positions[revised]] = values[revised]
+        row_version[positions[revised]] = version
+
+        merged_time = np.concatenate([current.open_time, open_time[added]])
+        merged = np.concatenate([merged, values[added]])
+        row_version = np.concatenate([row_version, np.full(len(added), version, dtype=np.int64)])
+        return merged_time, merged, row_version, True
+
+
+class SignalRefresher:
+    """
+    Feed a SignalCache from a KlineStore as candles close
+
+    Keeps one StreamingIndicator per timeframe; refresh() computes only the
+    candles stored since the previous call and publishes them, so it is cheap
+    to run after every IngestionDaemon cycle.
+    """
+
+    def __init__(self, cache: SignalCache, store, symbols: List[str], timeframes: List[str],
+                 lookback: int = 20):
+        self.cache = cache
+        self.store = store
+        self.series = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        self.indicators = {timeframe: StreamingIndicator(lookback, timeframe) for timeframe in timeframes}
+
+    def refresh(self) -> int:
+        """Publish the candles closed since the last refresh. Returns bars published."""
+        published = 0
+        for symbol, timeframe in self.series:
+            indicator = self.indicators[timeframe]
+            df = self.store.read(symbol, timeframe, after=indicator.last_open_time(symbol))
+            if len(df) == 0:
+                continue
+            result = indicator.update_arrays(symbol, df['open_time'].to_numpy(), df['high'].to_numpy(),
+                                             df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy())
+            rows = slice(len(df) - len(result['open_time']), None)
+            for name in ('open', 'high', 'low', 'close', 'volume'):
+                result[name] = df[name].to_numpy()[rows]
+            tail = slice(-self.cache.max_bars, None)
+            self.cache.publish(symbol, timeframe, {name: values[tail] for name, values in result.items()})
+            published += len(result['open_time'])
+        return published
+
+
+def make_handler(cache: SignalCache):
+    """
+    Request handler serving a SignalCache
+
+    Routes:
+        GET /signals                                  all series (version, last bar)
+        GET /signals/<symbol>/<timeframe>?format=json|arrow&since=<version>
+    Responses carry ETag and X-Signal-Version; a matching If-None-Match gets
+    304 with no body.
+    """
+
+    class SignalHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out as separate writes; without TCP_NODELAY each
+        # keep-alive response waits out the client's delayed ACK
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: bytes = b'', content_type: str = 'application/json',
+                  headers: Optional[dict] = None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Expose-Headers', 'ETag, X-Signal-Version')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _error(self, status: int, message: str):
+            self._send(status, json.dumps({'error': message}).encode())
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            parts = [p for p in url.path.split('/') if p]
+            if parts == ['signals']:
+                self._send(200, cache.index_body)
+                return
+            if len(parts) != 3 or parts[0] != 'signals':
+                self._error(404, 'not found')
+                return
+
+            snapshot = cache.get(parts[1], parts[2])
+            if snapshot is None:
+                self._error(404, f'no signals for {parts[1]} {parts[2]}')
+                return
+
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            fmt = query.get('format', 'json')
+            if fmt not in FORMATS:
+                self._error(400, f'format must be one of {list(FORMATS)}')
+                return
+            try:
+                since = int(query.get('since', 0))
+            except ValueError:
+                self._error(400, 'since must be an integer version')
+                return
+
+            headers = {'ETag': snapshot.etags[fmt], 'X-Signal-Version': str(snapshot.version)}
+            if self.headers.get('If-None-Match') == snapshot.etags[fmt]:
+                self._send(304, headers=headers, content_type=FORMATS[fmt])
+                return
+            self._send(200, snapshot.body(since, fmt), FORMATS[fmt], headers)
+
+        def log_message(self, *args):
+            pass
+
+    return SignalHandler
+
+
+def serve_signals(cache: SignalCache, port: int = 8010, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve a SignalCache from a daemon thread (call shutdown() to stop)"""
+    server = ThreadingHTTPServer((host, port), make_handler(cache))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark(n_requests: int = 5000, n_series: int = 50, seed: int = 0) -> dict:
+    """Polls per second against a local server, one keep-alive client"""
+    import http.client
+
+    rng = np.random.default_rng(seed)
+    cache = SignalCache()
+    for i in range(n_series):
+        n = 500
+        data = {'open_time': np.arange(n, dtype=np.int64) * 900_000}
+        for name in API_COLUMNS:
+            data[name] = rng.normal(size=n) if name != 'signal' else rng.integers(-1, 2, n)
+        cache.publish(f"SYM{i}USDT", '15m', data)
+
+    server = serve_signals(cache, port=0)
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    versions = {}
+    start = time.perf_counter()
+    for k in range(n_requests):
+        symbol = f"SYM{k % n_series}USDT"
+        headers = {'If-None-Match': versions[symbol]} if symbol in versions and k % 2 else {}
+        connection.request('GET', f"/signals/{symbol}/15m?since={k % 3}", headers=headers)
+        response = connection.getresponse()
+        response.read()
+        versions[symbol] = response.getheader('ETag')
+    elapsed = time.perf_counter() - start
+    connection.close()
+    server.shutdown()
+    server.server_close()
+    return {'requests': n_requests, 'seconds': elapsed, 'requests_per_sec': n_requests / elapsed}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .ingestion import HttpKlineSource, IngestionDaemon, KlineStore
+
+    parser = argparse.ArgumentParser(description="Serve live composite indicator signals over HTTP")
+    parser.add_argument("--symbols", type=str, default="BTCUSDT,ETHUSDT")
+    parser.add_argument("--timeframes", type=str, default="15m,1h")
+    parser.add_argument("--base-url", type=str, default="https://api.binance.com")
+    parser.add_argument("--store", type=str, default="./data_cache/live")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--max-bars", type=int, default=500)
+    parser.add_argument("--poll-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    symbols, timeframes = args.symbols.split(','), args.timeframes.split(',')
+    store = KlineStore(args.store)
+    daemon = IngestionDaemon(HttpKlineSource(args.base_url), store, symbols, timeframes)
+    cache = SignalCache(args.max_bars)
+    refresher = SignalRefresher(cache, store, symbols, timeframes)
+    server = serve_signals(cache, args.port, args.host)
+    print(f"Serving signals on http://{args.host}:{server.server_address[1]}/signals")
+
+    try:
+        while True:
+            stats = daemon.sync_once()
+            published = refresher.refresh()
+            print(f"[signals] {stats['new_candles']} new candles, {published} bars published "
+                  f"in {stats['elapsed']:.2f}s")
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        store.flush()
+        server.shutdown()
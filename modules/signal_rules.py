@@ -0,0 +1,233 @@
+import operator
+import re
+from typing import Dict, List, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Reproduces CompositeIndicator._generate_signal
+DEFAULT_RULES = {
+    'derived': {
+        'composite': {'momentum_score': 0.35, 'trend_score': 0.35, 'volume_score': 0.20, 'volatility_score': 0.10},
+    },
+    'buy': [
+        ['composite[1] > 0.2', 'momentum_score[1] > 0.1', 'trend_score[1] > -0.5'],
+        ['rsi[1] < 35', 'rsi[1] > 20'],
+        ['macd[1] > 0', 'histogram[1] crosses_above 0'],
+    ],
+    'sell': [
+        ['composite[1] < -0.2', 'momentum_score[1] < -0.1', 'trend_score[1] < 0.5'],
+        ['rsi[1] > 65', 'rsi[1] < 80'],
+        ['macd[1] < 0', 'histogram[1] crosses_below 0'],
+    ],
+}
+
+COMPARISONS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+    '==': operator.eq, '!=': operator.ne,
+}
+CROSSES = {'crosses_above': ('>', '<='), 'crosses_below': ('<', '>=')}
+
+_REF = re.compile(r'^([A-Za-z_]\w*)(?:\[(\d+)\])?$')
+
+
+class RuleSyntaxError(ValueError):
+    """A rule condition that does not parse"""
+
+
+class CompiledRules:
+    """
+    One evaluation program for any number of rule sets
+
+    A rule set has optional 'derived' linear combinations of columns and
+    'buy' / 'sell' lists of condition groups: a group holds when all of its
+    conditions hold, a side fires when any group holds, and sell overrides
+    buy (as in _generate_signal). A condition is "<ref> <op> <ref|number>"
+    with op one of >, >=, <, <=, ==, !=, crosses_above, crosses_below, and a
+    ref is "name" or "name[lag]" (name shifted by lag candles).
+
+    Every condition is lowered to comparisons of lagged sources, and equal
+    subexpressions get one slot in the program regardless of which rule set
+    they came from. Each source is copied once into a NaN-padded buffer and
+    every lag of it is a view into that buffer.
+    """
+
+    def __init__(self, rule_sets: Mapping[str, dict]):
+        self.rule_sets = dict(rule_sets)
+        self.program: List[Tuple[tuple, str, tuple]] = []
+        self.max_lag: Dict[tuple, int] = {}
+        self.outputs: Dict[str, Tuple[tuple, tuple]] = {}
+        self._seen = set()
+
+        for set_name, spec in self.rule_sets.items():
+            derived = {name: ('linear', tuple(weights.items())) for name, weights in spec.get('derived', {}).items()}
+            for source in derived.values():
+                self._emit(source, 'linear', ())
+            sides = tuple(self._side(spec.get(side, []), derived) for side in ('buy', 'sell'))
+            self.outputs[set_name] = sides
+
+    @property
+    def columns(self) -> List[str]:
+        """Input columns the program reads"""
+        names = set()
+        for source in self.max_lag:
+            if source[0] == 'column':
+                names.add(source[1])
+        for key, kind, _ in self.program:
+            if kind == 'linear':
+                names.update(name for name, _ in key[1])
+        return sorted(names)
+
+    def _emit(self, key: tuple, kind: str, args: tuple) -> tuple:
+        if key not in self._seen:
+            self._seen.add(key)
+            self.program.append((key, kind, args))
+        return key
+
+    def _ref(self, token: str, derived: Dict[str, tuple], extra_lag: int = 0) -> tuple:
+        try:
+            return ('const', float(token))
+        except ValueError:
+            pass
+        match = _REF.match(token)
+        if match is None:
+            raise RuleSyntaxError(f"Bad reference: {token}")
+        name, lag = match.group(1), int(match.group(2) or 0) + extra_lag
+        source = derived.get(name, ('column', name))
+        self.max_lag[source] = max(self.max_lag.get(source, 0), lag)
+        return self._emit(('lag', source, lag), 'lag', (source, lag))
+
+    def _compare(self, op: str, left: str, right: str, derived: Dict[str, tuple], extra_lag: int = 0) -> tuple:
+        a = self._ref(left, derived, extra_lag)
+        b = self._ref(right, derived, extra_lag)
+        return self._emit(('cmp', op, a, b), 'cmp', (op, a, b))
+
+    def _condition(self, text: str, derived: Dict[str, tuple]) -> tuple:
+        tokens = text.split()
+        if len(tokens) != 3:
+            raise RuleSyntaxError(f"Expected '<ref> <op> <ref|number>': {text}")
+        left, op, right = tokens
+
+        if op in COMPARISONS:
+            return self._compare(op, left, right, derived)
+        if op in CROSSES:
+            now_op, before_op = CROSSES[op]
+            now = self._compare(now_op, left, right, derived)
+            before = self._compare(before_op, left, right, derived, extra_lag=1)
+            return self._emit(('and', now, before), 'and', (now, before))
+        raise RuleSyntaxError(f"Unknown operator '{op}' in: {text}")
+
+    def _side(self, groups: List[List[str]], derived: Dict[str, tuple]) -> tuple:
+        terms = []
+        for group in groups:
+            conditions = tuple(self._condition(text, derived) for text in group)
+            terms.append(conditions[0] if len(conditions) == 1 else
+                         self._emit(('and',) + conditions, 'and', conditions))
+        terms = tuple(terms)
+        if not terms:
+            return ()
+        return terms[0] if len(terms) == 1 else self._emit(('or',) + terms, 'or', terms)
+
+    def evaluate(self, data: Mapping[str, Union[np.ndarray, pd.Series]]) -> Dict[str, np.ndarray]:
+        """
+        Run every rule set over one series
+
+        Args:
+            data: DataFrame or dict of columns (the CompositeIndicator outputs)
+
+        Returns:
+            Dict of rule set name -> int64 signal array (1 BUY, -1 SELL, 0 HOLD)
+        """
+        n = len(next(iter(data.values())) if isinstance(data, dict) else data)
+        sources: Dict[tuple, np.ndarray] = {}
+        values: Dict[tuple, np.ndarray] = {}
+
+        def source_values(source: tuple) -> np.ndarray:
+            if source[0] == 'column':
+                return np.asarray(data[source[1]], dtype=np.float64)
+            return values[source]
+
+        def lagged(source: tuple, lag: int) -> np.ndarray:
+            if source not in sources:
+                pad = self.max_lag.get(source, 0)
+                buffer = np.full(n + pad, np.nan)
+                buffer[pad:] = source_values(source)
+                sources[source] = buffer
+            pad = len(sources[source]) - n
+            return sources[source][pad - lag:pad - lag + n]
+
+        for key, kind, args in self.program:
+            if kind == 'linear':
+                total = None
+                for name, weight in key[1]:
+                    term = weight * np.asarray(data[name], dtype=np.float64)
+                    total = term if total is None else total + term
+                values[key] = total
+            elif kind == 'lag':
+                values[key] = lagged(*args)
+            elif kind == 'cmp':
+                op, a, b = args
+                left = a[1] if a[0] == 'const' else values[a]
+                right = b[1] if b[0] == 'const' else values[b]
+                values[key] = COMPARISONS[op](left, right)
+            elif kind == 'and':
+                values[key] = np.logical_and.reduce([values[arg] for arg in args])
+            else:
+                values[key] = np.logical_or.reduce([values[arg] for arg in args])
+
+        signals = {}
+        for set_name, (buy, sell) in self.outputs.items():
+            signal = np.zeros(n, dtype=np.int64)
+            if buy:
+                signal[values[buy]] = 1
+            if sell:
+                signal[values[sell]] = -1
+            signals[set_name] = signal
+        return signals
+
+    def evaluate_frame(self, data: Mapping[str, Union[np.ndarray, pd.Series]]) -> pd.DataFrame:
+        """evaluate() as a DataFrame with one signal column per rule set"""
+        index = data.index if isinstance(data, pd.DataFrame) else None
+        return pd.DataFrame(self.evaluate(data), index=index)
+
+
+def compile_rules(rules: Union[dict, Mapping[str, dict]]) -> CompiledRules:
+    """
+    Compile one rule set, or a dict of named rule sets, into a shared program
+
+    A single rule set (a dict with 'buy' / 'sell' keys) is named 'signal'.
+    """
+    if any(key in rules for key in ('buy', 'sell', 'derived')):
+        rules = {'signal': rules}
+    return CompiledRules(rules)
+
+
+def screen_rules(df: pd.DataFrame, rule_sets: Mapping[str, dict], horizon: int = 1) -> pd.DataFrame:
+    """
+    Evaluate many rule sets in one pass and summarize each against forward returns
+
+    Args:
+        df: Output of CompositeIndicator.calculate
+        rule_sets: Named rule sets
+        horizon: Candles ahead for the forward return
+
+    Returns:
+        DataFrame indexed by rule set: buy/sell counts and mean forward return
+        in the signal direction
+    """
+    signals = compile_rules(rule_sets).evaluate(df)
+    close = df['close'].to_numpy(dtype=np.float64)
+    forward = np.full(len(close), np.nan)
+    forward[:-horizon] = close[horizon:] / close[:-horizon] - 1
+
+    rows = []
+    for name, signal in signals.items():
+        active = (signal != 0) & ~np.isnan(forward)
+        rows.append({
+            'rule_set': name,
+            'buy_signals': int((signal == 1).sum()),
+            'sell_signals': int((signal == -1).sum()),
+            'mean_signed_return': float(np.mean(signal[active] * forward[active])) if active.any() else np.nan,
+        })
+    return pd.DataFrame(rows).set_index('rule_set')
@@ -0,0 +1,326 @@
+import atexit
+import json
+import os
+import signal
+import struct
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .fused_kernel import SIGNAL, compute_arrays, new_state
+from .indicators import OUTPUT_COLUMNS
+from . import metrics
+from .replay import to_epoch_ms
+
+
+SNAPSHOT_MAGIC = b'STRMSNP1'
+SNAPSHOT_VERSION = 1
+HEADER_ALIGN = 64
+# Per-symbol record: last open_time, the last output row, then the kernel state
+RECORD_PREFIX = 1 + len(OUTPUT_COLUMNS)
+
+
+class StreamingIndicator:
+    """
+    Per-symbol incremental CompositeIndicator state for live candles
+
+    Each symbol keeps the fused kernel's flat state vector (EMAs, rolling
+    window buffers, OBV accumulator, previous values for the cross rules),
+    the open_time of the last candle it has seen and its last output row.
+    Feeding candles in any batching gives the same outputs as one
+    calculate() over the whole series.
+    """
+
+    def __init__(self, lookback: int = 20, timeframe: Optional[str] = None):
+        self.lookback = lookback
+        self.timeframe = timeframe
+        self.state_size = len(new_state(lookback))
+        self.states: Dict[str, np.ndarray] = {}
+        self.last_times: Dict[str, int] = {}
+        self.last_rows: Dict[str, np.ndarray] = {}
+        self.created: Optional[int] = None  # epoch ms of the snapshot this was restored from
+        self.candles_metric = metrics.CANDLES_PROCESSED.labels(timeframe or '')
+
+    @property
+    def symbols(self):
+        return list(self.states)
+
+    def last_open_time(self, symbol: str) -> Optional[int]:
+        """open_time (epoch ms) of the newest candle processed for a symbol"""
+        return self.last_times.get(symbol)
+
+    def latest(self, symbol: str) -> Dict[str, float]:
+        """Last output row of a symbol (indicators, scores, signal)"""
+        return dict(zip(OUTPUT_COLUMNS, self.last_rows[symbol].tolist()))
+
+    def update_arrays(self, symbol: str, open_time: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      close: np.ndarray, volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Advance a symbol by a block of candles
+
+        Candles not newer than the last processed one are skipped, so
+        overlapping blocks (a reloaded tail, a repeated poll) are safe.
+
+        Args:
+            symbol: Series key
+            open_time: Sorted open times (datetime64 or epoch ms)
+            high, low, close, volume: Candle arrays
+
+        Returns:
+            Dict with open_time (epoch ms) and one array per OUTPUT_COLUMNS
+            name for the new candles only
+        """
+        open_time = to_epoch_ms(open_time)
+        last = self.last_times.get(symbol)
+        keep = slice(None) if last is None else open_time > last
+        open_time = open_time[keep]
+
+        result = {'open_time': open_time}
+        if len(open_time) == 0:
+            result.update({name: np.empty(0) for name in OUTPUT_COLUMNS})
+            return result
+
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = new_state(self.lookback)
+        with metrics.INDICATOR_SECONDS.labels(symbol, self.timeframe or '').time():
+            out, _ = compute_arrays(np.asarray(high)[keep], np.asarray(low)[keep], np.asarray(close)[keep],
+                                    np.asarray(volume)[keep], self.lookback, state)
+        self.candles_metric.inc(len(open_time))
+        metrics.record_signals(out[SIGNAL])
+
+        self.last_times[symbol] = int(open_time[-1])
+        self.last_rows[symbol] = out[:, -1].copy()
+        result.update({name: out[k] for k, name in enumerate(OUTPUT_COLUMNS)})
+        return result
+
+    def update(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        update_arrays() for a load_klines-style frame
+
+        Returns:
+            The new rows of df with the calculate() output columns added
+        """
+        open_time = to_epoch_ms(df['open_time'].to_numpy())
+        last = self.last_times.get(symbol)
+        new = df if last is None else df[open_time > last]
+        result = self.update_arrays(symbol, new['open_time'].to_numpy(), new['high'].to_numpy(),
+                                    new['low'].to_numpy(), new['close'].to_numpy(), new['volume'].to_numpy())
+        frame = new.copy()
+        for name in OUTPUT_COLUMNS:
+            frame[name] = result[name].astype(np.int64) if name == 'signal' else result[name]
+        return frame
+
+    def snapshot(self, path: str) -> int:
+        """
+        Write all symbol state to one binary file, atomically
+
+        Layout: 8-byte magic, 4-byte header length, a JSON header (version,
+        lookback, timeframe, state size, output columns, symbols) padded to 64
+        bytes, then one float64 record per symbol: last open_time, the last
+        output row and the kernel state. The file is written next to path,
+        fsynced and renamed over it, so a crash never leaves a torn snapshot.
+
+        Returns:
+            Bytes written
+        """
+        symbols = self.symbols
+        records = np.empty((len(symbols), RECORD_PREFIX + self.state_size), dtype=np.float64)
+        for i, symbol in enumerate(symbols):
+            records[i, 0] = self.last_times[symbol]
+            records[i, 1:RECORD_PREFIX] = self.last_rows[symbol]
+            records[i, RECORD_PREFIX:] = self.states[symbol]
+
+        header = {
+            'version': SNAPSHOT_VERSION,
+            'lookback': self.lookback,
+            'timeframe': self.timeframe,
+            'state_size': self.state_size,
+            'columns': list(OUTPUT_COLUMNS),
+            'symbols': symbols,
+            'created': int(time.time() * 1000),
+        }
+        payload = json.dumps(header).encode()
+        prefix = len(SNAPSHOT_MAGIC) + 4
+        length = -(-(prefix + len(payload)) // HEADER_ALIGN) * HEADER_ALIGN - prefix
+
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack('<I', length) + payload.ljust(length, b' '))
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return prefix + length + records.nbytes
+
+    @classmethod
+    def restore(cls, path: str) -> 'StreamingIndicator':
+        """Rebuild an indicator from a snapshot() file"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a streaming snapshot")
+        prefix = len(SNAPSHOT_MAGIC) + 4
+        (length,) = struct.unpack('<I', data[len(SNAPSHOT_MAGIC):prefix])
+        header = json.loads(data[prefix:prefix + length].rstrip(b' '))
+        if header['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header['version']}")
+        if header['columns'] != list(OUTPUT_COLUMNS):
+            raise ValueError("Snapshot output columns differ from this version's OUTPUT_COLUMNS")
+
+        indicator = cls(header['lookback'], header['timeframe'])
+        if header['state_size'] != indicator.state_size:
+            raise ValueError(f"Snapshot state size {header['state_size']} does not match "
+                             f"the kernel's {indicator.state_size}")
+
+        symbols = header['symbols']
+        records = np.frombuffer(data, dtype=np.float64, offset=prefix + length).copy()
+        records = records.reshape(len(symbols), RECORD_PREFIX + indicator.state_size)
+        for i, symbol in enumerate(symbols):
+            indicator.last_times[symbol] = int(records[i, 0])
+            indicator.last_rows[symbol] = records[i, 1:RECORD_PREFIX]
+            indicator.states[symbol] = records[i, RECORD_PREFIX:]
+        indicator.created = header['created']
+        return indicator
+
+    def catch_up(self, load: Callable[[str, Optional[int]], pd.DataFrame],
+                 symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Replay the candles each symbol has not seen yet
+
+        Args:
+            load: load(symbol, after_ms) -> frame with at least the candles
+                  newer than after_ms (None for a symbol not in the state);
+                  older rows are skipped, so a full load_klines frame works too
+            symbols: Symbols to bring up to date (default: those in the state)
+
+        Returns:
+            symbol -> number of candles replayed
+        """
+        replayed = {}
+        for symbol in (self.symbols if symbols is None else symbols):
+            df = load(symbol, self.last_times.get(symbol))
+            if df is None or len(df) == 0:
+                replayed[symbol] = 0
+                continue
+            result = self.update_arrays(symbol, df['open_time'].to_numpy(), df['high'].to_numpy(),
+                                        df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy())
+            replayed[symbol] = len(result['open_time'])
+        return replayed
+
+
+def restore_or_create(path: str, load: Callable[[str, Optional[int]], pd.DataFrame],
+                      symbols: Iterable[str], lookback: int = 20,
+                      timeframe: Optional[str] = None) -> StreamingIndicator:
+    """
+    Startup helper: restore the snapshot at path if there is one, then replay
+    only the newer candles (symbols missing from the snapshot start from
+    their full history)
+    """
+    if os.path.exists(path):
+        indicator = StreamingIndicator.restore(path)
+        if indicator.lookback != lookback:
+            raise ValueError(f"{path} was taken with lookback {indicator.lookback}, not {lookback}")
+        if indicator.timeframe != timeframe:
+            raise ValueError(f"{path} was taken with timeframe {indicator.timeframe}, not {timeframe}")
+    else:
+        indicator = StreamingIndicator(lookback, timeframe)
+    indicator.catch_up(load, symbols)
+    return indicator
+
+
+class Checkpointer:
+    """
+    Periodic and on-shutdown snapshots of a StreamingIndicator
+
+    Call maybe_checkpoint() from the update loop; it writes when interval
+    seconds have passed since the last snapshot. close() (also registered
+    with atexit, and run on SIGTERM when install_signal_handlers() is used)
+    writes a final one.
+    """
+
+    def __init__(self, indicator: StreamingIndicator, path: str, interval: float = 60.0):
+        self.indicator = indicator
+        self.path = path
+        self.interval = interval
+        self.last_checkpoint = time.monotonic()
+        self.closed = False
+        atexit.register(self.close)
+
+    def checkpoint(self) -> int:
+        written = self.indicator.snapshot(self.path)
+        self.last_checkpoint = time.monotonic()
+        return written
+
+    def maybe_checkpoint(self, now: Optional[float] = None) -> bool:
+        """Snapshot if the interval has elapsed. Returns True when one was written."""
+        now = time.monotonic() if now is None else now
+        if now - self.last_checkpoint < self.interval:
+            return False
+        self.checkpoint()
+        return True
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        self.checkpoint()
+
+    def install_signal_handlers(self):
+        """Snapshot on SIGTERM / SIGINT before the process exits"""
+        def handler(signum, frame):
+            self.close()
+            raise SystemExit(128 + signum)
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, handler)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def store_loader(store, timeframe: str) -> Callable[[str, Optional[int]], pd.DataFrame]:
+    """catch_up() loader reading only the newer candles from a KlineStore"""
+    return lambda symbol, after: store.read(symbol, timeframe, after=after)
+
+
+def benchmark(n_symbols: int = 300, history: int = 2000, new_candles: int = 4, seed: int = 0) -> dict:
+    """Restart cost: restore a snapshot of n_symbols and replay the candles since it"""
+    import tempfile
+
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n_symbols):
+        n = history + new_candles
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        frames[f"SYM{i}USDT"] = pd.DataFrame({
+            'open_time': pd.date_range('2024-01-01', periods=n, freq='15min'),
+            'high': close * 1.01, 'low': close * 0.99, 'close': close,
+            'volume': rng.uniform(100, 1000, n),
+        })
+
+    indicator = StreamingIndicator()
+    for symbol, df in frames.items():
+        indicator.update(symbol, df.iloc[:history])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.bin')
+        size = indicator.snapshot(path)
+        start = time.perf_counter()
+        restored = StreamingIndicator.restore(path)
+        restore_seconds = time.perf_counter() - start
+        restored.catch_up(lambda symbol, after: frames[symbol])
+        total = time.perf_counter() - start
+
+    return {'symbols': n_symbols, 'snapshot_bytes': size, 'restore_seconds': restore_seconds,
+            'ready_seconds': total}
+
+
+if __name__ == "__main__":
+    print(benchmark())
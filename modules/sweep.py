@@ -0,0 +1,624 @@
+import itertools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+from multiprocessing import Process
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .indicators import CompositeIndicator
+from .monte_carlo import trade_returns
+
+
+KINDS = ('indicator', 'classifier')
+INDICATOR_SETTINGS = ('lookback', 'volume_threshold', 'momentum_threshold', 'trend_strength', 'rules')
+CLASSIFIER_SETTINGS = ('n_estimators', 'max_depth', 'learning_rate', 'subsample', 'colsample_bytree',
+                       'min_child_weight', 'gamma', 'reg_lambda')
+INDICATOR_METRICS = ('trades', 'win_rate', 'mean_return', 'total_return', 'sharpe')
+CLASSIFIER_METRICS = ('samples', 'positive_rate', 'accuracy', 'precision', 'recall', 'f1', 'auc')
+
+
+def parameter_grid(grid: Mapping[str, Sequence]) -> List[dict]:
+    """Every combination of a {name: values} grid, in a stable order"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def param_types(tasks: List[dict]) -> Dict[str, pa.DataType]:
+    """
+    Arrow type of each scalar parameter column, from every value in the sweep
+
+    Ints mixed with floats become float64 and any other mix becomes string,
+    so a row group never has to narrow a column typed by an earlier one.
+    """
+    kinds: Dict[str, set] = {}
+    for task in tasks:
+        for params in task['params']:
+            for name, value in params.items():
+                if isinstance(value, (int, float, str, bool)):
+                    kinds.setdefault(name, set()).add(type(value))
+    types = {}
+    for name, seen in kinds.items():
+        if seen == {bool}:
+            types[name] = pa.bool_()
+        elif seen <= {int}:
+            types[name] = pa.int64()
+        elif seen <= {int, float}:
+            types[name] = pa.float64()
+        else:
+            types[name] = pa.string()
+    return types
+
+
+_PY_TYPES = {pa.bool_(): bool, pa.int64(): int, pa.float64(): float, pa.string(): str}
+
+
+def make_tasks(symbols: List[str], timeframes: List[str], grid: Mapping[str, Sequence],
+               kind: str = 'indicator', chunk_size: int = 8) -> List[dict]:
+    """
+    Split a sweep into leasable tasks
+
+    Each task is one series and a chunk of chunk_size parameter sets, so a
+    worker loads the series once per task and a lost worker costs at most
+    one chunk.
+
+    Returns:
+        List of {task_id, kind, symbol, timeframe, params} dicts
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown sweep kind: {kind}, expected one of {KINDS}")
+    combos = parameter_grid(grid)
+    tasks = []
+    for symbol in symbols:
+        for timeframe in timeframes:
+            for start in range(0, len(combos), chunk_size):
+                tasks.append({'task_id': len(tasks), 'kind': kind, 'symbol': symbol,
+                              'timeframe': timeframe, 'params': combos[start:start + chunk_size]})
+    return tasks
+
+
+def _indicator(params: Mapping) -> CompositeIndicator:
+    settings = {name: params[name] for name in INDICATOR_SETTINGS if name in params}
+    return CompositeIndicator(backend='numba', **settings)
+
+
+def evaluate_indicator(df: pd.DataFrame, params: Mapping) -> dict:
+    """
+    Score one CompositeIndicator setting on a kline frame
+
+    Args:
+        df: load_klines() frame
+        params: CompositeIndicator keyword arguments (lookback, rules, ...) plus
+                hold_period and fee_rate for the trade returns
+
+    Returns:
+        INDICATOR_METRICS of fixed-hold trades on every signal
+    """
+    result = _indicator(params).calculate(df)
+    returns = trade_returns(result, params.get('hold_period', 3), params.get('fee_rate', 0.0))
+    if len(returns) == 0:
+        return {'trades': 0, 'win_rate': np.nan, 'mean_return': np.nan, 'total_return': 0.0, 'sharpe': np.nan}
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    return {
+        'trades': len(returns),
+        'win_rate': float((returns > 0).mean()),
+        'mean_return': float(returns.mean()),
+        'total_return': float(np.expm1(np.log1p(returns).sum())),
+        'sharpe': float(returns.mean() / std * np.sqrt(len(returns))) if std > 0 else np.nan,
+    }
+
+
+def evaluate_classifier(df: pd.DataFrame, params: Mapping) -> dict:
+    """
+    Train and score one classifier setting on a kline frame
+
+    Args:
+        df: load_klines() frame
+        params: XGBoost hyperparameters (CLASSIFIER_SETTINGS), hold_period,
+                profit_threshold, lookback and test_size
+
+    Returns:
+        CLASSIFIER_METRICS on the chronological test split
+    """
+    import xgboost as xgb
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    from ml_classifier.data_preparation import label_signals, prepare_signal_data
+    from ml_classifier.feature_engineering import get_feature_columns
+
+    signals = prepare_signal_data(_indicator(params).calculate(df))
+    labeled = label_signals(signals, params.get('hold_period', 3), params.get('profit_threshold', 0.0005))
+    X = labeled[get_feature_columns()].to_numpy(dtype=np.float64)
+    y = labeled['label'].to_numpy()
+    split = int(len(y) * (1 - params.get('test_size', 0.3)))
+    if split < 10 or len(y) - split < 10 or len(np.unique(y[:split])) < 2:
+        return {'samples': len(y), 'positive_rate': float(y.mean()) if len(y) else np.nan, 'accuracy': np.nan,
+                'precision': np.nan, 'recall': np.nan, 'f1': np.nan, 'auc': np.nan}
+
+    settings = {name: params[name] for name in CLASSIFIER_SETTINGS if name in params}
+    # One thread per worker process: throughput comes from adding workers
+    model = xgb.XGBClassifier(objective='binary:logistic', eval_metric='logloss', n_jobs=1,
+                              random_state=params.get('random_state', 42), **settings)
+    model.fit(X[:split], y[:split])
+    scores = model.predict_proba(X[split:])[:, 1]
+    predicted = (scores >= 0.5).astype(int)
+    test = y[split:]
+    return {
+        'samples': len(y),
+        'positive_rate': float(y.mean()),
+        'accuracy': float(accuracy_score(test, predicted)),
+        'precision': float(precision_score(test, predicted, zero_division=0)),
+        'recall': float(recall_score(test, predicted, zero_division=0)),
+        'f1': float(f1_score(test, predicted, zero_division=0)),
+        'auc': float(roc_auc_score(test, scores)) if len(np.unique(test)) > 1 else np.nan,
+    }
+
+
+EVALUATORS = {'indicator': evaluate_indicator, 'classifier': evaluate_classifier}
+
+
+def _default_loader(symbol: str, timeframe: str) -> pd.DataFrame:
+    from index import load_klines
+    return load_klines(symbol, timeframe)
+
+
+def run_task(task: Mapping, loader: Callable[[str, str], pd.DataFrame], worker: str = '',
+             cache: Optional[dict] = None) -> List[dict]:
+    """
+    Evaluate every parameter set of a task
+
+    Args:
+        task: One make_tasks() entry
+        loader: loader(symbol, timeframe) -> kline frame
+        worker: Worker id recorded with each row
+        cache: Per-process {(symbol, timeframe): frame} holding the last series
+            loaded; make_tasks() emits a series' chunks back to back, so one
+            entry avoids reloads without keeping every series in memory
+
+    Returns:
+        One result row per parameter set: task_id, item, symbol, timeframe,
+        worker, seconds, params (JSON), scalar params and the kind's metrics
+    """
+    key = (task['symbol'], task['timeframe'])
+    cache = {} if cache is None else cache
+    if key not in cache:
+        cache.clear()
+        cache[key] = loader(*key)
+    df = cache[key]
+
+    evaluate = EVALUATORS[task['kind']]
+    rows = []
+    for item, params in enumerate(task['params']):
+        start = time.perf_counter()
+        row = {'task_id': task['task_id'], 'item': item, 'symbol': task['symbol'], 'timeframe': task['timeframe'],
+               'worker': worker, 'params': json.dumps(params, sort_keys=True)}
+        row.update({name: value for name, value in params.items() if isinstance(value, (int, float, str, bool))})
+        row.update(evaluate(df, params))
+        row['seconds'] = time.perf_counter() - start
+        rows.append(row)
+    return rows
+
+
+class SweepCoordinator:
+    """
+    Work queue for a sweep, served over TCP as newline-delimited JSON
+
+    Workers lease one task at a time and heartbeat while running it. A lease
+    that misses its deadline (hung worker, lost node) or whose connection
+    drops (dead worker process) goes back to the queue, up to max_attempts
+    per task. The first result for a task wins; late duplicates from a
+    worker presumed lost are dropped. Result rows are buffered and written
+    to one Parquet file in row groups of flush_rows. If a row group cannot
+    be written, its rows stay buffered, flush_error is set and close()
+    saves them next to the output as JSON lines instead of dropping them.
+
+    Requests and replies:
+        {"op": "lease", "worker": id}              -> {"lease", "task"} | {"wait": s} | {"done": true}
+        {"op": "heartbeat", "lease": id}           -> {"ok": bool}
+        {"op": "result", "lease": id, "rows": []}  -> {"ok": bool}
+        {"op": "fail", "lease": id, "error": msg}  -> {"ok": true}
+    """
+
+    def __init__(self, tasks: List[dict], output: str, host: str = '127.0.0.1', port: int = 0,
+                 lease_timeout: float = 30.0, max_attempts: int = 3, flush_rows: int = 1000):
+        self.tasks = {task['task_id']: task for task in tasks}
+        self.output = output
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.flush_rows = flush_rows
+
+        self.pending = deque(self.tasks)
+        self.leases: Dict[str, dict] = {}
+        self.attempts = {task_id: 0 for task_id in self.tasks}
+        self.done = set()
+        self.failed: Dict[int, str] = {}
+        self.retries = 0
+        self.rows: List[dict] = []
+        self.rows_written = 0
+        self.writer: Optional[pq.ParquetWriter] = None
+        self.schema: Optional[pa.Schema] = None
+        self.param_types = param_types(tasks)
+        self.flush_error: Optional[str] = None
+
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.started = None
+        self.server = socketserver.ThreadingTCPServer((host, port), self._make_handler(), bind_and_activate=False)
+        self.server.allow_reuse_address = True
+        self.server.daemon_threads = True
+        self.server.server_bind()
+        self.server.server_activate()
+        if not self.tasks:
+            self.finished.set()
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def _make_handler(self):
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                held = set()
+                try:
+                    for line in self.rfile:
+                        message = json.loads(line)
+                        reply = coordinator.handle(message)
+                        if 'lease' in reply and 'task' in reply:
+                            held.add(reply['lease'])
+                        elif message.get('op') in ('result', 'fail'):
+                            held.discard(message.get('lease'))
+                        self.wfile.write(json.dumps(reply).encode() + b'\n')
+                except (ConnectionError, OSError):
+                    pass
+                finally:
+                    # The worker process is gone: its leases need not wait for the timeout
+                    coordinator.release(held, 'connection lost')
+
+        return Handler
+
+    def start(self) -> 'SweepCoordinator':
+        """Serve and reap expired leases from background threads"""
+        self.started = time.perf_counter()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._reap_loop, daemon=True).start()
+        return self
+
+    def _reap_loop(self):
+        while not self.finished.wait(min(self.lease_timeout / 4, 1.0)):
+            self.reap()
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """Requeue leases past their deadline. Returns how many expired."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            expired = [lease for lease, info in self.leases.items() if info['deadline'] < now]
+        self.release(expired, 'lease expired')
+        return len(expired)
+
+    def release(self, leases, reason: str):
+        with self.lock:
+            for lease in leases:
+                info = self.leases.pop(lease, None)
+                if info is not None:
+                    self._retry(info['task_id'], reason)
+            self._check_finished()
+
+    def _retry(self, task_id: int, reason: str):
+        if task_id in self.done:
+            return
+        if self.attempts[task_id] >= self.max_attempts:
+            self.failed[task_id] = reason
+        else:
+            self.retries += 1
+            self.pending.appendleft(task_id)
+
+    def _check_finished(self):
+        if len(self.done) + len(self.failed) == len(self.tasks):
+            self.finished.set()
+
+    def handle(self, message: Mapping) -> dict:
+        """Apply one worker request and return the reply"""
+        op = message.get('op')
+        with self.lock:
+            if op == 'lease':
+                while self.pending and (self.pending[0] in self.done or self.pending[0] in self.failed):
+                    self.pending.popleft()
+                if self.pending:
+                    task_id = self.pending.popleft()
+                    self.attempts[task_id] += 1
+                    lease = uuid.uuid4().hex
+                    self.leases[lease] = {'task_id': task_id, 'worker': message.get('worker'),
+                                          'deadline': time.monotonic() + self.lease_timeout}
+                    return {'lease': lease, 'task': self.tasks[task_id], 'lease_timeout': self.lease_timeout}
+                if self.finished.is_set():
+                    return {'done': True}
+                return {'wait': min(self.lease_timeout / 10, 0.5)}
+
+            if op == 'heartbeat':
+                info = self.leases.get(message.get('lease'))
+                if info is None:
+                    return {'ok': False}
+                info['deadline'] = time.monotonic() + self.lease_timeout
+                return {'ok': True}
+
+            if op == 'result':
+                info = self.leases.pop(message.get('lease'), None)
+                task_id = info['task_id'] if info else message.get('task_id')
+                if task_id not in self.tasks or task_id in self.done:
+                    return {'ok': False}
+                self.done.add(task_id)
+                self.failed.pop(task_id, None)
+                self.rows.extend(message.get('rows', []))
+                if len(self.rows) >= self.flush_rows and self.flush_error is None:
+                    self._flush()
+                self._check_finished()
+                return {'ok': True}
+
+            if op == 'fail':
+                info = self.leases.pop(message.get('lease'), None)
+                if info is not None:
+                    self._retry(info['task_id'], message.get('error', 'failed'))
+                    self._check_finished()
+                return {'ok': True}
+
+        return {'error': f'unknown op: {op}'}
+
+    def _table(self, rows: List[dict]) -> pa.Table:
+        casts = [(name, _PY_TYPES[arrow_type]) for name, arrow_type in self.param_types.items()]
+        rows = [{**row, **{name: cast(row[name]) for name, cast in casts if name in row}} for row in rows]
+        table = pa.Table.from_pylist(rows)
+        if self.schema is None:
+            # A metric that is NaN in every row of the first batch must not fix the column as null
+            self.schema = pa.schema([
+                pa.field(f.name, self.param_types[f.name]) if f.name in self.param_types
+                else pa.field(f.name, pa.float64()) if pa.types.is_null(f.type) else f
+                for f in table.schema
+            ])
+        return table.select(self.schema.names).cast(self.schema)
+
+    def _flush(self):
+        if not self.rows:
+            return
+        try:
+            table = self._table(self.rows)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.output, self.schema, compression='zstd')
+            self.writer.write_table(table)
+        except (pa.ArrowException, KeyError, ValueError) as e:
+            # The tasks are done either way: keep their rows for close() rather than failing the worker
+            self.flush_error = f"{type(e).__name__}: {e}"
+            print(f"Result flush failed, keeping {len(self.rows)} rows buffered: {self.flush_error}")
+            return
+        self.rows_written += table.num_rows
+        self.rows = []
+
+    def wait(self, timeout: Optional[float] = None) -> dict:
+        """
+        Block until every task is done or failed, then finish the result file
+
+        Returns:
+            Dict with tasks, done, failed ({task_id: reason}), retries, rows,
+            flush_error, unwritten (JSON lines path of rows that could not be
+            written, or None) and seconds
+        """
+        if not self.finished.wait(timeout):
+            raise TimeoutError(f"Sweep not finished: {len(self.done)}/{len(self.tasks)} tasks done")
+        return self.close()
+
+    def close(self) -> dict:
+        unwritten = None
+        with self.lock:
+            self._flush()
+            if self.rows:
+                unwritten = f"{self.output}.unwritten.jsonl"
+                with open(unwritten, 'w') as f:
+                    for row in self.rows:
+                        f.write(json.dumps(row) + '\n')
+                self.rows = []
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+        self.finished.set()
+        self.server.shutdown()
+        self.server.server_close()
+        return {
+            'tasks': len(self.tasks),
+            'done': len(self.done),
+            'failed': dict(self.failed),
+            'retries': self.retries,
+            'rows': self.rows_written,
+            'flush_error': self.flush_error,
+            'unwritten': unwritten,
+            'seconds': time.perf_counter() - self.started if self.started else 0.0,
+        }
+
+
+class WorkerClient:
+    """One connection to a coordinator, shared by a worker's task loop and heartbeat thread"""
+
+    def __init__(self, host: str, port: int, timeout: float = 60.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+        self.lock = threading.Lock()
+
+    def request(self, message: dict) -> dict:
+        with self.lock:
+            self.sock.sendall(json.dumps(message).encode() + b'\n')
+            line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Coordinator closed the connection")
+        return json.loads(line)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def _heartbeat(client: WorkerClient, lease: str, interval: float, stop: threading.Event):
+    while not stop.wait(interval):
+        try:
+            if not client.request({'op': 'heartbeat', 'lease': lease}).get('ok'):
+                return
+        except (ConnectionError, OSError):
+            return
+
+
+def run_worker(host: str, port: int, worker_id: Optional[str] = None,
+               loader: Optional[Callable[[str, str], pd.DataFrame]] = None,
+               heartbeat_interval: Optional[float] = None, max_tasks: Optional[int] = None) -> int:
+    """
+    Lease and run tasks until the coordinator reports the sweep done
+
+    Args:
+        host, port: Coordinator address
+        worker_id: Name recorded with results (default: host:pid)
+        loader: loader(symbol, timeframe) -> kline frame (default: index.load_klines)
+        heartbeat_interval: Seconds between heartbeats (default: a third of the lease timeout)
+        max_tasks: Stop after this many tasks
+
+    Returns:
+        Number of tasks completed
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    loader = loader or _default_loader
+    client = WorkerClient(host, port)
+    cache = {}
+    completed = 0
+    try:
+        while max_tasks is None or completed < max_tasks:
+            reply = client.request({'op': 'lease', 'worker': worker_id})
+            if reply.get('done'):
+                break
+            if 'wait' in reply:
+                time.sleep(reply['wait'])
+                continue
+
+            stop = threading.Event()
+            interval = heartbeat_interval or reply['lease_timeout'] / 3
+            threading.Thread(target=_heartbeat, args=(client, reply['lease'], interval, stop), daemon=True).start()
+            try:
+                rows = run_task(reply['task'], loader, worker_id, cache)
+                message = {'op': 'result', 'lease': reply['lease'], 'task_id': reply['task']['task_id'],
+                           'rows': rows}
+            except Exception as e:
+                message = {'op': 'fail', 'lease': reply['lease'], 'error': f"{type(e).__name__}: {e}"}
+            finally:
+                stop.set()
+            client.request(message)
+            completed += message['op'] == 'result'
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        client.close()
+    return completed
+
+
+def start_local_workers(n: int, host: str, port: int, **kwargs) -> List[Process]:
+    """Start n run_worker processes on this machine"""
+    processes = [Process(target=run_worker, args=(host, port, f"local-{i}"), kwargs=kwargs, daemon=True)
+                 for i in range(n)]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def run_local_sweep(tasks: List[dict], output: str, workers: int = 4,
+                    loader: Optional[Callable[[str, str], pd.DataFrame]] = None,
+                    lease_timeout: float = 30.0, max_attempts: int = 3, flush_rows: int = 1000) -> dict:
+    """Coordinator plus worker processes on this machine; returns the coordinator summary"""
+    coordinator = SweepCoordinator(tasks, output, lease_timeout=lease_timeout, max_attempts=max_attempts,
+                                   flush_rows=flush_rows).start()
+    host, port = coordinator.address
+    processes = start_local_workers(workers, host, port, loader=loader)
+    try:
+        return coordinator.wait()
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def _synthetic_loader(symbol: str, timeframe: str, n: int = 20_000) -> pd.DataFrame:
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    return pd.DataFrame({
+        'open_time': pd.date_range('2020-01-01', periods=n, freq='15min'),
+        'open': close, 'high': close * 1.003, 'low': close * 0.997, 'close': close,
+        'volume': rng.uniform(100, 1000, n),
+    })
+
+
+def benchmark(worker_counts=(1, 2, 4), n_symbols: int = 4, output_dir: str = '/tmp') -> pd.DataFrame:
+    """Parameter sets per second for increasing worker counts on synthetic data"""
+    grid = {'lookback': [10, 14, 20, 30, 50], 'hold_period': [1, 3, 6], 'fee_rate': [0.0, 0.001]}
+    tasks = make_tasks([f"SYM{i}USDT" for i in range(n_symbols)], ['15m'], grid, chunk_size=5)
+    rows = []
+    for workers in worker_counts:
+        summary = run_local_sweep(tasks, os.path.join(output_dir, f'sweep_bench_{workers}.parquet'),
+                                  workers, loader=_synthetic_loader)
+        rows.append({'workers': workers, 'rows': summary['rows'], 'seconds': summary['seconds'],
+                     'rows_per_sec': summary['rows'] / summary['seconds']})
+    result = pd.DataFrame(rows)
+    result['speedup'] = result['rows_per_sec'] / result['rows_per_sec'].iloc[0]
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Distributed parameter sweep over CompositeIndicator / classifier settings")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    coordinator_args = argparse.ArgumentParser(add_help=False)
+    coordinator_args.add_argument("--grid", type=str, required=True, help="JSON file of {param: [values]}")
+    coordinator_args.add_argument("--kind", choices=KINDS, default='indicator')
+    coordinator_args.add_argument("--symbols", type=str, default="BTCUSDT,ETHUSDT")
+    coordinator_args.add_argument("--timeframes", type=str, default="15m,1h")
+    coordinator_args.add_argument("--chunk-size", type=int, default=8)
+    coordinator_args.add_argument("--output", type=str, default="sweep_results.parquet")
+    coordinator_args.add_argument("--lease-timeout", type=float, default=30.0)
+    coordinator_args.add_argument("--max-attempts", type=int, default=3)
+
+    serve = sub.add_parser('coordinator', parents=[coordinator_args], help="Serve tasks to remote workers")
+    serve.add_argument("--host", type=str, default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=5555)
+
+    local = sub.add_parser('local', parents=[coordinator_args], help="Coordinator plus local worker processes")
+    local.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    work = sub.add_parser('worker', help="Run tasks from a coordinator")
+    work.add_argument("--host", type=str, default="127.0.0.1")
+    work.add_argument("--port", type=int, default=5555)
+    work.add_argument("--id", type=str, default=None)
+
+    args = parser.parse_args()
+    if args.command == 'worker':
+        print(f"Completed {run_worker(args.host, args.port, args.id)} tasks")
+    else:
+        with open(args.grid) as f:
+            grid = json.load(f)
+        tasks = make_tasks(args.symbols.split(','), args.timeframes.split(','), grid, args.kind, args.chunk_size)
+        print(f"{len(tasks)} tasks, {sum(len(t['params']) for t in tasks)} parameter sets")
+        if args.command == 'local':
+            summary = run_local_sweep(tasks, args.output, args.workers,
+                                      lease_timeout=args.lease_timeout, max_attempts=args.max_attempts)
+        else:
+            coordinator = SweepCoordinator(tasks, args.output, args.host, args.port,
+                                           args.lease_timeout, args.max_attempts).start()
+            print(f"Coordinator listening on {args.host}:{coordinator.address[1]}")
+            summary = coordinator.wait()
+        print(summary)
@@ -0,0 +1,38 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.indicators import CompositeIndicator
+from modules.arrow_pipeline import read_klines_table, calculate_table, write_table
+
+
+def test_arrow_path_matches_pandas_path(tmp_path):
+    """
+    The Arrow table carries exactly the columns and values calculate() produces
+    """
+    rng = np.random.default_rng(7)
+    n = 1000
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'open_time': pd.date_range('2024-01-01', periods=n, freq='1h'),
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.uniform(1, 100, n),
+    })
+    source = str(tmp_path / 'klines.parquet')
+    df.to_parquet(source)
+
+    table = calculate_table(read_klines_table(source))
+    expected = CompositeIndicator().calculate(pd.read_parquet(source))
+
+    assert table.column_names == list(expected.columns)
+    pd.testing.assert_frame_equal(table.to_pandas(), expected, check_dtype=False)
+
+    write_table(table, str(tmp_path / 'signals.arrow'), format='ipc')
+    with pa.memory_map(str(tmp_path / 'signals.arrow')) as source_file:
+        restored = pa.ipc.open_file(source_file).read_all()
+    pd.testing.assert_frame_equal(restored.to_pandas(), expected, check_dtype=False)
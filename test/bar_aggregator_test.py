@@ -0,0 +1,64 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.bar_aggregator import BarAggregator, aggregate_ticks, bars_to_frame
+from modules.indicators import CompositeIndicator
+
+
+def _ticks(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    timestamp = 1_704_067_200_000 + np.cumsum(rng.integers(0, 400, n))
+    price = np.round(100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n))), 2)
+    qty = rng.integers(1, 50, n).astype(np.float64)  # exact in float64, so cumulative sums are too
+    return timestamp, price, qty
+
+
+def _streamed(kind, size, ticks, cuts):
+    aggregator = BarAggregator(kind, size)
+    parts = []
+    for start, stop in zip(cuts[:-1], cuts[1:]):
+        parts.append(aggregator.update(*(column[start:stop] for column in ticks)))
+    parts.append(aggregator.flush())
+    return pd.concat(parts, ignore_index=True)
+
+
+@pytest.mark.parametrize('kind, size', [('time', '1m'), ('volume', 500.0), ('dollar', 40_000.0)])
+def test_any_batching_gives_the_same_bars(kind, size):
+    """
+    Bars carried across random batch boundaries equal a single-batch run
+    """
+    ticks = _ticks(20_000)
+    expected = aggregate_ticks(*ticks, kind=kind, size=size)
+    cuts = np.unique(np.concatenate(([0, 20_000], np.random.default_rng(1).integers(0, 20_000, 60))))
+
+    pd.testing.assert_frame_equal(_streamed(kind, size, ticks, cuts), expected)
+    assert np.isclose(expected['volume'].sum(), ticks[2].sum())
+
+
+def test_time_bars_match_pandas_resample():
+    timestamp, price, qty = _ticks(50_000, seed=2)
+    bars = aggregate_ticks(timestamp, price, qty, 'time', '5m')
+
+    ticks = pd.DataFrame({'price': price, 'qty': qty}, index=pd.to_datetime(timestamp, unit='ms'))
+    resampled = ticks['price'].resample('5min').ohlc()
+    resampled['volume'] = ticks['qty'].resample('5min').sum()
+    resampled = resampled.dropna().reset_index(names='open_time')
+    resampled['open_time'] = resampled['open_time'].astype('datetime64[ms]')
+
+    pd.testing.assert_frame_equal(bars, resampled, check_names=False)
+    assert list(CompositeIndicator().calculate(bars).columns[:6]) == list(bars.columns)
+
+
+def test_volume_bars_close_at_threshold_multiples():
+    bars = aggregate_ticks(np.arange(6), np.array([1.0, 2, 3, 4, 5, 6]), np.array([4.0, 4, 4, 10, 1, 1]),
+                           kind='volume', size=10)
+    # Cumulative volume 4, 8, 12 | 22 | 23, 24 (the 10-lot tick spans a whole bar)
+    assert list(bars['volume']) == [12.0, 10.0, 2.0]
+    assert list(bars['open']) == [1.0, 4.0, 5.0] and list(bars['close']) == [3.0, 4.0, 6.0]
+    assert bars_to_frame(BarAggregator('volume', 10).flush_arrays()).empty
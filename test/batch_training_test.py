@@ -0,0 +1,78 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.data_fetch import KlineFetcher, MirrorBackend, kline_path_in_repo
+from ml_classifier.batch_training import plan_workers, run_batch
+from ml_classifier.feature_engineering import get_feature_columns
+from ml_classifier.model_registry import ModelRegistry
+
+
+def _write_mirror(root: str, symbol: str, timeframe: str, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    path = os.path.join(root, kline_path_in_repo(symbol, timeframe))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame({
+        'open_time': pd.date_range('2024-01-01', periods=n, freq='15min'),
+        'open': close, 'high': close * 1.004, 'low': close * 0.996, 'close': close,
+        'volume': rng.lognormal(3, 1, n),
+    }).to_parquet(path)
+    return path
+
+
+def test_plan_workers_respects_cpu_budget():
+    for cores in [1, 4, 16]:
+        for workers, threads in [(None, None), (None, 4), (8, None), (8, 8)]:
+            planned_workers, planned_threads = plan_workers(20, workers, threads, cores=cores)
+            assert planned_workers * planned_threads <= cores
+    assert plan_workers(2, cores=16) == (2, 8)
+
+
+def test_batch_trains_then_skips_unchanged_inputs(tmp_path):
+    """
+    A second run skips every model; touching one input retrains only that one
+    """
+    mirror = str(tmp_path / 'mirror')
+    output_dir = str(tmp_path / 'models')
+    for seed, symbol in enumerate(['BTCUSDT', 'ETHUSDT']):
+        _write_mirror(mirror, symbol, '15m', 1500, seed)
+    fetcher = KlineFetcher(MirrorBackend(mirror), meta_path=str(tmp_path / 'meta.json'))
+
+    first = run_batch(['BTCUSDT', 'ETHUSDT', 'DOGEUSDT'], ['15m'], output_dir, lookback=1500,
+                      workers=1, fetcher=fetcher)
+    statuses = dict(zip(first['symbol'], first['status']))
+    assert statuses == {'BTCUSDT': 'trained', 'ETHUSDT': 'trained', 'DOGEUSDT': 'failed'}
+    assert ModelRegistry(output_dir).live_version('BTCUSDT', '15m') == 'v0001'
+    assert os.path.exists(os.path.join(output_dir, 'batch_summary.csv'))
+    assert first.loc[first['status'] == 'trained', 'pid'].nunique() == 1
+
+    second = run_batch(['BTCUSDT', 'ETHUSDT'], ['15m'], output_dir, lookback=1500, workers=1, fetcher=fetcher)
+    assert (second['status'] == 'skipped').all()
+
+    _write_mirror(mirror, 'ETHUSDT', '15m', 1500, seed=5)
+    third = run_batch(['BTCUSDT', 'ETHUSDT'], ['15m'], output_dir, lookback=1500, workers=1, fetcher=fetcher)
+    assert dict(zip(third['symbol'], third['status'])) == {'BTCUSDT': 'skipped', 'ETHUSDT': 'trained'}
+    assert ModelRegistry(output_dir).versions('ETHUSDT', '15m') == ['v0001', 'v0002']
+
+
+def test_batch_rank_features(tmp_path):
+    mirror = str(tmp_path / 'mirror')
+    output_dir = str(tmp_path / 'models')
+    _write_mirror(mirror, 'BTCUSDT', '15m', 1500, 0)
+    fetcher = KlineFetcher(MirrorBackend(mirror), meta_path=str(tmp_path / 'meta.json'))
+
+    summary = run_batch(['BTCUSDT'], ['15m'], output_dir, lookback=1500, workers=1, fetcher=fetcher,
+                        rank_features=True, rank_window=200)
+    assert summary['status'].tolist() == ['trained']
+    manifest = ModelRegistry(output_dir).manifest('BTCUSDT', '15m')
+    assert manifest['feature_columns'] == get_feature_columns(include_rank_features=True)
+    assert manifest['settings']['rank_window'] == 200
+
+    # Without rank features the settings differ, so the model is retrained
+    plain = run_batch(['BTCUSDT'], ['15m'], output_dir, lookback=1500, workers=1, fetcher=fetcher)
+    assert plain['status'].tolist() == ['trained']
@@ -0,0 +1,41 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.chunked import calculate_parquet
+from modules.fused_kernel import calculate_fused
+from modules.indicators import CompositeIndicator
+
+
+def _write_klines(path: str, n: int, row_group_size: int):
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'open_time': pd.date_range('2023-01-01', periods=n, freq='1min'),
+        'open': close, 'high': close * 1.003, 'low': close * 0.997, 'close': close,
+        'volume': rng.lognormal(2, 1, n),
+    })
+    df.to_parquet(path, row_group_size=row_group_size, index=False)
+    return df
+
+
+def test_chunked_output_equals_full_run(tmp_path):
+    """
+    Small batches that cut across row groups give the full-run result bit for bit
+    """
+    source = str(tmp_path / 'klines.parquet')
+    destination = str(tmp_path / 'out' / 'indicators.parquet')
+    df = _write_klines(source, 5000, row_group_size=1200)
+
+    stats = calculate_parquet(source, destination, batch_size=777)
+    result = pd.read_parquet(destination)
+
+    assert stats['rows'] == len(df)
+    assert stats['batches'] == pq.ParquetFile(destination).metadata.num_row_groups
+    pd.testing.assert_frame_equal(result, calculate_fused(df), check_exact=True)
+    pd.testing.assert_frame_equal(result, CompositeIndicator().calculate(df), rtol=1e-9, atol=1e-12)
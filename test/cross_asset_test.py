@@ -0,0 +1,66 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.cross_asset import CrossAssetMonitor, cross_asset_features, log_returns, rolling_corr_beta
+
+
+def _closes(n_bars: int, n_symbols: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.01, (n_bars, 1))
+    returns = market * rng.uniform(0.5, 1.5, n_symbols) + rng.normal(0, 0.005, (n_bars, n_symbols))
+    close = 100 * np.exp(np.cumsum(returns, axis=0))
+    close[:150, 3] = np.nan  # listed later
+    close[400:410, 4] = np.nan  # trading halt
+    return close
+
+
+def test_corr_and_beta_match_pandas():
+    returns = log_returns(_closes(1000, 6))
+    corr, beta = rolling_corr_beta(returns, returns[:, :2], window=96)
+
+    for j in range(6):
+        for b in range(2):
+            x, y = pd.Series(returns[:, j]), pd.Series(returns[:, b])
+            paired = x.notna() & y.notna()
+            x, y = x.where(paired), y.where(paired)
+            np.testing.assert_allclose(corr[:, j, b], x.rolling(96).corr(y), rtol=1e-6, atol=1e-9, equal_nan=True)
+            expected_beta = x.rolling(96).cov(y) / y.rolling(96).var()
+            np.testing.assert_allclose(beta[:, j, b], expected_beta, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+def test_monitor_matches_batch():
+    close = _closes(600, 8, seed=1)
+    symbols = ['BTCUSDT', 'ETHUSDT'] + [f'ALT{i}USDT' for i in range(6)]
+    returns = log_returns(close)
+    corr, beta = rolling_corr_beta(returns, returns[:, :2], window=50)
+
+    monitor = CrossAssetMonitor(symbols, window=50)
+    for t in range(len(close)):
+        live = monitor.update(close[t])
+        np.testing.assert_allclose(live['corr'], corr[t], rtol=1e-6, atol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(live['beta'], beta[t], rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+def test_features_per_symbol_frame():
+    close = _closes(300, 5, seed=2)
+    times = pd.date_range('2024-01-01', periods=300, freq='15min')
+    frames = {}
+    for j, symbol in enumerate(['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'AVAXUSDT']):
+        listed = ~np.isnan(close[:, j])
+        frames[symbol] = pd.DataFrame({
+            'open_time': times[listed], 'close': close[listed, j],
+            'signal': np.where(np.arange(listed.sum()) % 2 == 0, 1, 0),
+            'trend_score': np.ones(listed.sum()),
+        })
+
+    features = cross_asset_features(frames, window=48)
+    avax = features['AVAXUSDT']
+    assert list(avax.columns) == ['corr_btc', 'beta_btc', 'corr_eth', 'beta_eth', 'breadth_buy', 'breadth_trend']
+    assert len(avax) == len(frames['AVAXUSDT'])
+    assert np.isclose(features['BTCUSDT']['corr_btc'].dropna(), 1.0).all()
+    assert (features['BTCUSDT']['breadth_trend'] == 1.0).all()
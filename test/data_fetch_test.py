@@ -0,0 +1,87 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.data_fetch import KlineFetcher, MirrorBackend, kline_path_in_repo
+
+
+class CountingBackend:
+    """Stand-in for HubBackend that records every 'network' download"""
+
+    revalidates = True
+
+    def __init__(self, root):
+        self.root = root
+        self.downloads = []
+
+    def cached_path(self, path_in_repo):
+        path = os.path.join(self.root, path_in_repo)
+        return path if os.path.exists(path) else None
+
+    def download(self, path_in_repo):
+        self.downloads.append(path_in_repo)
+        path = os.path.join(self.root, path_in_repo)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pd.DataFrame({'close': np.arange(3.0)}).to_parquet(path)
+        return path
+
+
+def test_warm_runs_skip_the_network(tmp_path):
+    """
+    Within the metadata TTL a cached file is served without a download,
+    also from a new fetcher instance (new process)
+    """
+    backend = CountingBackend(str(tmp_path))
+    meta = str(tmp_path / 'meta.json')
+
+    fetcher = KlineFetcher(backend, metadata_ttl=60, meta_path=meta)
+    result = fetcher.prefetch(['BTCUSDT', 'ETHUSDT'], ['15m', '1h'], max_workers=4)
+    assert result['errors'] == {}
+    assert len(backend.downloads) == 4
+
+    warm = KlineFetcher(backend, metadata_ttl=60, meta_path=meta)
+    warm.resolve('BTCUSDT', '15m')
+    assert len(backend.downloads) == 4
+
+    expired = KlineFetcher(backend, metadata_ttl=0, meta_path=meta)
+    expired.resolve('BTCUSDT', '15m')
+    assert len(backend.downloads) == 5
+
+
+def test_offline_and_mirror(tmp_path):
+    """
+    Offline mode never downloads; the mirror backend needs no network at all
+    """
+    backend = CountingBackend(str(tmp_path))
+    offline = KlineFetcher(backend, offline=True, meta_path=str(tmp_path / 'meta.json'))
+    result = offline.prefetch(['BTCUSDT'], ['1d'])
+    assert list(result['errors']) == [('BTCUSDT', '1d')]
+    assert backend.downloads == []
+
+    mirror_file = tmp_path / 'mirror' / kline_path_in_repo('SOLUSDT', '1h')
+    mirror_file.parent.mkdir(parents=True)
+    pd.DataFrame({'close': [1.0]}).to_parquet(mirror_file)
+
+    mirror = KlineFetcher(MirrorBackend(str(tmp_path / 'mirror')))
+    assert mirror.resolve('SOLUSDT', '1h') == str(mirror_file)
+    assert mirror.prefetch(['BTCUSDT'], ['1h'])['errors']
+
+
+def test_concurrent_fetchers_share_metadata(tmp_path):
+    """Fetchers started together (e.g. batch workers) keep each other's revalidations"""
+    meta = tmp_path / 'meta.json'
+    first = KlineFetcher(CountingBackend(str(tmp_path)), metadata_ttl=60, meta_path=str(meta))
+    second = KlineFetcher(CountingBackend(str(tmp_path)), metadata_ttl=60, meta_path=str(meta))
+
+    first.prefetch(['BTCUSDT'], ['15m', '1h'], max_workers=2)
+    second.prefetch(['ETHUSDT'], ['15m', '1h'], max_workers=2)
+
+    warm_backend = CountingBackend(str(tmp_path))
+    warm = KlineFetcher(warm_backend, metadata_ttl=60, meta_path=str(meta))
+    warm.prefetch(['BTCUSDT', 'ETHUSDT'], ['15m', '1h'])
+    assert warm_backend.downloads == []
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
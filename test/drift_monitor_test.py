@@ -0,0 +1,110 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_classifier.drift_monitor import DRIFT_FLAG, FEATURE_PSI, DriftMonitor, DriftReference
+from ml_classifier.model_registry import ModelRegistry
+from ml_classifier.model_training import score_signals, train_signal_classifier
+
+FEATURES = ['f0', 'f1', 'f2']
+
+
+def _features(n: int, shift: float = 0.0, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, len(FEATURES)))
+    X[:, 0] += shift
+    X[:, 2] = rng.integers(0, 3, n)  # discrete feature with tied quantiles
+    return X
+
+
+def test_stable_data_does_not_flag_and_shift_does():
+    """Same-distribution traffic stays quiet; a shifted feature raises the flag once"""
+    reference = DriftReference.from_data(_features(20_000), FEATURES)
+    np.testing.assert_allclose(reference.expected.sum(axis=1), 1.0)
+
+    alerts = []
+    monitor = DriftMonitor(reference, 'BTCUSDT', '15m', on_drift=alerts.append)
+    for row in _features(2_000, seed=1):
+        monitor.update(row)
+    result = monitor.check()
+    assert not result['flag']
+    assert max(result['psi'].values()) < 0.05
+
+    monitor.reset()
+    monitor.update_batch(_features(2_000, shift=1.0, seed=2))
+    result = monitor.check()
+    assert result['flag']
+    assert result['drifted'] == ['f0']
+    monitor.check()
+    assert len(alerts) == 1
+    assert DRIFT_FLAG.value('BTCUSDT', '15m') == 1
+    assert FEATURE_PSI.value('BTCUSDT', '15m', 'f0') == result['psi']['f0']
+
+
+def test_update_and_batch_agree_and_memory_is_constant():
+    reference = DriftReference.from_data(_features(5_000), FEATURES)
+    X = _features(3_000, shift=0.5, seed=3)
+    X[::50, 1] = np.nan
+
+    single = DriftMonitor(reference, half_life=500)
+    batch = DriftMonitor(reference, half_life=500)
+    for row in X:
+        single.update(row)
+    batch.update_batch(X)
+    np.testing.assert_allclose(single.counts / single.weight, batch.counts / batch.weight)
+    assert single.missing.tolist() == [0, 60, 0]
+
+    shape = single.counts.shape
+    for _ in range(20):
+        single.update_batch(X)
+    assert single.counts.shape == shape
+    assert np.isfinite(single.counts).all()
+
+
+def test_decay_follows_recent_regime():
+    reference = DriftReference.from_data(_features(20_000), FEATURES)
+    monitor = DriftMonitor(reference, half_life=200)
+    monitor.update_batch(_features(5_000, shift=1.5, seed=4))
+    assert monitor.check()['flag']
+    monitor.update_batch(_features(3_000, seed=5))
+    assert not monitor.check()['flag']
+
+
+def test_large_batches_with_short_half_life_stay_finite():
+    reference = DriftReference.from_data(_features(20_000), FEATURES)
+    monitor = DriftMonitor(reference, half_life=10)
+    monitor.update_batch(_features(20_000, shift=1.5, seed=6))
+    assert np.isfinite(monitor.counts).all()
+    assert monitor.check()['flag']
+
+    for row in _features(100, seed=7):
+        monitor.update(row)
+    monitor.update_batch(_features(20_000, seed=8))
+    assert np.isfinite(monitor.counts).all()
+    result = monitor.check()
+    assert np.isfinite(list(result['psi'].values())).all()
+    assert np.isfinite(list(result['ks'].values())).all()
+
+
+def test_reference_is_stored_with_registry_version(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(_features(1_000), columns=FEATURES)
+    df['label'] = (df['f0'] + rng.normal(0, 0.5, len(df)) > 0).astype(int)
+    result = train_signal_classifier(df, FEATURES)
+    reference = DriftReference.from_data(df[FEATURES].values, FEATURES)
+
+    registry = ModelRegistry(str(tmp_path))
+    registry.register(result['model'], result['scaler'], 'BTCUSDT', '15m', FEATURES, reference=reference)
+    loaded = ModelRegistry(str(tmp_path)).load('BTCUSDT', '15m', verify=True)
+    assert 'drift_reference.npz' in loaded.manifest['files']
+    assert loaded.reference.feature_columns == FEATURES
+    np.testing.assert_array_equal(loaded.reference.edges, reference.edges)
+
+    monitor = DriftMonitor(loaded.reference)
+    score_signals(loaded, loaded, df, FEATURES, monitor=monitor)
+    assert monitor.observations == len(df)
+    assert not monitor.check()['flag']
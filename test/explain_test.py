@@ -0,0 +1,55 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_classifier import get_feature_columns, train_signal_classifier
+from ml_classifier.explain import attach_contributions, explain_signals, summarize_contributions
+
+
+def _labeled(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    features = get_feature_columns()
+    df = pd.DataFrame(rng.normal(size=(n, len(features))), columns=features)
+    df['label'] = ((df['rsi'] + 0.5 * df['trend_score'] + rng.normal(0, 0.5, n)) > 0).astype(int)
+    return df
+
+
+def test_contributions_sum_to_model_log_odds():
+    """
+    Each row's contributions plus bias reproduce predict_proba
+    """
+    features = get_feature_columns()
+    df = _labeled(3000)
+    result = train_signal_classifier(df, features)
+    contribs = explain_signals(result['model'], result['scaler'], df, features, batch_size=700)
+
+    assert contribs.dtype == np.float32 and contribs.shape == (3000, len(features) + 1)
+    expected = result['model'].predict_proba(result['scaler'].transform(df[features].values))[:, 1]
+    explained = attach_contributions(df, contribs, features)
+    np.testing.assert_allclose(explained['model_score'], expected, atol=1e-4)
+    assert 'contrib_bias' in explained and explained['contrib_rsi'].dtype == np.float32
+
+    summary = summarize_contributions(contribs, features)
+    assert summary.index[0] == 'rsi'
+    assert np.isclose(summary['share'].sum(), 1.0)
+    assert summary.loc['rsi', 'mean_accepted'] > 0 > summary.loc['rsi', 'mean_rejected']
+
+
+def test_explaining_130k_signals_is_fast():
+    features = get_feature_columns()
+    result = train_signal_classifier(_labeled(2000, seed=1), features)
+    signals = _labeled(130_000, seed=2)
+
+    start = time.perf_counter()
+    contribs = explain_signals(result['model'], result['scaler'], signals, features, approximate=True)
+    assert time.perf_counter() - start < 10
+    assert len(contribs) == 130_000
+
+    # Approximate attributions still add up to the model output
+    expected = result['model'].predict(result['scaler'].transform(signals[features].values[:1000]), output_margin=True)
+    np.testing.assert_allclose(contribs[:1000].sum(axis=1), expected, atol=1e-3)
@@ -0,0 +1,136 @@
+import json
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.ingestion import (
+    HttpKlineSource, KlineStore, IngestionDaemon, find_gaps, timeframe_to_ms
+)
+
+
+INTERVAL = timeframe_to_ms('15m')
+NOW = 1_700_000_000_000 // INTERVAL * INTERVAL
+
+
+class StandInKlines(BaseHTTPRequestHandler):
+    """Binance-style /api/v3/klines serving a deterministic candle for every slot"""
+
+    protocol_version = 'HTTP/1.1'
+    requests = 0
+
+    def do_GET(self):
+        StandInKlines.requests += 1
+        query = {k: v[0] for k, v in parse_qs(urlsplit(self.path).query).items()}
+        start, end, limit = int(query['startTime']), int(query['endTime']), int(query['limit'])
+        interval = timeframe_to_ms(query['interval'])
+        first = -(-start // interval) * interval
+        times = range(first, min(end, first + (limit - 1) * interval) + 1, interval)
+        rows = [[t, str(t / 1e9), str(t / 1e9 + 1), str(t / 1e9 - 1), str(t / 1e9), "10.0", t + interval - 1]
+                for t in times]
+        body = json.dumps(rows).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInKlines)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_find_gaps():
+    """
+    Missing slots are reported as inclusive [first, last] ranges
+    """
+    times = np.array([0, 1, 2, 5, 6, 9], dtype=np.int64) * INTERVAL
+    gaps = find_gaps(times, INTERVAL)
+    assert gaps.tolist() == [[3 * INTERVAL, 4 * INTERVAL], [7 * INTERVAL, 8 * INTERVAL]]
+
+
+def test_daemon_catches_up_and_backfills(tmp_path):
+    """
+    A fresh series is pulled in pages; a hole punched into the store is backfilled
+    """
+    server = _serve()
+    try:
+        source = HttpKlineSource(f"http://127.0.0.1:{server.server_port}", page_limit=100, pool_size=4)
+        store = KlineStore(str(tmp_path))
+        daemon = IngestionDaemon(source, store, ['BTCUSDT', 'ETHUSDT'], ['15m', '1h'], initial_candles=250)
+
+        stats = daemon.sync_once(now_ms=NOW)
+        assert stats['errors'] == {}
+        assert stats['new_candles'] == 4 * 250
+
+        df = store.read('BTCUSDT', '15m')
+        assert len(df) == 250
+        assert df['open_time'].is_monotonic_increasing
+
+        # Drop a slice and restart the daemon: the startup scan must refill it
+        times = store.read_open_times('BTCUSDT', '15m')
+        keep = np.ones(len(times), dtype=bool)
+        keep[100:130] = False
+        for part in store.series_dir('BTCUSDT', '15m').glob('part-*.parquet'):
+            part.unlink()
+        store.append('BTCUSDT', '15m', {
+            'open_time': times[keep], 'open': np.ones(keep.sum()), 'high': np.ones(keep.sum()),
+            'low': np.ones(keep.sum()), 'close': np.ones(keep.sum()), 'volume': np.ones(keep.sum()),
+        })
+        store.flush()
+
+        restarted = IngestionDaemon(source, KlineStore(str(tmp_path)), ['BTCUSDT'], ['15m'])
+        stats = restarted.sync_once(now_ms=NOW + INTERVAL)
+        assert stats['backfilled'] == 30
+        assert stats['new_candles'] == 1
+
+        times = restarted.store.read_open_times('BTCUSDT', '15m')
+        assert len(find_gaps(times, INTERVAL)) == 0
+        assert len(times) == 251
+    finally:
+        server.shutdown()
+
+
+def test_failed_flush_keeps_candles_for_the_next_one(tmp_path, monkeypatch):
+    """
+    A part that cannot be written stays buffered and the daemon does not skip past it
+    """
+    server = _serve()
+    try:
+        source = HttpKlineSource(f"http://127.0.0.1:{server.server_port}", page_limit=100, pool_size=2)
+        store = KlineStore(str(tmp_path))
+        daemon = IngestionDaemon(source, store, ['BTCUSDT'], ['15m'], initial_candles=50)
+
+        import modules.ingestion as ingestion
+        write_table = ingestion.pq.write_table
+
+        def disk_full(*args, **kwargs):
+            raise OSError(28, 'No space left on device')
+
+        monkeypatch.setattr(ingestion.pq, 'write_table', disk_full)
+        stats = daemon.sync_once(now_ms=NOW)
+        assert stats['written'] == 0
+        assert 'No space left' in stats['errors'][('BTCUSDT', '15m')]
+        assert store.last_times[('BTCUSDT', '15m')] is None
+        assert not list(store.series_dir('BTCUSDT', '15m').glob('.part-*'))
+
+        monkeypatch.setattr(ingestion.pq, 'write_table', write_table)
+        stats = daemon.sync_once(now_ms=NOW + INTERVAL)
+        assert stats['errors'] == {}
+        assert stats['written'] == 51
+
+        times = store.read_open_times('BTCUSDT', '15m')
+        assert len(times) == 51 and len(find_gaps(times, INTERVAL)) == 0
+        assert store.last_open_time('BTCUSDT', '15m') == times[-1]
+    finally:
+        server.shutdown()
@@ -0,0 +1,107 @@
+import sys
+import os
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.metrics import MetricsRegistry, CONTENT_TYPE
+
+
+def test_text_format():
+    """
+    Counters, gauges and histograms render in the Prometheus text exposition format
+    """
+    registry = MetricsRegistry()
+    candles = registry.counter('candles_total', 'Candles processed', ['timeframe'])
+    symbols = registry.gauge('symbols_tracked', 'Symbols in memory')
+    latency = registry.histogram('compute_seconds', 'Compute time', ['symbol'], buckets=(0.001, 0.01, 0.1))
+
+    candles.labels('15m').inc(500)
+    candles.labels(timeframe='15m').inc()
+    symbols.set(300)
+    symbols.dec(2)
+    child = latency.labels('BTC"USDT')
+    for value in (0.0005, 0.001, 0.005, 0.05, 3.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert '# TYPE candles_total counter\ncandles_total{timeframe="15m"} 501.0\n' in text
+    assert 'symbols_tracked 298.0' in text
+    assert '# TYPE compute_seconds histogram' in text
+    # Cumulative buckets, value == bound counts in that bucket, quotes escaped
+    assert 'compute_seconds_bucket{symbol="BTC\\"USDT",le="0.001"} 2' in text
+    assert 'compute_seconds_bucket{symbol="BTC\\"USDT",le="0.01"} 3' in text
+    assert 'compute_seconds_bucket{symbol="BTC\\"USDT",le="0.1"} 4' in text
+    assert 'compute_seconds_bucket{symbol="BTC\\"USDT",le="+Inf"} 5' in text
+    assert 'compute_seconds_count{symbol="BTC\\"USDT"} 5' in text
+    assert f'compute_seconds_sum{{symbol="BTC\\"USDT"}} {0.0005 + 0.001 + 0.005 + 0.05 + 3.0!r}' in text
+
+
+def test_registry_validation():
+    registry = MetricsRegistry()
+    counter = registry.counter('events_total', 'Events', ['direction'])
+    assert registry.counter('events_total', 'Events', ['direction']) is counter
+    with pytest.raises(ValueError):
+        registry.gauge('events_total', 'Events', ['direction'])
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.labels('buy').inc(-1)
+    with pytest.raises(ValueError):
+        counter.labels('buy', 'extra')
+
+
+def test_textfile_and_http(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter('bytes_total', 'Bytes read').inc(1024)
+
+    path = tmp_path / 'pipeline.prom'
+    registry.write_textfile(str(path))
+    assert path.read_text() == registry.render()
+
+    server = registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            assert 'bytes_total 1024.0' in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_recording_overhead_is_microseconds():
+    registry = MetricsRegistry()
+    counter = registry.counter('hot_total', 'Hot path', ['symbol']).labels('BTCUSDT')
+    histogram = registry.histogram('hot_seconds', 'Hot path').labels()
+
+    n = 50_000
+    start = time.perf_counter()
+    for _ in range(n):
+        counter.inc()
+        histogram.observe(0.002)
+    per_call = (time.perf_counter() - start) / (2 * n)
+
+    assert counter.value == n
+    assert per_call < 5e-6
+
+
+def test_pipeline_metrics_from_streaming_updates():
+    from modules import metrics
+    from modules.streaming import StreamingIndicator
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    times = np.arange(500, dtype=np.int64) * 900_000
+    before = metrics.CANDLES_PROCESSED.value('metrics-test')
+    indicator = StreamingIndicator(timeframe='metrics-test')
+    out = indicator.update_arrays('BTCUSDT', times, close * 1.01, close * 0.99, close, rng.uniform(100, 1000, 500))
+
+    assert metrics.CANDLES_PROCESSED.value('metrics-test') - before == 500
+    assert 'pipeline_indicator_compute_seconds_count{symbol="BTCUSDT",timeframe="metrics-test"} 1' \
+        in metrics.REGISTRY.render()
+    assert metrics.SIGNALS_EMITTED.value('buy') >= (out['signal'] == 1).sum()
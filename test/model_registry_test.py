@@ -0,0 +1,92 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_classifier.model_registry import ModelRegistry, data_range
+from ml_classifier.model_training import score_signals, train_signal_classifier
+from ml_classifier.explain import explain_signals
+
+FEATURES = ['f0', 'f1', 'f2', 'f3']
+
+
+def _labeled(n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(FEATURES))) * [1, 10, 100, 0.1] + [0, 5, -50, 1], columns=FEATURES)
+    df['label'] = (df['f0'] + df['f1'] / 10 + rng.normal(0, 0.5, n) > 0.5).astype(int)
+    df['open_time'] = pd.date_range('2024-01-01', periods=n, freq='15min')
+    return df
+
+
+def test_register_load_and_predict_match_trained_model(tmp_path):
+    """
+    A loaded version scores exactly like the in-memory model and scaler
+    """
+    df = _labeled()
+    result = train_signal_classifier(df, FEATURES)
+    registry = ModelRegistry(str(tmp_path))
+    version = registry.register(result['model'], result['scaler'], 'BTCUSDT', '15m', FEATURES,
+                                metrics={'accuracy': result['report']['accuracy']},
+                                data_range=data_range(df), settings={'hold_period': 3})
+
+    assert version == 'v0001'
+    assert registry.live_version('BTCUSDT', '15m') == 'v0001'
+    manifest = registry.manifest('BTCUSDT', '15m')
+    assert manifest['feature_columns'] == FEATURES
+    assert manifest['data_range']['start'] == '2024-01-01T00:00:00'
+    assert set(manifest['files']) == {'model.ubj', 'scaler.npy'}
+
+    fresh = ModelRegistry(str(tmp_path))
+    start = time.perf_counter()
+    loaded = fresh.load('BTCUSDT', '15m', verify=True)
+    assert time.perf_counter() - start < 0.1
+    assert fresh.load('BTCUSDT', '15m') is loaded
+
+    expected = result['model'].predict_proba(result['scaler'].transform(df[FEATURES].values))[:, 1]
+    np.testing.assert_allclose(loaded.score(df), expected, rtol=1e-6)
+    # Drop-in for the XGBClassifier / StandardScaler pair in the repo's scoring helper
+    np.testing.assert_allclose(score_signals(loaded, loaded, df, FEATURES), expected, rtol=1e-6)
+    assert loaded.predict_proba(loaded.transform(df[FEATURES].values)).shape == (len(df), 2)
+    np.testing.assert_allclose(loaded.transform(df[FEATURES].values), result['scaler'].transform(df[FEATURES].values))
+    contribs = explain_signals(loaded, loaded, df, FEATURES, approximate=True)
+    np.testing.assert_allclose(1 / (1 + np.exp(-contribs.sum(axis=1))), expected, rtol=1e-4)
+
+
+def test_live_pointer_hot_swap_and_rollback(tmp_path):
+    df = _labeled()
+    writer = ModelRegistry(str(tmp_path))
+    first = train_signal_classifier(df, FEATURES)
+    writer.register(first['model'], first['scaler'], 'BTCUSDT', '15m', FEATURES)
+
+    server = ModelRegistry(str(tmp_path))
+    assert server.live('BTCUSDT', '15m').version == 'v0001'
+
+    second = train_signal_classifier(_labeled(seed=1), FEATURES, random_state=7)
+    assert writer.register(second['model'], second['scaler'], 'BTCUSDT', '15m', FEATURES, set_live=False) == 'v0002'
+    assert server.live('BTCUSDT', '15m').version == 'v0001'
+
+    writer.set_live('BTCUSDT', '15m', 'v0002')
+    assert server.live('BTCUSDT', '15m').version == 'v0002'
+    writer.set_live('BTCUSDT', '15m', 'v0001')
+    assert server.live('BTCUSDT', '15m').version == 'v0001'
+    assert writer.versions('BTCUSDT', '15m') == ['v0001', 'v0002']
+
+    with pytest.raises(KeyError):
+        writer.set_live('BTCUSDT', '15m', 'v0009')
+
+
+def test_verify_detects_tampering(tmp_path):
+    df = _labeled()
+    result = train_signal_classifier(df, FEATURES)
+    registry = ModelRegistry(str(tmp_path))
+    version = registry.register(result['model'], result['scaler'], 'BTCUSDT', '15m', FEATURES)
+
+    scaler_path = registry.series_dir('BTCUSDT', '15m') / version / 'scaler.npy'
+    np.save(scaler_path, np.zeros((2, len(FEATURES))))
+    with pytest.raises(ValueError):
+        ModelRegistry(str(tmp_path)).load('BTCUSDT', '15m', verify=True)
@@ -0,0 +1,50 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.monte_carlo import monte_carlo, resample_metrics, trade_returns
+
+
+def test_trade_returns_follow_signal_direction():
+    df = pd.DataFrame({'close': [100.0, 110, 121, 100, 90, 80], 'signal': [1, 0, -1, 0, 0, 1]})
+    returns = trade_returns(df, hold_period=2)
+    # The last buy has no full holding period
+    np.testing.assert_allclose(returns, [0.21, 1 - 90 / 121])
+
+
+def test_resample_metrics_on_known_sequence():
+    metrics = resample_metrics(np.array([[0.1, -0.5, 0.2, 0.1]]))[0]
+    returns = np.array([0.1, -0.5, 0.2, 0.1])
+    assert np.isclose(metrics[0], returns.mean() / returns.std(ddof=1))
+    assert np.isclose(metrics[1], 0.5)
+    assert np.isclose(metrics[2], 0.4 / 0.5)
+
+
+def test_intervals_are_reproducible_across_pool_sizes():
+    """
+    Seeds are per chunk, so the in-process run equals the pooled run
+    """
+    returns = np.random.default_rng(1).normal(0.001, 0.01, 1000)
+    single = monte_carlo(returns, n_resamples=1200, chunk_size=250, processes=1, seed=7)
+    pooled = monte_carlo(returns, n_resamples=1200, chunk_size=250, processes=2, seed=7)
+
+    assert len(single['samples']) == 1200
+    pd.testing.assert_frame_equal(single['samples'], pooled['samples'])
+    intervals = single['intervals']
+    assert (intervals['lower'] <= intervals['median']).all() and (intervals['median'] <= intervals['upper']).all()
+    assert intervals.loc['sharpe', 'lower'] < single['observed']['sharpe'] < intervals.loc['sharpe', 'upper']
+
+
+def test_shuffle_only_moves_drawdown():
+    returns = np.random.default_rng(2).normal(0, 0.01, 300)
+    result = monte_carlo(returns, n_resamples=200, method='shuffle', processes=1)
+    assert np.allclose(result['samples']['profit_factor'], result['observed']['profit_factor'])
+    assert result['samples']['max_drawdown'].std() > 0
+
+    with pytest.raises(ValueError):
+        monte_carlo(returns, method='jackknife')
@@ -0,0 +1,95 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.portfolio import PortfolioSimulator, align_signals
+
+
+def test_strongest_signal_gets_the_only_slot():
+    """
+    With one slot, the stronger of two same-bar signals is filled, sized by strength
+    """
+    close = np.array([[100.0, 50.0], [110.0, 55.0], [120.0, 60.0], [120.0, 60.0]])
+    signal = np.array([[1, 1], [0, 0], [0, 0], [0, 0]])
+    strength = np.array([[0.4, 0.9], [0, 0], [0, 0], [0, 0]])
+
+    simulator = PortfolioSimulator(initial_cash=1000, max_positions=1, max_position_fraction=0.5,
+                                   fee_rate=0.0, hold_bars=2)
+    result = simulator.run(close, signal, strength, symbols=['AAA', 'BBB'])
+    trades = result['trades']
+
+    assert list(trades['symbol']) == ['BBB']
+    assert trades.loc[0, 'entry_bar'] == 0 and trades.loc[0, 'exit_bar'] == 2
+    # 1000 * 0.5 * 0.9 = 450 notional, +20% move
+    assert np.isclose(trades.loc[0, 'pnl'], 90.0)
+    assert np.isclose(result['equity'].iloc[-1], 1090.0)
+    assert list(result['open_positions']) == [1, 1, 0, 0]
+    assert np.isclose(result['gross_exposure'].iloc[0], 0.45)
+
+
+def test_cash_and_position_limits_hold_on_random_signals():
+    """
+    Equity reconciles with trade P&L, and limits are never exceeded
+    """
+    rng = np.random.default_rng(0)
+    n_bars, n_symbols = 3000, 20
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_bars, n_symbols)), axis=0))
+    close[:500, 5] = np.nan  # listed later
+    signal = rng.choice([-1, 0, 1], size=(n_bars, n_symbols), p=[0.05, 0.9, 0.05])
+    strength = rng.uniform(0, 1, (n_bars, n_symbols))
+
+    simulator = PortfolioSimulator(initial_cash=10000, max_positions=5, max_position_fraction=0.3,
+                                   fee_rate=0.001, hold_bars=0)
+    result = simulator.run(close, signal, strength)
+
+    assert result['open_positions'].max() <= 5
+    assert (result['cash'] >= -1e-6).all()
+    assert not (result['trades']['symbol'] == 5).any() or result['trades'].loc[
+        result['trades']['symbol'] == 5, 'entry_bar'].min() >= 500
+    assert np.isclose(result['equity'].iloc[-1], 10000 + result['trades']['pnl'].sum())
+    assert result['open_positions'].iloc[-1] == 0
+
+    long_only = PortfolioSimulator(allow_short=False, hold_bars=0).run(close, signal, strength)
+    assert (long_only['trades']['direction'] == 1).all()
+    assert (long_only['net_exposure'].dropna() >= 0).all()
+
+
+def test_align_signals_builds_shared_grid():
+    times = pd.date_range('2024-01-01', periods=4, freq='15min')
+    frames = {
+        'BTCUSDT': pd.DataFrame({'open_time': times, 'close': [1.0, 2, 3, 4], 'signal': [0, 1, 0, 0],
+                                 'signal_strength': [0.0, 0.5, 0, 0]}),
+        'ETHUSDT': pd.DataFrame({'open_time': times[2:], 'close': [5.0, 6], 'signal': [-1, 0],
+                                 'signal_strength': [np.nan, 0.2]}),
+    }
+    grid = align_signals(frames)
+
+    assert grid['close'].shape == (4, 2)
+    assert np.isnan(grid['close'][:2, 1]).all()
+    assert grid['signal'][2, 1] == -1 and grid['strength'][2, 1] == 0.0
+
+
+def test_missing_closes_delay_exits_and_last_bar_closes_at_last_price():
+    """
+    Expiry on a bar without a candle exits at the next price; a trailing NaN close
+    still closes the position at its last known price
+    """
+    nan = np.nan
+    close = np.array([[100.0, 50.0], [nan, 55.0], [nan, 60.0], [110.0, 60.0], [120.0, nan], [130.0, nan]])
+    signal = np.array([[1, 0], [0, 0], [0, 0], [0, 1], [0, 0], [0, 0]])
+    strength = np.array([[1.0, 0], [0, 0], [0, 0], [0, 1.0], [0, 0], [0, 0]])
+
+    simulator = PortfolioSimulator(initial_cash=1000, max_positions=2, max_position_fraction=0.5,
+                                   fee_rate=0.0, hold_bars=1)
+    result = simulator.run(close, signal, strength, symbols=['AAA', 'BBB'])
+    trades = result['trades'].set_index('symbol')
+
+    assert trades.loc['AAA', 'exit_bar'] == 3 and trades.loc['AAA', 'exit_price'] == 110.0
+    # BBB's hold expires on bar 4 without a candle; the final bar closes it at 60
+    assert trades.loc['BBB', 'exit_bar'] == 5 and trades.loc['BBB', 'exit_price'] == 60.0
+    assert result['open_positions'].iloc[-1] == 0
+    assert np.isclose(result['equity'].iloc[-1], result['cash'].iloc[-1])
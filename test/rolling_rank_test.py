@@ -0,0 +1,70 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.indicators import CompositeIndicator
+from modules.rolling_rank import (RANK_FEATURES, StreamingRank, add_rank_features,
+                                  rolling_quantile, rolling_rank)
+from ml_classifier.feature_engineering import RANK_FEATURE_COLUMNS, get_feature_columns
+
+
+def _series(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.lognormal(0, 1, n), 1)  # rounding creates ties
+    values[rng.integers(0, n, n // 50)] = np.nan
+    return values
+
+
+def test_rank_and_quantile_match_pandas():
+    values = _series(5000)
+    series = pd.Series(values)
+    for window, min_periods in [(50, None), (300, 200)]:
+        rolling = series.rolling(window, min_periods=min_periods)
+        np.testing.assert_allclose(rolling_rank(values, window, min_periods), rolling.rank(pct=True),
+                                   rtol=1e-12, equal_nan=True)
+        for q in [0.0, 0.1, 0.5, 0.9, 1.0]:
+            np.testing.assert_allclose(rolling_quantile(values, window, q, min_periods), rolling.quantile(q),
+                                       rtol=1e-12, equal_nan=True)
+
+
+def test_streaming_matches_batch():
+    values = _series(2000, seed=1)
+    streaming = StreamingRank(100)
+    ranks, medians = [], []
+    for value in values:
+        ranks.append(streaming.update(value))
+        medians.append(streaming.quantile(0.5))
+
+    np.testing.assert_allclose(ranks, rolling_rank(values, 100), equal_nan=True)
+    np.testing.assert_allclose(medians, rolling_quantile(values, 100, 0.5), equal_nan=True)
+
+
+def test_rank_features_are_opt_in():
+    rng = np.random.default_rng(2)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 3000)))
+    df = CompositeIndicator().calculate(pd.DataFrame({
+        'open': close, 'high': close * 1.005, 'low': close * 0.995, 'close': close,
+        'volume': rng.lognormal(3, 1, 3000),
+    }))
+    result = add_rank_features(df, window=500)
+
+    assert list(RANK_FEATURES) == RANK_FEATURE_COLUMNS
+    assert get_feature_columns()[-1] == 'roc'
+    assert get_feature_columns(include_rank_features=True)[-len(RANK_FEATURE_COLUMNS):] == RANK_FEATURE_COLUMNS
+    valid = result['volume_rank'].dropna()
+    assert len(valid) == 3000 - 499 and valid.between(0, 1).all()
+
+
+def test_large_window_is_fast():
+    values = np.random.default_rng(3).normal(size=1_000_000)
+    rolling_rank(values[:1000], 500)  # compile
+
+    start = time.perf_counter()
+    rolling_rank(values, 500)
+    rolling_quantile(values, 500, 0.9)
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,88 @@
+import sys
+import os
+import pickle
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ml_classifier import get_feature_columns, label_signals, prepare_signal_data
+from ml_classifier.sequence_dataset import SequenceDataset, build_sequence_dataset, write_feature_array
+
+
+def _frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(get_feature_columns()))), columns=get_feature_columns())
+    df['signal'] = rng.choice([-1, 0, 0, 0, 1], size=n)
+    return df
+
+
+def test_samples_are_windows_ending_at_signals(tmp_path):
+    """
+    Each sample is the window of feature rows up to and including its signal
+    """
+    df = _frame(500)
+    dataset = build_sequence_dataset(df, str(tmp_path / 'features.npy'), window=16)
+    signal_rows = np.flatnonzero(df['signal'])
+
+    assert len(dataset) + dataset.dropped == len(signal_rows)
+    features = df[get_feature_columns()].to_numpy(dtype=np.float32)
+    for position in [0, len(dataset) // 2, len(dataset) - 1]:
+        row = dataset.indices[position]
+        np.testing.assert_array_equal(dataset[position], features[row - 15:row + 1])
+
+    batch = dataset.__getitems__([0, 1, 2])
+    assert batch.shape == (3, 16, len(get_feature_columns()))
+
+    # Workers receive the dataset without its mapping and reopen it
+    clone = pickle.loads(pickle.dumps(dataset))
+    assert clone._windows is None
+    np.testing.assert_array_equal(clone.sample(3), dataset.sample(3))
+
+
+def test_building_130k_windows_allocates_almost_nothing(tmp_path):
+    """
+    130k signals with a 64-bar window are views, not a 130k x 64 x features copy
+    """
+    n = 200_000
+    path = str(tmp_path / 'features.npy')
+    write_feature_array(_frame(n, seed=1), path)
+    indices = np.sort(np.random.default_rng(2).choice(np.arange(63, n), 130_000, replace=False))
+
+    tracemalloc.start()
+    dataset = SequenceDataset(path, indices, labels=np.ones(len(indices)), window=64)
+    assert dataset.shape == (130_000, 64, len(get_feature_columns()))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert peak < 10e6
+
+
+def test_labels_from_label_signals_are_aligned(tmp_path):
+    df = _frame(500)
+    df['close'] = np.linspace(100, 120, len(df))
+    labeled = label_signals(prepare_signal_data(df), hold_period=3)
+    assert len(labeled) == int((df['signal'] != 0).sum()) - 3
+
+    dataset = build_sequence_dataset(df, str(tmp_path / 'features.npy'), window=16, labels=labeled['label'])
+    expected = labeled['label'][labeled.index >= 15].to_numpy()
+    np.testing.assert_array_equal(dataset.labels, expected)
+    assert list(dataset.indices) == [row for row in labeled.index if row >= 15]
+
+    with pytest.raises(ValueError):
+        build_sequence_dataset(df, str(tmp_path / 'other.npy'), labels=labeled['label'].to_numpy())
+
+
+def test_dataloader_batches(tmp_path):
+    torch = pytest.importorskip('torch')
+    from ml_classifier.sequence_dataset import make_dataloader
+
+    df = _frame(400)
+    dataset = build_sequence_dataset(df, str(tmp_path / 'features.npy'), window=8,
+                                     labels=np.arange(int((df['signal'] != 0).sum())))
+    x, y = next(iter(make_dataloader(dataset, batch_size=32, shuffle=False)))
+    assert x.dtype == torch.float32 and tuple(x.shape) == (32, 8, len(get_feature_columns()))
+    assert len(y) == 32
@@ -0,0 +1,85 @@
+import sys
+import os
+import signal
+import subprocess
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.indicators import CompositeIndicator
+from modules.shared_data import SharedKlineStore, attach, frame_from_handle, map_shared, signal_summary
+from test.synthetic import random_klines
+
+
+def test_frame_is_a_zero_copy_view():
+    """
+    Price columns of the rebuilt frame live in the shared segment
+    """
+    with SharedKlineStore() as store:
+        df = random_klines(500, 1)
+        handle = store.add('BTCUSDT', df)
+
+        view = frame_from_handle(handle)
+        assert np.shares_memory(view['close'].to_numpy(), attach(handle)['close'])
+        pd.testing.assert_frame_equal(view, df, check_dtype=False)
+
+
+def test_workers_compute_from_shared_memory():
+    """
+    Pool workers receive only handles and reproduce the in-process results
+    """
+    frames = {f"S{i}USDT": random_klines(300, i) for i in range(4)}
+    with SharedKlineStore() as store:
+        handles = [store.add(symbol, df) for symbol, df in frames.items()]
+        summaries = map_shared(signal_summary, handles, processes=2)
+        names = [handle.name for handle in handles]
+
+    for summary in summaries:
+        expected = CompositeIndicator().calculate(frames[summary['symbol']])
+        assert summary['buy_signals'] == (expected['signal'] == 1).sum()
+        assert summary['sell_signals'] == (expected['signal'] == -1).sum()
+        assert summary['last_strength'] == expected['signal_strength'].iloc[-1]
+
+    # Segments are gone once the store is closed
+    for name in names:
+        assert not os.path.exists(f"/dev/shm/{name.lstrip('/')}")
+
+
+OWNER_SCRIPT = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+import numpy as np, pandas as pd
+from modules.shared_data import SharedKlineStore, map_shared, signal_summary
+
+close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 300))
+df = pd.DataFrame({'open_time': pd.date_range('2024-01-01', periods=300, freq='15min'),
+                   'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 10.0})
+store = SharedKlineStore()
+handle = store.add('BTCUSDT', df)
+map_shared(signal_summary, [handle], processes=1)
+print(handle.name, flush=True)
+time.sleep(60)
+"""
+
+
+def test_killed_owner_segment_is_cleaned_up_after_workers_attached():
+    """
+    Workers mapping a segment must not take it off the owner's resource tracker
+    """
+    root = os.path.join(os.path.dirname(__file__), '..')
+    owner = subprocess.Popen([sys.executable, '-c', OWNER_SCRIPT, root], stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, text=True)
+    try:
+        path = f"/dev/shm/{owner.stdout.readline().strip().lstrip('/')}"
+        assert os.path.exists(path)
+    finally:
+        owner.send_signal(signal.SIGKILL)
+        owner.wait()
+
+    deadline = time.monotonic() + 10
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(path)
@@ -0,0 +1,114 @@
+import sys
+import os
+import http.client
+import json
+
+import numpy as np
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.fused_kernel import calculate_fused
+from modules.ingestion import KlineStore
+from modules.signal_api import SignalCache, SignalRefresher, serve_signals
+from test.synthetic import random_klines
+
+
+def _get(port: int, path: str, headers: dict = None):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    connection.request('GET', path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_versions_and_deltas():
+    """
+    Only appended or revised bars get the new version; identical data does not bump it
+    """
+    df = calculate_fused(random_klines(300, volume=(100, 1000)))
+    cache = SignalCache(max_bars=200)
+    assert cache.publish('BTCUSDT', '15m', df.iloc[:250]) == 1
+    assert cache.publish('BTCUSDT', '15m', df.iloc[240:250]) == 1
+
+    revised = df.iloc[248:253].copy()
+    revised.loc[revised.index[0], 'close'] += 1.0
+    assert cache.publish('BTCUSDT', '15m', revised) == 2
+
+    snapshot = cache.get('BTCUSDT', '15m')
+    assert len(snapshot.open_time) == 200
+    delta = json.loads(snapshot.body(since=1))
+    assert len(delta['bars']['open_time']) == 4  # one revised, three appended
+    assert delta['bars']['close'][0] == df['close'].iloc[248] + 1.0
+    assert delta['first_open_time'] == snapshot.open_time[0]
+
+    full = json.loads(snapshot.body())
+    assert full['bars']['signal'] == df['signal'].iloc[53:253].tolist()
+    assert snapshot.body(since=1) is snapshot.body(since=1)
+
+
+def test_http_etag_since_and_arrow():
+    df = calculate_fused(random_klines(300, volume=(100, 1000)))
+    cache = SignalCache()
+    cache.publish('BTCUSDT', '15m', df.iloc[:299])
+    server = serve_signals(cache, port=0)
+    port = server.server_address[1]
+    try:
+        response, body = _get(port, '/signals/BTCUSDT/15m')
+        assert response.status == 200
+        etag = response.getheader('ETag')
+        assert json.loads(body)['version'] == 1
+
+        response, body = _get(port, '/signals/BTCUSDT/15m', {'If-None-Match': etag})
+        assert response.status == 304 and body == b''
+
+        cache.publish('BTCUSDT', '15m', df.iloc[299:])
+        response, body = _get(port, '/signals/BTCUSDT/15m?since=1', {'If-None-Match': etag})
+        assert response.status == 200
+        assert response.getheader('X-Signal-Version') == '2'
+        assert json.loads(body)['bars']['open_time'] == [int(df['open_time'].iloc[-1].value // 10**6)]
+
+        # The JSON validator does not match the Arrow representation
+        json_etag = _get(port, '/signals/BTCUSDT/15m')[0].getheader('ETag')
+        response, body = _get(port, '/signals/BTCUSDT/15m?format=arrow', {'If-None-Match': json_etag})
+        assert response.status == 200
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.num_rows == 300
+        arrow_etag = response.getheader('ETag')
+        assert arrow_etag != json_etag
+        assert _get(port, '/signals/BTCUSDT/15m?format=arrow', {'If-None-Match': arrow_etag})[0].status == 304
+        np.testing.assert_array_equal(table.column('rsi').to_numpy(), df['rsi'].to_numpy())
+
+        response, body = _get(port, '/signals')
+        assert json.loads(body)[0]['signal'] == int(df['signal'].iloc[-1])
+
+        assert _get(port, '/signals/ETHUSDT/15m')[0].status == 404
+        assert _get(port, '/signals/BTCUSDT/15m?format=xml')[0].status == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_refresher_publishes_new_candles(tmp_path):
+    df = random_klines(400, volume=(100, 1000))
+    arrays = {name: df[name].to_numpy() for name in ['open', 'high', 'low', 'close', 'volume']}
+    arrays['open_time'] = df['open_time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+    store = KlineStore(str(tmp_path / 'live'))
+    store.append('BTCUSDT', '15m', {name: values[:390] for name, values in arrays.items()})
+    store.flush()
+
+    cache = SignalCache(max_bars=100)
+    refresher = SignalRefresher(cache, store, ['BTCUSDT'], ['15m'])
+    assert refresher.refresh() == 390
+    assert refresher.refresh() == 0
+
+    store.append('BTCUSDT', '15m', {name: values[390:] for name, values in arrays.items()})
+    store.flush()
+    assert refresher.refresh() == 10
+
+    snapshot = cache.get('BTCUSDT', '15m')
+    assert snapshot.version == 2
+    expected = calculate_fused(df).iloc[-100:]
+    np.testing.assert_array_equal(snapshot.values[:, snapshot.columns.index('macd')], expected['macd'].to_numpy())
+    assert len(json.loads(snapshot.body(since=1))['bars']['open_time']) == 10
@@ -0,0 +1,64 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.indicators import CompositeIndicator
+from ml_classifier import prepare_signal_data, label_signals, get_feature_columns
+from ml_classifier.signal_events import SignalEventLog, extract_events, events_to_frame
+
+
+def _signals(n: int = 3000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'open_time': pd.date_range('2024-01-01', periods=n, freq='15min'),
+        'open': close, 'high': close * 1.004, 'low': close * 0.996, 'close': close,
+        'volume': rng.lognormal(3, 1, n),
+    })
+    return CompositeIndicator().calculate(df)
+
+
+def test_events_match_dense_signal_rows():
+    """
+    Events hold exactly the non-zero signal rows, and label the same way
+    """
+    df = _signals()
+    events = extract_events(df)
+    dense = prepare_signal_data(df)
+
+    np.testing.assert_array_equal(events['index'], np.flatnonzero(df['signal']))
+    np.testing.assert_array_equal(events['direction'], dense['signal'])
+    assert events['direction'].dtype == np.int8 and events['strength'].dtype == np.float32
+
+    frame = events_to_frame(events)
+    np.testing.assert_allclose(frame[get_feature_columns()], dense[get_feature_columns()], rtol=1e-6)
+    np.testing.assert_array_equal(label_signals(frame)['label'], label_signals(dense)['label'])
+
+
+def test_log_appends_and_memory_maps(tmp_path):
+    """
+    The log appends only newer events, survives a torn write and reads back via memmap
+    """
+    df = _signals(seed=1)
+    path = str(tmp_path / 'BTCUSDT_15m.events')
+    log = SignalEventLog(path, symbol='BTCUSDT', timeframe='15m')
+
+    first = log.append(extract_events(df.iloc[:2000]))
+    second = log.append(extract_events(df, index_offset=0))
+    assert first + second == int((df['signal'] != 0).sum())
+
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02\x03')  # interrupted append
+
+    reopened = SignalEventLog(path)
+    events = reopened.read()
+    assert isinstance(events, np.memmap)
+    assert reopened.header['symbol'] == 'BTCUSDT'
+    expected = extract_events(df)
+    for name in expected.dtype.names:
+        np.testing.assert_array_equal(events[name], expected[name])
+    assert reopened.append(extract_events(df)) == 0
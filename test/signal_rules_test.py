@@ -0,0 +1,72 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.indicators import CompositeIndicator
+from modules.signal_rules import DEFAULT_RULES, RuleSyntaxError, compile_rules, screen_rules
+from test.synthetic import random_klines
+
+
+def _klines(seed: int = 0) -> pd.DataFrame:
+    return random_klines(3000, seed, spread=0.004, lognormal_volume=True, open_time=False)
+
+
+def test_default_rules_reproduce_generate_signal():
+    """
+    DEFAULT_RULES give exactly the built-in signal column
+    """
+    df = _klines()
+    expected = CompositeIndicator().calculate(df)
+    result = CompositeIndicator(rules=DEFAULT_RULES).calculate(df)
+
+    pd.testing.assert_series_equal(result['signal'], expected['signal'])
+    assert (expected['signal'] != 0).any()
+
+
+def test_rule_sets_share_subexpressions():
+    """
+    Several rule sets compile into one program with shared nodes and lag buffers
+    """
+    df = CompositeIndicator().calculate(_klines(seed=1))
+    variant = {
+        'derived': dict(DEFAULT_RULES['derived']),
+        'buy': [['composite[1] > 0.3', 'momentum_score[1] > 0.1'], ['rsi[1] < 35', 'rsi[1] > 20']],
+        'sell': [['rsi[1] > 65', 'rsi[1] < 80']],
+    }
+    compiled = compile_rules({'default': DEFAULT_RULES, 'variant': variant})
+    alone = compile_rules(DEFAULT_RULES)
+
+    # The variant only adds the 'composite > 0.3' comparison and its groups
+    assert len(compiled.program) < 2 * len(alone.program)
+    assert len([key for key, kind, _ in compiled.program if kind == 'linear']) == 1
+
+    signals = compiled.evaluate(df)
+    np.testing.assert_array_equal(signals['default'], df['signal'].to_numpy())
+
+    screened = screen_rules(df, {'default': DEFAULT_RULES, 'variant': variant})
+    assert list(screened.index) == ['default', 'variant']
+    assert screened.loc['default', 'buy_signals'] == int((df['signal'] == 1).sum())
+
+
+def test_indicator_rejects_several_rule_sets():
+    rsi_only = {'buy': [['rsi[1] < 30']], 'sell': [['rsi[1] > 70']]}
+    with pytest.raises(ValueError, match='one rule set'):
+        CompositeIndicator(rules={'default': DEFAULT_RULES, 'rsi_only': rsi_only})
+    # A single named set is fine
+    CompositeIndicator(rules={'default': DEFAULT_RULES})
+
+
+def test_crossover_and_syntax_errors():
+    data = {'x': np.array([-1.0, 1.0, 2.0, -1.0, 3.0])}
+    signals = compile_rules({'buy': [['x crosses_above 0']], 'sell': [['x crosses_below 0']]}).evaluate(data)
+    np.testing.assert_array_equal(signals['signal'], [0, 1, 0, -1, 1])
+
+    with pytest.raises(RuleSyntaxError):
+        compile_rules({'buy': [['x >> 0']]})
+    with pytest.raises(RuleSyntaxError):
+        compile_rules({'buy': [['x[a] > 0']]})
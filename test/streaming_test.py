@@ -0,0 +1,115 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.fused_kernel import calculate_fused
+from modules.indicators import OUTPUT_COLUMNS
+from modules.ingestion import KlineStore
+from modules.streaming import Checkpointer, StreamingIndicator, restore_or_create, store_loader
+from test.synthetic import random_klines
+
+
+def test_restore_and_catch_up_matches_full_run(tmp_path):
+    """A snapshot plus the newer candles gives exactly the uninterrupted outputs"""
+    frames = {f'SYM{i}USDT': random_klines(600, seed=i, jitter=True, volume=(100, 1000)) for i in range(4)}
+    indicator = StreamingIndicator(timeframe='15m')
+    for symbol, df in frames.items():
+        indicator.update(symbol, df.iloc[:450])
+
+    path = str(tmp_path / 'state.bin')
+    indicator.snapshot(path)
+    restored = StreamingIndicator.restore(path)
+    assert restored.symbols == list(frames)
+    assert restored.timeframe == '15m'
+
+    for symbol, df in frames.items():
+        assert restored.latest(symbol) == indicator.latest(symbol)
+        # Overlapping rows are skipped, only the 150 new candles are replayed
+        new = restored.update(symbol, df.iloc[400:])
+        assert len(new) == 150
+
+        expected = calculate_fused(df).iloc[450:]
+        for name in OUTPUT_COLUMNS:
+            np.testing.assert_array_equal(new[name].to_numpy(), expected[name].to_numpy())
+
+
+def test_snapshot_is_atomic_and_rejects_other_files(tmp_path):
+    indicator = StreamingIndicator()
+    indicator.update('BTCUSDT', random_klines(100, jitter=True, volume=(100, 1000)))
+    path = tmp_path / 'state.bin'
+    size = indicator.snapshot(str(path))
+
+    assert path.stat().st_size == size
+    assert not (tmp_path / 'state.bin.tmp').exists()
+
+    # A torn write of the next snapshot never touches the current file
+    (tmp_path / 'state.bin.tmp').write_bytes(b'garbage')
+    restored = StreamingIndicator.restore(str(path))
+    assert restored.last_open_time('BTCUSDT') == indicator.last_open_time('BTCUSDT')
+
+    path.write_bytes(b'not a snapshot')
+    with pytest.raises(ValueError):
+        StreamingIndicator.restore(str(path))
+
+
+def test_checkpointer_interval_and_shutdown(tmp_path):
+    path = tmp_path / 'state.bin'
+    indicator = StreamingIndicator()
+    with Checkpointer(indicator, str(path), interval=60) as checkpointer:
+        indicator.update('BTCUSDT', random_klines(50, jitter=True, volume=(100, 1000)))
+        assert not checkpointer.maybe_checkpoint()
+        assert checkpointer.maybe_checkpoint(now=checkpointer.last_checkpoint + 61)
+        indicator.update('BTCUSDT', random_klines(60, jitter=True, volume=(100, 1000)))
+        assert StreamingIndicator.restore(str(path)).last_open_time('BTCUSDT') < indicator.last_open_time('BTCUSDT')
+
+    # Exiting the block writes the final state
+    assert StreamingIndicator.restore(str(path)).last_open_time('BTCUSDT') == indicator.last_open_time('BTCUSDT')
+
+
+def test_restore_from_kline_store(tmp_path):
+    df = random_klines(300, jitter=True, volume=(100, 1000))
+    store = KlineStore(str(tmp_path / 'live'))
+    arrays = {name: df[name].to_numpy() for name in ['open', 'high', 'low', 'close', 'volume']}
+    arrays['open_time'] = df['open_time'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+    store.append('BTCUSDT', '15m', {name: values[:200] for name, values in arrays.items()})
+    store.flush()
+
+    path = str(tmp_path / 'state.bin')
+    indicator = restore_or_create(path, store_loader(store, '15m'), ['BTCUSDT'], timeframe='15m')
+    indicator.snapshot(path)
+
+    store.append('BTCUSDT', '15m', {name: values[200:] for name, values in arrays.items()})
+    store.flush()
+    restored = restore_or_create(path, store_loader(store, '15m'), ['BTCUSDT'], timeframe='15m')
+
+    expected = calculate_fused(df)
+    assert restored.last_open_time('BTCUSDT') == arrays['open_time'][-1]
+    assert restored.latest('BTCUSDT')['rsi'] == expected['rsi'].iloc[-1]
+    assert restored.latest('BTCUSDT')['signal'] == expected['signal'].iloc[-1]
+
+    with pytest.raises(ValueError, match='timeframe 15m, not 1h'):
+        restore_or_create(path, store_loader(store, '1h'), ['BTCUSDT'], timeframe='1h')
+    with pytest.raises(ValueError, match='lookback 20, not 14'):
+        restore_or_create(path, store_loader(store, '15m'), ['BTCUSDT'], lookback=14, timeframe='15m')
+
+
+def test_300_symbol_restart_is_fast(tmp_path):
+    frames = {f'SYM{i}USDT': random_klines(1000, seed=i, jitter=True, volume=(100, 1000)) for i in range(300)}
+    indicator = StreamingIndicator()
+    for symbol, df in frames.items():
+        indicator.update(symbol, df.iloc[:996])
+    path = str(tmp_path / 'state.bin')
+    indicator.snapshot(path)
+
+    start = time.perf_counter()
+    restored = StreamingIndicator.restore(path)
+    replayed = restored.catch_up(lambda symbol, after: frames[symbol].iloc[-8:])
+    elapsed = time.perf_counter() - start
+
+    assert set(replayed.values()) == {4}
+    assert elapsed < 1.0
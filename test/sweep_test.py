@@ -0,0 +1,153 @@
+import sys
+import os
+import json
+import socket
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.sweep import (
+    SweepCoordinator, WorkerClient, evaluate_indicator, make_tasks, parameter_grid, run_local_sweep, run_task,
+    run_worker, _synthetic_loader
+)
+
+
+def small_loader(symbol: str, timeframe: str) -> pd.DataFrame:
+    return _synthetic_loader(symbol, timeframe, n=3000)
+
+
+GRID = {'lookback': [10, 20, 30], 'hold_period': [1, 3]}
+
+
+def test_grid_and_tasks():
+    combos = parameter_grid(GRID)
+    assert len(combos) == 6
+    assert combos[0] == {'lookback': 10, 'hold_period': 1}
+
+    tasks = make_tasks(['BTCUSDT', 'ETHUSDT'], ['15m'], GRID, chunk_size=4)
+    assert [len(t['params']) for t in tasks] == [4, 2, 4, 2]
+    assert [t['task_id'] for t in tasks] == [0, 1, 2, 3]
+
+
+def test_task_cache_keeps_only_the_current_series():
+    loads = []
+
+    def loader(symbol, timeframe):
+        loads.append(symbol)
+        return small_loader(symbol, timeframe)
+
+    cache = {}
+    for task in make_tasks(['BTCUSDT', 'ETHUSDT'], ['15m'], GRID, chunk_size=4):
+        run_task(task, loader, cache=cache)
+        assert list(cache) == [(task['symbol'], '15m')]
+    assert loads == ['BTCUSDT', 'ETHUSDT']
+
+
+def test_local_sweep_writes_every_result_once(tmp_path):
+    """
+    Two worker processes cover the grid; the Parquet file has one row per parameter set
+    """
+    tasks = make_tasks(['BTCUSDT', 'ETHUSDT'], ['15m'], GRID, chunk_size=2)
+    output = str(tmp_path / 'results.parquet')
+    summary = run_local_sweep(tasks, output, workers=2, loader=small_loader)
+
+    assert summary['done'] == len(tasks) and not summary['failed']
+    results = pq.read_table(output).to_pandas()
+    assert len(results) == 12
+    assert not results.duplicated(['task_id', 'item']).any()
+    assert results['worker'].str.startswith('local-').all()
+
+    row = results[(results['symbol'] == 'ETHUSDT') & (results['lookback'] == 20) & (results['hold_period'] == 3)]
+    expected = evaluate_indicator(small_loader('ETHUSDT', '15m'), {'lookback': 20, 'hold_period': 3})
+    assert row['trades'].iloc[0] == expected['trades']
+    assert row['mean_return'].iloc[0] == expected['mean_return']
+    assert json.loads(row['params'].iloc[0]) == {'lookback': 20, 'hold_period': 3}
+
+
+def test_mixed_int_float_grid_across_row_groups(tmp_path):
+    """
+    A grid column that mixes ints and floats is written as float64 in every row group
+    """
+    grid = {'volume_threshold': [1, 1.5], 'lookback': [10, 20]}
+    tasks = make_tasks(['BTCUSDT'], ['15m'], grid, chunk_size=1)
+    output = str(tmp_path / 'results.parquet')
+    summary = run_local_sweep(tasks, output, workers=1, loader=small_loader, flush_rows=1)
+
+    assert summary['done'] == 4 and summary['rows'] == 4
+    assert summary['flush_error'] is None and summary['unwritten'] is None
+    table = pq.read_table(output)
+    assert str(table.schema.field('volume_threshold').type) == 'double'
+    assert str(table.schema.field('lookback').type) == 'int64'
+    assert sorted(table.column('volume_threshold').to_pylist()) == [1.0, 1.0, 1.5, 1.5]
+
+
+def test_flush_failure_keeps_done_rows(tmp_path):
+    output = str(tmp_path / 'results.parquet')
+    tasks = make_tasks(['BTCUSDT'], ['15m'], GRID, chunk_size=3)
+    coordinator = SweepCoordinator(tasks, output, flush_rows=1).start()
+
+    lease = coordinator.handle({'op': 'lease', 'worker': 'w'})['lease']
+    assert coordinator.handle({'op': 'result', 'lease': lease, 'rows': [{'task_id': 0, 'trades': 1.5}]})['ok']
+    lease = coordinator.handle({'op': 'lease', 'worker': 'w'})['lease']
+    assert coordinator.handle({'op': 'result', 'lease': lease, 'rows': [{'task_id': 1, 'trades': 'n/a'}]})['ok']
+
+    summary = coordinator.close()
+    assert summary['done'] == 2 and summary['rows'] == 1
+    assert summary['flush_error'].startswith('ArrowInvalid')
+    with open(summary['unwritten']) as f:
+        assert [json.loads(line) for line in f] == [{'task_id': 1, 'trades': 'n/a'}]
+    assert pq.read_table(output).num_rows == 1
+
+
+def test_lost_lease_is_retried(tmp_path):
+    """
+    A lease without heartbeats expires and a dropped connection releases its lease at once
+    """
+    tasks = make_tasks(['BTCUSDT'], ['15m'], GRID, chunk_size=2)
+    output = str(tmp_path / 'results.parquet')
+    coordinator = SweepCoordinator(tasks, output, lease_timeout=0.5).start()
+    host, port = coordinator.address
+
+    # A hung worker: leases a task, keeps the connection open, never heartbeats
+    hung = WorkerClient(host, port)
+    stuck = hung.request({'op': 'lease', 'worker': 'hung'})
+    # A crashed worker: leases a task and its connection drops
+    crashed = socket.create_connection((host, port))
+    crashed.sendall(json.dumps({'op': 'lease', 'worker': 'crashed'}).encode() + b'\n')
+    crashed.recv(65536)
+    crashed.close()
+
+    time.sleep(0.1)
+    completed = run_worker(host, port, 'healthy', loader=small_loader)
+
+    # The hung worker's late result is dropped
+    late = {'op': 'result', 'lease': stuck['lease'], 'task_id': stuck['task']['task_id'], 'rows': [{'task_id': -1}]}
+    assert hung.request(late) == {'ok': False}
+    hung.close()
+
+    summary = coordinator.wait(timeout=10)
+    assert completed == len(tasks)
+    assert summary['retries'] == 2 and not summary['failed']
+    results = pq.read_table(output).to_pandas()
+    assert len(results) == 6 and set(results['worker']) == {'healthy'}
+
+
+def test_failing_task_gives_up_after_max_attempts(tmp_path):
+    tasks = make_tasks(['BTCUSDT'], ['15m'], {'lookback': [10]}, chunk_size=1)
+    coordinator = SweepCoordinator(tasks, str(tmp_path / 'results.parquet'), max_attempts=2)
+    for _ in range(2):
+        lease = coordinator.handle({'op': 'lease', 'worker': 'w'})['lease']
+        coordinator.handle({'op': 'fail', 'lease': lease, 'error': 'boom'})
+
+    assert coordinator.handle({'op': 'lease', 'worker': 'w'}) == {'done': True}
+    assert coordinator.failed == {0: 'boom'}
+
+
+def test_classifier_task():
+    tasks = make_tasks(['BTCUSDT'], ['15m'], {'max_depth': [2], 'n_estimators': [20]}, kind='classifier')
+    rows = run_task(tasks[0], lambda symbol, timeframe: _synthetic_loader(symbol, timeframe, n=20_000))
+    assert rows[0]['samples'] > 100
+    assert 0 <= rows[0]['accuracy'] <= 1
@@ -0,0 +1,38 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def random_klines(n: int, seed: int = 0, spread: float = 0.01, jitter: bool = False,
+                  volume: Tuple[float, float] = (1.0, 100.0), lognormal_volume: bool = False,
+                  symbol: Optional[str] = None, open_time: bool = True) -> pd.DataFrame:
+    """
+    Random-walk 15m klines for tests
+
+    Args:
+        n: Candles
+        seed: RNG seed
+        spread: high / low distance from close as a fraction
+        jitter: Draw each candle's high / low distance uniformly from [0, spread)
+        volume: Uniform volume range
+        lognormal_volume: Draw volume from lognormal(3, 1) instead
+        symbol: Add a leading symbol column
+        open_time: Include the open_time column
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    if jitter:
+        high = close * (1 + rng.uniform(0, spread, n))
+        low = close * (1 - rng.uniform(0, spread, n))
+    else:
+        high, low = close * (1 + spread), close * (1 - spread)
+    volume = rng.lognormal(3, 1, n) if lognormal_volume else rng.uniform(volume[0], volume[1], n)
+
+    columns = {}
+    if symbol is not None:
+        columns['symbol'] = symbol
+    if open_time:
+        columns['open_time'] = pd.date_range('2024-01-01', periods=n, freq='15min')
+    columns.update({'open': close, 'high': high, 'low': low, 'close': close, 'volume': volume})
+    return pd.DataFrame(columns)
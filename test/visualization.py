@@ -3,12 +3,281 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.dates import DateFormatter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from multiprocessing import Pool
+import argparse
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from index import calculate_signals
+from index import calculate_signals, load_klines
+from modules.indicators import CompositeIndicator
+from modules.jit import njit
+
+
+@njit(cache=True)
+def _lttb_kernel(y, n_out):
+    n = y.shape[0]
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Average of the next bucket (the last point for the final bucket)
+        avg_x = 0.0
+        avg_y = 0.0
+        count = 0
+        for j in range(end, next_end):
+            if y[j] == y[j]:
+                avg_x += j
+                avg_y += y[j]
+                count += 1
+        if count == 0:
+            avg_x, avg_y = n - 1.0, y[n - 1]
+        else:
+            avg_x /= count
+            avg_y /= count
+
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        out[i + 1] = best
+        a = best
+    return out
+
+
+@njit(cache=True)
+def _minmax_kernel(y, n_buckets):
+    n = y.shape[0]
+    out = np.empty(2 * n_buckets, dtype=np.int64)
+    for b in range(n_buckets):
+        start = b * n // n_buckets
+        end = (b + 1) * n // n_buckets
+        low = start
+        high = start
+        for j in range(start + 1, end):
+            if y[j] < y[low]:
+                low = j
+            if y[j] > y[high]:
+                high = j
+        out[2 * b] = min(low, high)
+        out[2 * b + 1] = max(low, high)
+    return out
+
+
+def lttb_indices(values, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's average,
+    which preserves the visual shape of a line.
+
+    Returns:
+        Sorted row positions (all rows when there are n_out or fewer)
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if len(values) <= n_out or n_out < 3:
+        return np.arange(len(values))
+    return _lttb_kernel(values, n_out)
+
+
+def minmax_indices(values, n_out: int) -> np.ndarray:
+    """Row positions of the minimum and maximum of each of n_out / 2 buckets (keeps every spike)"""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if len(values) <= n_out or n_out < 2:
+        return np.arange(len(values))
+    return np.unique(_minmax_kernel(values, n_out // 2))
+
+
+DECIMATORS = {'lttb': lttb_indices, 'minmax': minmax_indices}
+
+
+def decimate_signals(df: pd.DataFrame, width: int, method: str = 'lttb', column: str = 'close') -> pd.DataFrame:
+    """
+    Downsample a calculate() frame to about width points, keeping signal markers
+
+    The price column picks the rows (LTTB or min-max); the first buy and sell
+    signal of every pixel column are added, so each marker visible at full
+    resolution still lands on the decimated line.
+
+    Args:
+        df: calculate() output
+        width: Horizontal resolution in pixels
+        method: 'lttb' or 'minmax'
+        column: Column that drives the decimation
+
+    Returns:
+        Subset of df rows (original index kept, so x positions are unchanged)
+    """
+    if method not in DECIMATORS:
+        raise ValueError(f"Unknown decimation method: {method}, expected one of {list(DECIMATORS)}")
+    rows = DECIMATORS[method](df[column].to_numpy(dtype=np.float64), width)
+
+    signal = df['signal'].to_numpy()
+    marked = np.flatnonzero(signal)
+    if len(marked) and len(df) > width:
+        pixel = marked * width // len(df)
+        _, first = np.unique(pixel * 3 + signal[marked] + 1, return_index=True)
+        rows = np.union1d(rows, marked[first])
+    return df.iloc[rows]
+
+
+def render_signals(result_df: pd.DataFrame, output_path: str, symbol: str = '', timeframe: str = '',
+                   width: int = 1600, method: str = 'lttb', dpi: int = 100) -> int:
+    """
+    Render the four visualize_signals panels to a PNG at pixel resolution
+
+    Uses an Agg canvas directly (no pyplot state, no display), vectorized
+    color arrays and line collections instead of one bar patch per candle, so
+    the cost depends on width rather than on the history length.
+
+    Args:
+        result_df: calculate() output (any length)
+        output_path: PNG path
+        symbol, timeframe: Used in the title
+        width: Image width in pixels (also the decimation target)
+        method: 'lttb' or 'minmax'
+        dpi: Output resolution
+
+    Returns:
+        Number of plotted points per series
+    """
+    df = result_df.reset_index(drop=True)
+    close = df['close'].to_numpy(dtype=np.float64)
+    # Colors from the full series, before rows are dropped
+    up = np.empty(len(close), dtype=bool)
+    up[0] = True
+    up[1:] = close[1:] >= close[:-1]
+    df = df.assign(volume_color=np.where(up, 'green', 'red'),
+                   histogram_color=np.where(df['histogram'].to_numpy() > 0, 'green', 'red'))
+    plot_df = decimate_signals(df, width, method)
+    x = plot_df.index.to_numpy()
+
+    fig = Figure(figsize=(width / dpi, 12 * width / 1600))
+    FigureCanvasAgg(fig)
+    ax1, ax2, ax3, ax4 = fig.subplots(4, 1, sharex=True)
+
+    # 1. Price with Bollinger Bands and SMAs
+    ax1.plot(x, plot_df['close'], label='Close Price', linewidth=1, color='black')
+    ax1.fill_between(x, plot_df['bollinger_upper'], plot_df['bollinger_lower'],
+                     alpha=0.2, color='gray', label='Bollinger Bands')
+    ax1.plot(x, plot_df['sma_20'], label='SMA 20', linewidth=1, alpha=0.7, color='blue')
+    ax1.plot(x, plot_df['sma_50'], label='SMA 50', linewidth=1, alpha=0.7, color='red')
+    buy = plot_df['signal'].to_numpy() == 1
+    sell = plot_df['signal'].to_numpy() == -1
+    ax1.scatter(x[buy], plot_df['close'].to_numpy()[buy], color='green', marker='^', s=40,
+                label='Buy Signal', zorder=5)
+    ax1.scatter(x[sell], plot_df['close'].to_numpy()[sell], color='red', marker='v', s=40,
+                label='Sell Signal', zorder=5)
+    ax1.set_title(f'{symbol} ({timeframe}) - Price & Bollinger Bands', fontsize=12, fontweight='bold')
+    ax1.legend(loc='best')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylabel('Price')
+
+    # 2. Momentum Indicators (RSI, MACD)
+    ax2_twin = ax2.twinx()
+    ax2.plot(x, plot_df['rsi'], label='RSI (14)', color='purple', linewidth=1)
+    ax2.axhline(y=70, color='gray', linestyle='--', alpha=0.5)
+    ax2.axhline(y=30, color='gray', linestyle='--', alpha=0.5)
+    ax2.axhspan(30, 70, alpha=0.1, color='gray')
+    ax2.set_ylabel('RSI', color='purple')
+    ax2.set_ylim(0, 100)
+    ax2_twin.vlines(x, 0, plot_df['histogram'], colors=plot_df['histogram_color'].to_numpy(), alpha=0.3,
+                    label='MACD Histogram')
+    ax2_twin.plot(x, plot_df['macd'], label='MACD', color='blue', linewidth=1)
+    ax2_twin.plot(x, plot_df['signal_line'], label='Signal Line', color='orange', linewidth=1)
+    ax2_twin.set_ylabel('MACD')
+    ax2.set_title('Momentum Indicators', fontsize=12, fontweight='bold')
+    ax2.legend(loc='upper left')
+    ax2_twin.legend(loc='upper right')
+    ax2.grid(True, alpha=0.3)
+
+    # 3. Component Scores
+    for name, color in [('momentum_score', 'purple'), ('trend_score', 'blue'),
+                        ('volume_score', 'green'), ('volatility_score', 'orange')]:
+        ax3.plot(x, plot_df[name], label=name.replace('_', ' ').title(), linewidth=1, color=color)
+    ax3.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
+    ax3.axhspan(0, 1, alpha=0.1, color='green')
+    ax3.axhspan(-1, 0, alpha=0.1, color='red')
+    ax3.set_title('Component Signal Scores', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Score (-1 to 1)')
+    ax3.set_ylim(-1.2, 1.2)
+    ax3.legend(loc='best')
+    ax3.grid(True, alpha=0.3)
+
+    # 4. Volume Analysis
+    ax4.vlines(x, 0, plot_df['volume'], colors=plot_df['volume_color'].to_numpy(), alpha=0.6, label='Volume')
+    ax4_twin = ax4.twinx()
+    ax4_twin.plot(x, plot_df['volume_ratio'], label='Volume Ratio', color='blue', linewidth=1)
+    ax4_twin.axhline(y=1.0, color='gray', linestyle='--', alpha=0.5)
+    ax4_twin.set_ylabel('Volume Ratio', color='blue')
+    ax4.set_title('Volume Analysis', fontsize=12, fontweight='bold')
+    ax4.set_xlabel('Candle Index')
+    ax4.set_ylabel('Volume')
+    ax4.legend(loc='upper left')
+    ax4_twin.legend(loc='upper right')
+    ax4.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi)
+    return len(plot_df)
+
+
+def _render_job(job: dict) -> dict:
+    """Load, calculate and render one symbol in a worker process"""
+    start = time.perf_counter()
+    try:
+        df = load_klines(job['symbol'], job['timeframe'])
+        if job['lookback']:
+            df = df.tail(job['lookback']).reset_index(drop=True)
+        result_df = CompositeIndicator(backend='numba').calculate(df)
+        path = os.path.join(job['output_dir'], f"output_{job['symbol']}_{job['timeframe']}.png")
+        points = render_signals(result_df, path, job['symbol'], job['timeframe'], job['width'], job['method'])
+        return {'symbol': job['symbol'], 'path': path, 'candles': len(result_df), 'points': points,
+                'seconds': time.perf_counter() - start, 'error': None}
+    except Exception as e:
+        return {'symbol': job['symbol'], 'path': None, 'candles': 0, 'points': 0,
+                'seconds': time.perf_counter() - start, 'error': str(e)}
+
+
+def render_batch(symbols: list, timeframe: str = '1h', output_dir: str = 'test', lookback: int = None,
+                 width: int = 1600, method: str = 'lttb', processes: int = None) -> pd.DataFrame:
+    """
+    Render many symbols to PNG files in parallel worker processes
+
+    Args:
+        symbols: Trading pairs
+        timeframe: Timeframe for analysis
+        output_dir: Directory for output_<symbol>_<timeframe>.png
+        lookback: Candles per chart (None: full history)
+        width: Image width in pixels
+        method: 'lttb' or 'minmax'
+        processes: Worker processes (default: CPU count)
+
+    Returns:
+        One row per symbol: path, candles, points, seconds, error
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [{'symbol': symbol, 'timeframe': timeframe, 'output_dir': output_dir, 'lookback': lookback,
+             'width': width, 'method': method} for symbol in symbols]
+    if processes == 1 or len(jobs) == 1:
+        results = [_render_job(job) for job in jobs]
+    else:
+        with Pool(processes) as pool:
+            results = list(pool.imap_unordered(_render_job, jobs))
+    return pd.DataFrame(results).set_index('symbol').loc[list(symbols)]
 
 
 def visualize_signals(symbol: str, timeframe: str = '1h', lookback: int = 200):
@@ -137,12 +406,21 @@ def visualize_signals(symbol: str, timeframe: str = '1h', lookback: int = 200):
 
 
 if __name__ == "__main__":
-    symbol = 'BTCUSDT'
-    timeframe = '1h'
-    
-    if len(sys.argv) > 1:
-        symbol = sys.argv[1]
-    if len(sys.argv) > 2:
-        timeframe = sys.argv[2]
-    
-    visualize_signals(symbol, timeframe)
+    parser = argparse.ArgumentParser(description='Visualize composite indicator signals')
+    parser.add_argument('symbol', nargs='?', default='BTCUSDT')
+    parser.add_argument('timeframe', nargs='?', default='1h')
+    parser.add_argument('--batch', nargs='+', metavar='SYMBOL',
+                        help='Render these symbols to PNG in parallel (headless, decimated)')
+    parser.add_argument('--lookback', type=int, default=None, help='Candles per chart in batch mode (default: all)')
+    parser.add_argument('--width', type=int, default=1600, help='Image width in pixels in batch mode')
+    parser.add_argument('--method', choices=sorted(DECIMATORS), default='lttb')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output-dir', default='test')
+    args = parser.parse_args()
+
+    if args.batch:
+        summary = render_batch(args.batch, args.timeframe, args.output_dir, args.lookback,
+                               args.width, args.method, args.processes)
+        print(summary.to_string())
+    else:
+        visualize_signals(args.symbol, args.timeframe)
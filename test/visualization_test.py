@@ -0,0 +1,67 @@
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+pytest.importorskip('matplotlib')
+
+from modules.fused_kernel import calculate_fused
+from test.visualization import decimate_signals, lttb_indices, minmax_indices, render_signals
+
+
+def _signals(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    df = pd.DataFrame({
+        'open_time': pd.date_range('2020-01-01', periods=n, freq='15min'),
+        'high': close * 1.005, 'low': close * 0.995, 'close': close,
+        'volume': rng.uniform(100, 1000, n),
+    })
+    return calculate_fused(df)
+
+
+def test_decimators():
+    """
+    LTTB keeps the endpoints and one point per bucket; min-max keeps every bucket extreme
+    """
+    rng = np.random.default_rng(1)
+    y = np.cumsum(rng.normal(size=10_000))
+    y[5000] = 1e3  # spike
+
+    rows = lttb_indices(y, 500)
+    assert len(rows) == 500
+    assert rows[0] == 0 and rows[-1] == len(y) - 1
+    assert (np.diff(rows) > 0).all()
+    assert 5000 in rows
+
+    rows = minmax_indices(y, 500)
+    assert len(rows) <= 500
+    assert 5000 in rows and np.argmin(y) in rows
+
+    assert lttb_indices(y[:100], 500).tolist() == list(range(100))
+
+
+def test_decimation_keeps_signal_markers():
+    df = _signals(50_000)
+    plot_df = decimate_signals(df, 1000)
+    assert len(plot_df) < 5000
+
+    # Every pixel column with a buy (or sell) at full resolution still has one
+    width = 1000
+    for direction in (1, -1):
+        full = np.unique(np.flatnonzero(df['signal'] == direction) * width // len(df))
+        kept = np.unique(plot_df.index[plot_df['signal'] == direction] * width // len(df))
+        assert full.tolist() == kept.tolist()
+
+
+def test_render_signals(tmp_path):
+    df = _signals(20_000)
+    path = tmp_path / 'chart.png'
+    points = render_signals(df, str(path), 'BTCUSDT', '15m', width=800)
+
+    assert points <= 3 * 800  # line points plus at most one buy and one sell per pixel
+    assert path.read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'
@@ -6,12 +6,11 @@ Usage:
     python train_ml_classifier.py
     python train_ml_classifier.py --lookback 5000
     python train_ml_classifier.py --lookback 10000 --symbol ETHUSDT
+    python train_ml_classifier.py --symbols BTCUSDT,ETHUSDT,SOLUSDT --timeframes 15m,1h --workers 4
 """
 
 import sys
 import argparse
-import pickle
-import json
 from pathlib import Path
 
 import pandas as pd
@@ -19,6 +18,8 @@ import numpy as np
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
 
 from index import calculate_signals
+from modules.data_fetch import get_fetcher
+from modules.rolling_rank import add_rank_features
 from ml_classifier import (
     prepare_signal_data,
     label_signals,
@@ -26,6 +27,11 @@ from ml_classifier import (
     get_feature_columns,
     train_signal_classifier,
 )
+from ml_classifier.signal_events import write_signal_events
+from ml_classifier.batch_training import run_batch
+from ml_classifier.drift_monitor import DriftReference
+from ml_classifier.model_registry import ModelRegistry, data_range
+from ml_classifier.explain import explain_signals, attach_contributions, summarize_contributions
 
 
 def main():
@@ -60,15 +66,82 @@ def main():
         default=0.0005,
         help="Profit threshold for true signal label (default: 0.0005 = 0.05%%)"
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Use only locally cached kline files, never touch the network"
+    )
+    parser.add_argument(
+        "--rank-features",
+        action="store_true",
+        help="Add rolling percentile-rank volume/volatility features"
+    )
+    parser.add_argument(
+        "--rank-window",
+        type=int,
+        default=500,
+        help="Window of the rank features in candles (default: 500)"
+    )
+    parser.add_argument(
+        "--events-log",
+        type=str,
+        default=None,
+        help="Append this run's signal events to a binary event log"
+    )
     parser.add_argument(
         "--output-dir",
         type=str,
         default="ml_models",
         help="Output directory for trained models (default: ml_models)"
     )
+    parser.add_argument(
+        "--symbols",
+        type=str,
+        default=None,
+        help="Batch mode: comma separated symbols, trained for every --timeframes entry"
+    )
+    parser.add_argument(
+        "--timeframes",
+        type=str,
+        default=None,
+        help="Batch mode: comma separated timeframes (default: --timeframe)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Batch mode: parallel training processes (default: from CPU count)"
+    )
+    parser.add_argument(
+        "--xgb-threads",
+        type=int,
+        default=None,
+        help="Batch mode: XGBoost threads per job (workers x threads <= cores)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Batch mode: retrain models whose input data has not changed"
+    )
+    parser.add_argument(
+        "--exact-shap",
+        action="store_true",
+        help="Explain signals with exact TreeSHAP (default: approximate path attributions, ~40x faster)"
+    )
     
     args = parser.parse_args()
     
+    if args.offline:
+        get_fetcher().offline = True
+    
+    if args.symbols or args.timeframes:
+        if args.exact_shap:
+            parser.error("--exact-shap applies to single-model training; batch mode computes no contributions")
+        if args.events_log:
+            parser.error("--events-log applies to single-model training; batch jobs run in separate processes "
+                         "and do not share one event log")
+        return run_batch_mode(args)
+    
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
     
@@ -90,6 +163,8 @@ def main():
     
     try:
         df = calculate_signals(args.symbol, args.timeframe, lookback=args.lookback)
+        if args.rank_features:
+            df = add_rank_features(df, window=args.rank_window)
         print(f"\nLoaded {len(df)} candles")
         print(f"Date range: {df['open_time'].min()} to {df['open_time'].max()}")
     except Exception as e:
@@ -105,6 +180,10 @@ def main():
     print(f"  Buy signals: {(signals_df['signal'] == 1).sum()}")
     print(f"  Sell signals: {(signals_df['signal'] == -1).sum()}")
     
+    if args.events_log:
+        written = write_signal_events(df, args.events_log, symbol=args.symbol, timeframe=args.timeframe)
+        print(f"  Appended {written} new events to {args.events_log}")
+    
     print("\n" + "-"*80)
     print("Step 3: Labeling signals (true/false)")
     print("-"*80)
@@ -131,7 +210,7 @@ def main():
     print("Step 4: Extracting features")
     print("-"*80)
     
-    feature_columns = get_feature_columns()
+    feature_columns = get_feature_columns(include_rank_features=args.rank_features)
     print(f"\nUsing {len(feature_columns)} features:")
     for i, feat in enumerate(feature_columns, 1):
         print(f"  {i}. {feat}")
@@ -191,42 +270,57 @@ def main():
         importance = feature_importance[idx]
         print(f"{rank}. {feat_name}: {importance:.4f}")
     
+    contribs = explain_signals(model, scaler, labeled_df, feature_columns, approximate=not args.exact_shap)
+    contrib_summary = summarize_contributions(contribs, feature_columns)
+    
+    shap_kind = 'exact TreeSHAP' if args.exact_shap else 'approximate'
+    print(f"\nTop 5 Features by Mean |Contribution| (log-odds, all signals, {shap_kind}):")
+    print("-" * 60)
+    for rank, (feat_name, row) in enumerate(contrib_summary.head(5).iterrows(), 1):
+        print(f"{rank}. {feat_name}: {row['mean_abs']:.4f} "
+              f"(accepted {row['mean_accepted']:+.4f}, rejected {row['mean_rejected']:+.4f})")
+    
     print("\n" + "-"*80)
     print("Step 7: Saving models")
     print("-"*80)
     
     try:
-        model_path = output_dir / f"classifier_{args.symbol}_{args.timeframe}.pkl"
-        scaler_path = output_dir / f"scaler_{args.symbol}_{args.timeframe}.pkl"
-        config_path = output_dir / f"config_{args.symbol}_{args.timeframe}.json"
-        
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
-        
-        with open(scaler_path, 'wb') as f:
-            pickle.dump(scaler, f)
+        explained_path = output_dir / f"explained_{args.symbol}_{args.timeframe}.parquet"
+        contrib_summary_path = output_dir / f"contrib_summary_{args.symbol}_{args.timeframe}.csv"
         
-        config = {
-            'symbol': args.symbol,
-            'timeframe': args.timeframe,
-            'lookback': args.lookback,
-            'hold_period': args.hold_period,
-            'profit_threshold': args.profit_threshold,
-            'feature_columns': feature_columns,
-            'num_samples': len(labeled_df),
-            'true_signals': int(true_count),
-            'false_signals': int(false_count),
-            'accuracy': float(report.get('accuracy', 0)),
-            'weighted_f1': float(report.get('weighted avg', {}).get('f1-score', 0))
-        }
+        registry = ModelRegistry(output_dir)
+        version = registry.register(
+            model,
+            scaler,
+            args.symbol,
+            args.timeframe,
+            feature_columns,
+            metrics={
+                'num_samples': len(labeled_df),
+                'true_signals': int(true_count),
+                'false_signals': int(false_count),
+                'accuracy': float(report.get('accuracy', 0)),
+                'weighted_f1': float(report.get('weighted avg', {}).get('f1-score', 0))
+            },
+            data_range=data_range(labeled_df),
+            settings={
+                'lookback': args.lookback,
+                'hold_period': args.hold_period,
+                'profit_threshold': args.profit_threshold,
+                'rank_features': args.rank_features
+            },
+            reference=DriftReference.from_data(labeled_df[feature_columns].values, feature_columns)
+        )
+        version_dir = registry.series_dir(args.symbol, args.timeframe) / version
         
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        explained_columns = ['open_time', 'close', 'signal', 'signal_strength', 'label'] + feature_columns
+        attach_contributions(labeled_df[explained_columns], contribs, feature_columns).to_parquet(explained_path)
+        contrib_summary.to_csv(contrib_summary_path)
         
-        print(f"\nModels saved:")
-        print(f"  Classifier: {model_path}")
-        print(f"  Scaler: {scaler_path}")
-        print(f"  Config: {config_path}")
+        print(f"\nModel registered as {version} (live):")
+        print(f"  Version directory: {version_dir}")
+        print(f"  Explained signals: {explained_path}")
+        print(f"  Contribution summary: {contrib_summary_path}")
         
     except Exception as e:
         print(f"Error saving models: {e}")
@@ -239,14 +333,42 @@ def main():
     print(f"1. Review the model performance metrics above")
     print(f"2. If accuracy > 0.55, model is ready for use")
     print(f"3. To use model in trading:")
-    print(f"   - Load model from {model_path}")
-    print(f"   - Use scaler from {scaler_path}")
-    print(f"   - Filter signals with model.predict_proba()")
+    print(f"   - ModelRegistry('{output_dir}').live('{args.symbol}', '{args.timeframe}')")
+    print(f"   - Filter signals with its score(signals_df)")
+    print(f"   - Watch feature drift with DriftMonitor(model.reference) and score_signals(..., monitor=...)")
     print()
     
     return True
 
 
+def run_batch_mode(args) -> bool:
+    """Train every symbol x timeframe in a worker pool and print the summary"""
+    symbols = (args.symbols or args.symbol).split(',')
+    timeframes = (args.timeframes or args.timeframe).split(',')
+    
+    print("\n" + "="*80)
+    print(f"BATCH TRAINING: {len(symbols)} symbols x {len(timeframes)} timeframes")
+    print("="*80)
+    
+    summary = run_batch(
+        symbols,
+        timeframes,
+        output_dir=args.output_dir,
+        lookback=args.lookback,
+        hold_period=args.hold_period,
+        profit_threshold=args.profit_threshold,
+        workers=args.workers,
+        xgb_threads=args.xgb_threads,
+        force=args.force,
+        rank_features=args.rank_features,
+        rank_window=args.rank_window
+    )
+    
+    print(summary.to_string(index=False))
+    print(f"\nSummary saved to {Path(args.output_dir) / 'batch_summary.csv'}")
+    return not (summary['status'] == 'failed').any()
+
+
 if __name__ == "__main__":
     success = main()
     sys.exit(0 if success else 1)